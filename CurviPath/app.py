@@ -1,20 +1,60 @@
 # Importación de módulos necesarios
-from flask import Flask, render_template, request, jsonify  # Framework Flask para crear la aplicación web
+from flask import Flask, render_template, request, jsonify, Response, stream_with_context, abort, make_response, url_for  # Framework Flask para crear la aplicación web
+from werkzeug.datastructures import MultiDict, CombinedMultiDict  # Parámetros de los trabajos con el formato de la consulta
 import numpy as np  # Biblioteca para cálculos numéricos
-import sympy as sp  # Biblioteca para cálculos simbólicos
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, implicit_multiplication_application  # Herramientas para analizar expresiones simbólicas
 import json  # Manejo de datos en formato JSON
-import re  # Expresiones regulares para manipulación de cadenas
 import logging  # Registro de eventos y errores
 import os  # Acceso a variables de entorno del sistema operativo
+import time  # Medición de la latencia de las peticiones
+import physics  # Registro de fórmulas de los problemas de física
+from compiler import expression_cache, compile_vector_functions, EquationError, EquationLimitError, EquationUnavailableError, SIMPLIFY_MODES, DEFAULT_SIMPLIFY_MODE  # Compilación de ecuaciones y caché de expresiones
+from evaluation import evaluate_vector_function, series_to_list, time_chunks  # Evaluación numérica de las expresiones compiladas
+from pipeline import parse_options, Computation, PipelineError  # Cálculo de /get_data, compartido con /jobs
+from integration import get_or_build_system, integrate, IntegrationError, INTEGRATION_METHODS, INTEGRATION_RTOL, INTEGRATION_ATOL, COORDINATES, VELOCITY_NAMES  # Integración de leyes de aceleración
+from jobs import job_store, FINISHED  # Trabajos asíncronos de /jobs
+from response_cache import response_cache, request_key  # Caché de respuestas y ETag de /get_data
+from expression_store import expression_store  # Almacén persistente de expresiones compiladas
+from warmup import warmup_status  # Estado del precalentamiento del proceso
+from metrics import metrics, timed, start_request, current_timings, end_request  # Tiempos por etapa y métricas
+from downsampling import downsample_arrays  # Reducción de las series para dibujarlas
+from serialization import wants_binary, binary_dtype, encode_columnar, encode_frame, ndjson_line, arrays_to_json, BINARY_MIMETYPE, NDJSON_MIMETYPE  # Formatos de respuesta
 
-# Configuración del registro de logs
-logging.basicConfig(level=logging.DEBUG)  # Configura el nivel de detalle de los logs (DEBUG)
+# Configuración del registro de logs; DEBUG registra los parámetros de cada petición y tiene un coste apreciable
+logging.basicConfig(level=os.environ.get('CURVIPATH_LOG_LEVEL', 'INFO').upper())
 
 # Inicialización de la aplicación Flask
 app = Flask(__name__)
 app.secret_key = os.environ.get("SESSION_SECRET", "curvipath_dev_key")  # Clave secreta para sesiones
 
+# Medición de cada petición: cabecera Server-Timing e histograma de latencia por ruta
+@app.before_request
+def begin_timing():
+    """Empieza a acumular los tiempos por etapa de la petición."""
+    start_request()
+
+
+@app.after_request
+def add_server_timing(response):
+    """
+    Añade la cabecera Server-Timing con la duración de cada etapa (parse,
+    simplify, diff, lambdify, kernel, evaluate, fallback, serialize...) y
+    registra la latencia de la petición. En las respuestas por flujo solo
+    incluye las etapas anteriores al primer bloque.
+    """
+    timings = current_timings()
+    if timings is not None:
+        response.headers['Server-Timing'] = timings.header()
+        endpoint = request.endpoint or 'unknown'
+        metrics.observe('curvipath_request_seconds', time.perf_counter() - timings.start, endpoint=endpoint)
+        metrics.inc('curvipath_requests_total', endpoint=endpoint, status=response.status_code)
+    return response
+
+
+@app.teardown_request
+def finish_timing(exc):
+    """Deja de acumular tiempos al terminar la petición."""
+    end_request()
+
 # Ruta principal de la aplicación
 @app.route('/')
 def index():
@@ -27,793 +67,543 @@ def get_data():
     """
     Procesa ecuaciones matemáticas y devuelve datos calculados.
     Maneja funciones vectoriales, derivadas y soluciones para problemas de física.
+    El cálculo está en pipeline.Computation, que comparte con los trabajos asíncronos de /jobs.
+    La respuesta depende solo de los parámetros, así que las no enviadas por
+    flujo llevan un ETag calculado a partir de ellos (response_cache.request_key):
+    si coincide con If-None-Match se responde 304 sin compilar ni evaluar, y
+    si la respuesta está en la caché de respuestas se devuelve sin recalcularla.
     """
     try:
-        # Obtención de parámetros de entrada desde la solicitud HTTP
-        t_max = float(request.args.get('t_max', 10.0))  # Tiempo máximo
-        intervals = int(request.args.get('intervals', 100))  # Número de intervalos
-        x_equations_raw = request.args.getlist('x_equations')  # Ecuaciones para la componente x
-        y_equations_raw = request.args.getlist('y_equations')  # Ecuaciones para la componente y
-        z_equations_raw = request.args.getlist('z_equations')  # Ecuaciones para la componente z
-        variables_json = request.args.get('variables', '{}')  # Variables adicionales en formato JSON
-        variables = json.loads(variables_json)  # Decodifica las variables JSON a un diccionario
-        solve_for = request.args.get('solve_for', None)  # Variable a resolver
-        exercise_type = request.args.get('exercise_type', None)  # Tipo de ejercicio físico
-        logging.debug(f"Processing equations with parameters: {request.args}")  # Log de los parámetros recibidos
-    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        options = parse_options(request.args)
+        binary = wants_binary(request)  # Respuesta binaria columnar en lugar de JSON
+        dtype = request.args.get('dtype', 'float64')  # Tipo de dato de los búferes binarios
+        binary_dtype(dtype)
+        logging.debug("Processing equations with parameters: %s", request.args)  # Log de los parámetros recibidos
+    except PipelineError as e:
+        return jsonify(e.payload), e.status
+    except (TypeError, ValueError) as e:
         # Manejo de errores en los parámetros de entrada
         logging.error(f"Invalid parameters: {str(e)}")
         return jsonify({'error': 'Invalid parameters: ' + str(e)}), 400
 
-    # Conversión de ángulo θ de grados a radianes si está presente
-    if 'θ' in variables:
-        try:
-            variables['θ'] = sp.rad(float(variables['θ']))
-        except ValueError:
-            return jsonify({'error': 'El valor de θ no es un número válido'}), 400
-        except Exception as e:
-            return jsonify({'error': f'Error al convertir el ángulo a radianes: {str(e)}'}), 400
-
-    # Creación de un símbolo de tiempo y generación de valores de tiempo
-    t = sp.symbols('t')  # Define el símbolo de tiempo
-    t_vals = np.linspace(0, t_max, intervals)  # Genera un arreglo de valores de tiempo
-    results = {'t': t_vals.tolist()}  # Inicializa el diccionario de resultados con los valores de tiempo
-
-    # Transformaciones para analizar expresiones simbólicas
-    transformations = (standard_transformations + (implicit_multiplication_application,))
-
-    # Función para preprocesar ecuaciones
-    def preprocess_equation(eq):
-        """
-        Preprocesa cadenas de ecuaciones para corregir problemas comunes de notación:
-        - Elimina espacios
-        - Reemplaza 'sen' por 'sin' (función seno en español)
-        - Inserta signos de multiplicación explícitos donde faltan
-        """
-        if not eq or eq.strip() == '':
-            return eq
-        
-        eq = eq.replace(' ', '')  # Elimina espacios
-        eq = eq.replace('sen', 'sin')  # Reemplaza 'sen' por 'sin'
-        eq = re.sub(r'(\d)([a-zA-Z\(])', r'\1*\2', eq)  # Inserta multiplicación explícita
-        return eq
-
-    # Función para evaluar expresiones simbólicas de forma segura
-    def safe_evalf_array(expr, vals):
-        """
-        Evalúa de forma segura una expresión simbólica sobre un arreglo de valores.
-        Si falla la evaluación vectorizada, realiza una evaluación elemento por elemento.
-        """
-        if isinstance(expr, tuple):  # Si la expresión es una tupla, toma el primer elemento
-            expr = expr[0]
-        f = sp.lambdify(t, expr, 'numpy')  # Convierte la expresión simbólica en una función evaluable
-        try:
-            y_vals = f(vals)  # Intenta evaluar de forma vectorizada
-            y_vals = np.array(y_vals, dtype=np.float64)
-        except Exception as e:
-            logging.debug(f"Vectorized evaluation failed, falling back to element-wise: {str(e)}")
-            y_vals = []
-            for val in vals:  # Evalúa elemento por elemento si falla la evaluación vectorizada
-                try:
-                    yv = expr.subs(t, val).evalf()
-                    y_vals.append(float(yv))
-                except Exception:
-                    y_vals.append(0)  # Valor predeterminado en caso de error
-            y_vals = np.array(y_vals, dtype=np.float64)
-        return y_vals
-
-    # Determina la longitud máxima de las listas de ecuaciones
-    max_len = max(len(x_equations_raw), len(y_equations_raw), len(z_equations_raw))
-
-    # Rellena las listas más cortas con cadenas vacías
-    x_equations_raw += [''] * (max_len - len(x_equations_raw))
-    y_equations_raw += [''] * (max_len - len(y_equations_raw))
-    z_equations_raw += [''] * (max_len - len(z_equations_raw))
-
-    # Procesa cada función vectorial
-    for idx in range(max_len):
-        x_eq_str = x_equations_raw[idx].strip()  # Ecuación para la componente x
-        y_eq_str = y_equations_raw[idx].strip()  # Ecuación para la componente y
-        z_eq_str = z_equations_raw[idx].strip()  # Ecuación para la componente z
-
-        # Procesa la componente x
-        if x_eq_str:
-            try:
-                x_processed = preprocess_equation(x_eq_str)  # Preprocesa la ecuación
-                x_expr = parse_expr(x_processed, transformations=transformations)  # Analiza la ecuación
-                if isinstance(x_expr, tuple):
-                    x_expr = x_expr[0]
-                x_expr = sp.simplify(x_expr)  # Simplifica la ecuación
-                x_vals = safe_evalf_array(x_expr, t_vals)  # Evalúa la ecuación
-                results[f'x_eq_{idx+1}'] = x_vals.tolist()
-
-                # Calcula la primera derivada (velocidad)
-                dx_expr = sp.diff(x_expr, t)
-                dx_expr = sp.simplify(dx_expr)
-                dx_vals = safe_evalf_array(dx_expr, t_vals)
-                results[f'x_v_{idx+1}'] = dx_vals.tolist()
-
-                # Calcula la segunda derivada (aceleración)
-                ddx_expr = sp.diff(dx_expr, t)
-                ddx_expr = sp.simplify(ddx_expr)
-                ddx_vals = safe_evalf_array(ddx_expr, t_vals)
-                results[f'x_a_{idx+1}'] = ddx_vals.tolist()
-            except Exception as e:
-                logging.error(f"Error processing x equation {idx+1}: {str(e)}")
-                return jsonify({'error': f'Error parsing x equation {idx+1}: {str(e)}'}), 400
-
-        # Procesa la componente y
-        if y_eq_str:
-            try:
-                y_processed = preprocess_equation(y_eq_str)
-                y_expr = parse_expr(y_processed, transformations=transformations)
-                if isinstance(y_expr, tuple):
-                    y_expr = y_expr[0]
-                y_expr = sp.simplify(y_expr)  # Simplifica la ecuación
-                y_vals = safe_evalf_array(y_expr, t_vals)  # Evalúa la ecuación
-                results[f'y_eq_{idx+1}'] = y_vals.tolist()
-
-                # Primera derivada (velocidad)
-                dy_expr = sp.diff(y_expr, t)
-                dy_expr = sp.simplify(dy_expr)
-                dy_vals = safe_evalf_array(dy_expr, t_vals)
-                results[f'y_v_{idx+1}'] = dy_vals.tolist()
-
-                # Segunda derivada (aceleración)
-                ddy_expr = sp.diff(dy_expr, t)
-                ddy_expr = sp.simplify(ddy_expr)
-                ddy_vals = safe_evalf_array(ddy_expr, t_vals)
-                results[f'y_a_{idx+1}'] = ddy_vals.tolist()
-            except Exception as e:
-                logging.error(f"Error processing y equation {idx+1}: {str(e)}")
-                return jsonify({'error': f'Error parsing y equation {idx+1}: {str(e)}'}), 400
-
-        # Procesa la componente z
-        if z_eq_str:
-            try:
-                z_processed = preprocess_equation(z_eq_str)
-                z_expr = parse_expr(z_processed, transformations=transformations)
-                if isinstance(z_expr, tuple):
-                    z_expr = z_expr[0]
-                z_expr = sp.simplify(z_expr)  # Simplifica la ecuación
-                z_vals = safe_evalf_array(z_expr, t_vals)  # Evalúa la ecuación
-                results[f'z_eq_{idx+1}'] = z_vals.tolist()
-
-                # Primera derivada (velocidad)
-                dz_expr = sp.diff(z_expr, t)
-                dz_expr = sp.simplify(dz_expr)
-                dz_vals = safe_evalf_array(dz_expr, t_vals)
-                results[f'z_v_{idx+1}'] = dz_vals.tolist()
-
-                # Segunda derivada (aceleración)
-                ddz_expr = sp.diff(dz_expr, t)
-                ddz_expr = sp.simplify(ddz_expr)
-                ddz_vals = safe_evalf_array(ddz_expr, t_vals)
-                results[f'z_a_{idx+1}'] = ddz_vals.tolist()
-            except Exception as e:
-                logging.error(f"Error processing z equation {idx+1}: {str(e)}")
-                return jsonify({'error': f'Error parsing z equation {idx+1}: {str(e)}'}), 400
-
-    # Procesa una función adicional z si se proporciona
-    z_function_raw = request.args.get('z_function', '').strip()
-    if z_function_raw:
-        try:
-            z_processed = preprocess_equation(z_function_raw)
-            z_expr = parse_expr(z_processed, transformations=transformations)
-            z_expr = sp.simplify(z_expr)  # Simplifica la ecuación
-            z_vals = safe_evalf_array(z_expr, t_vals)  # Evalúa la ecuación
-            results['z_eq'] = z_vals.tolist()
-
-            # Primera derivada (velocidad)
-            dz_expr = sp.diff(z_expr, t)
-            dz_expr = sp.simplify(dz_expr)
-            dz_vals = safe_evalf_array(dz_expr, t_vals)
-            results['z_v'] = dz_vals.tolist()
-
-            # Segunda derivada (aceleración)
-            ddz_expr = sp.diff(dz_expr, t)
-            ddz_expr = sp.simplify(ddz_expr)
-            ddz_vals = safe_evalf_array(ddz_expr, t_vals)
-            results['z_a'] = ddz_vals.tolist()
-        except Exception as e:
-            logging.error(f"Error processing Z function: {str(e)}")
-            return jsonify({'error': f'Error parsing Z function: {str(e)}'}), 400
-
-    # Calcula soluciones para problemas de física si se solicitan
-    solution = "Datos insuficientes para calcular la solución."
-    solution_data = {}
-    
-    if solve_for and exercise_type:
-        solution, solution_data = calculate_solution(solve_for, exercise_type, variables)
-        
-        # Convierte valores de sympy.Float a float de Python para JSON serialization
-        converted_solution_data = {}
-        for k, v in solution_data.items():
-            if hasattr(v, 'evalf') or isinstance(v, sp.Float):
-                converted_solution_data[k] = float(v)
-            else:
-                converted_solution_data[k] = v
-                
-        results['solution'] = solution
-        results['solution_data'] = converted_solution_data
-
-    return jsonify(results)  # Devuelve los resultados en formato JSON
-
-# Función para calcular soluciones específicas de problemas de física
-def calculate_solution(solve_for, exercise_type, variables):
-    """
-    Calcula soluciones para problemas de física basados en el tipo de ejercicio.
-    Devuelve una cadena explicativa y un diccionario con los datos calculados.
-    """
-    logging.debug(f"Calculating solution for: {solve_for} in {exercise_type}")
-    
-    solution_text = "Datos insuficientes para calcular la solución."
-    solution_data = {}
-    
-    # Convertir cualquier objeto sympy.Float a un float de Python para evitar errores de serialización
-    def convert_sympy_values(value):
-        if hasattr(value, 'evalf'):
-            return float(value)
-        return value
-    
-    # Símbolos comunes utilizados en ecuaciones de física
-    d, v, a, theta, time_sym, r, omega, alpha, g = sp.symbols('d v a theta time r omega alpha g')
-    
-    def to_float(val):
-        """Convert a value to float if possible, otherwise return None."""
-        try:
-            # Asegurarse de que 0 sea considerado un valor válido
-            if val == 0 or val == '0':
-                return 0.0
-            return float(val)
-        except (TypeError, ValueError):
-            return None
-            
-    # Log de las variables crudas para depuración
-    logging.debug(f"Raw variables received: {variables}")
-    
-    # Extraer y convertir variables físicas según el tipo de ejercicio
-    if exercise_type == 'MCU':
-        # Variables de MCU
-        radius = to_float(variables.get('r'))              # Radio (r)
-        omega_val = to_float(variables.get('ω'))           # Velocidad angular (ω)
-        vel = to_float(variables.get('v'))                 # Velocidad tangencial (v)
-        period = to_float(variables.get('T'))              # Período (T)
-        freq = to_float(variables.get('f'))                # Frecuencia (f)
-        a_centripetal = to_float(variables.get('a_c'))     # Aceleración centrípeta (a_c)
-        theta_val = to_float(variables.get('θ'))           # Ángulo (θ)
-        time_var = to_float(variables.get('t'))            # Tiempo (t)
-        num_revolutions = to_float(variables.get('N'))     # Número de vueltas (N)
-        
-        # Rastrear qué variables fueron proporcionadas
-        provided = {k: v for k, v in [
-            ('r', radius), ('ω', omega_val), ('v', vel), ('T', period),
-            ('f', freq), ('a_c', a_centripetal), ('θ', theta_val),
-            ('t', time_var), ('N', num_revolutions)
-        ] if v is not None}
-        
-    elif exercise_type == 'MCNU':
-        # Variables de MCNU
-        radius = to_float(variables.get('r'))              # Radio (r)
-        omega_i = to_float(variables.get('ω_i'))           # Velocidad angular inicial (ω_i)
-        omega_f = to_float(variables.get('ω_f'))           # Velocidad angular final (ω_f)
-        alpha_val = to_float(variables.get('alpha'))       # Aceleración angular (α)
-        theta_val = to_float(variables.get('θ'))           # Ángulo (θ)
-        a_tangential = to_float(variables.get('a_t'))      # Aceleración tangencial (a_t)
-        a_centripetal = to_float(variables.get('a_c'))     # Aceleración centrípeta (a_c)
-        a_total = to_float(variables.get('a'))             # Aceleración total (a)
-        time_var = to_float(variables.get('t'))            # Tiempo (t)
-        vel = to_float(variables.get('v'))                 # Velocidad tangencial (v)
-        
-        # Rastrear qué variables fueron proporcionadas
-        provided = {k: v for k, v in [
-            ('r', radius), ('ω_i', omega_i), ('ω_f', omega_f), ('alpha', alpha_val),
-            ('θ', theta_val), ('a_t', a_tangential), ('a_c', a_centripetal),
-            ('a', a_total), ('t', time_var), ('v', vel)
-        ] if v is not None or v == 0}
-        
-    elif exercise_type == 'TP':
-        # Variables de TP - intentar diferentes claves posibles
-        v_0 = to_float(variables.get('v_0')) or to_float(variables.get('v0'))  # Velocidad inicial
-        theta_val = to_float(variables.get('θ'))           # Ángulo de lanzamiento (θ)
-        if theta_val is None:  # Intenta con otras claves si no se encuentra
-            theta_val = to_float(variables.get('theta'))  
-        gravity = to_float(variables.get('g', 9.81))       # Aceleración gravitacional (g)
-        x_pos = to_float(variables.get('x'))               # Posición horizontal (x)
-        y_pos = to_float(variables.get('y'))               # Posición vertical (y)
-        height = to_float(variables.get('H'))              # Altura máxima (H)
-        range_val = to_float(variables.get('R'))           # Alcance horizontal (R)
-        time_var = to_float(variables.get('t'))            # Tiempo de vuelo (t)
-        v_0x = to_float(variables.get('v_0x')) or to_float(variables.get('v0x'))  # Componente x de v_0
-        v_0y = to_float(variables.get('v_0y')) or to_float(variables.get('v0y'))  # Componente y de v_0
-        
-        # Log de todas las variables para depuración
-        logging.debug(f"TP variables: v_0={v_0}, theta={theta_val}, g={gravity}, x={x_pos}, y={y_pos}, H={height}, R={range_val}, t={time_var}, v_0x={v_0x}, v_0y={v_0y}")
-        
-        # Rastrear qué variables fueron proporcionadas
-        provided = {k: v for k, v in [
-            ('v_0', v_0), ('θ', theta_val), ('g', gravity), ('x', x_pos),
-            ('y', y_pos), ('H', height), ('R', range_val), ('t', time_var),
-            ('v_0x', v_0x), ('v_0y', v_0y)
-        ] if v is not None}
-        
-    elif exercise_type == 'MCG':
-        # Variables de MCG
-        vel = to_float(variables.get('v'))                 # Velocidad (v)
-        a_tangential = to_float(variables.get('a_t'))      # Aceleración tangencial (a_t)
-        a_centripetal = to_float(variables.get('a_c'))     # Aceleración normal (a_c)
-        rho = to_float(variables.get('rho'))               # Radio de curvatura (ρ)
-        a_total = to_float(variables.get('a'))             # Aceleración total (a)
-        
-        # Rastrear qué variables fueron proporcionadas
-        provided = {k: v for k, v in [
-            ('v', vel), ('a_t', a_tangential), ('a_c', a_centripetal),
-            ('rho', rho), ('a', a_total)
-        ] if v is not None}
-        
-    # Log de las variables proporcionadas para depuración
-    logging.debug(f"Provided variables: {provided}")
-    
-    if len(provided) < 1:
-        return "Datos insuficientes para calcular la solución. Por favor, proporcione al menos un dato.", solution_data
-        
+    key = None
+    if not options['stream']:
+        with timed('cache'):
+            key = request_key(options, binary, dtype)
+            if request.if_none_match.contains(key):
+                return cacheable(Response(status=304), key)
+            cached = response_cache.get(key)
+        if cached is not None:
+            body, mimetype = cached
+            return cacheable(Response(body, mimetype=mimetype), key)
+
     try:
-        # Movimiento Circular Uniforme (MCU)
-        if exercise_type == 'MCU':
-            if solve_for == 't':  # 🔹 TIEMPO
-                if 'θ' in provided and 'ω' in provided:
-                    # t = θ / ω
-                    time_result = provided['θ'] / provided['ω']
-                    solution_text = f"t = θ / ω = {provided['θ']:.4f} / {provided['ω']:.4f} = {time_result:.4f} s"
-                    solution_data['t'] = time_result
-                elif 'N' in provided and 'ω' in provided:
-                    # t = 2πN / ω
-                    time_result = 2 * sp.pi * provided['N'] / provided['ω']
-                    solution_text = f"t = 2πN / ω = 2π · {provided['N']:.4f} / {provided['ω']:.4f} = {time_result:.4f} s"
-                    solution_data['t'] = time_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el tiempo (t) en MCU, necesita proporcionar: (θ, ω) o (N, ω)"
-            
-            elif solve_for == 'ω':  # 🔹 VELOCIDAD ANGULAR
-                if 'θ' in provided and 't' in provided:
-                    # ω = θ / t
-                    omega_result = provided['θ'] / provided['t']
-                    solution_text = f"ω = θ / t = {provided['θ']:.4f} / {provided['t']:.4f} = {omega_result:.4f} rad/s"
-                    solution_data['ω'] = omega_result
-                elif 'f' in provided:
-                    # ω = 2πf
-                    omega_result = 2 * sp.pi * provided['f']
-                    solution_text = f"ω = 2πf = 2π · {provided['f']:.4f} = {omega_result:.4f} rad/s"
-                    solution_data['ω'] = omega_result
-                elif 'T' in provided:
-                    # ω = 2π / T
-                    omega_result = 2 * sp.pi / provided['T']
-                    solution_text = f"ω = 2π / T = 2π / {provided['T']:.4f} = {omega_result:.4f} rad/s"
-                    solution_data['ω'] = omega_result
-                elif 'N' in provided and 't' in provided:
-                    # ω = 2πN / t
-                    omega_result = 2 * sp.pi * provided['N'] / provided['t']
-                    solution_text = f"ω = 2πN / t = 2π · {provided['N']:.4f} / {provided['t']:.4f} = {omega_result:.4f} rad/s"
-                    solution_data['ω'] = omega_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la velocidad angular (ω) en MCU, necesita proporcionar: (θ, t), (f), (T), o (N, t)"
-            
-            elif solve_for == 'f':  # 🔹 FRECUENCIA
-                if 'T' in provided:
-                    # f = 1 / T
-                    freq_result = 1 / provided['T']
-                    solution_text = f"f = 1 / T = 1 / {provided['T']:.4f} = {freq_result:.4f} Hz"
-                    solution_data['f'] = freq_result
-                elif 'ω' in provided:
-                    # f = ω / 2π
-                    freq_result = provided['ω'] / (2 * sp.pi)
-                    solution_text = f"f = ω / 2π = {provided['ω']:.4f} / 2π = {freq_result:.4f} Hz"
-                    solution_data['f'] = freq_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la frecuencia (f) en MCU, necesita proporcionar: (T) o (ω)"
-            
-            elif solve_for == 'T':  # 🔹 PERÍODO
-                if 'f' in provided:
-                    # T = 1 / f
-                    period_result = 1 / provided['f']
-                    solution_text = f"T = 1 / f = 1 / {provided['f']:.4f} = {period_result:.4f} s"
-                    solution_data['T'] = period_result
-                elif 'ω' in provided:
-                    # T = 2π / ω
-                    period_result = 2 * sp.pi / provided['ω']
-                    solution_text = f"T = 2π / ω = 2π / {provided['ω']:.4f} = {period_result:.4f} s"
-                    solution_data['T'] = period_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el período (T) en MCU, necesita proporcionar: (f) o (ω)"
-            
-            elif solve_for == 'θ':  # 🔹 ÁNGULO
-                if 'ω' in provided and 't' in provided:
-                    # θ = ωt
-                    theta_result = provided['ω'] * provided['t']
-                    solution_text = f"θ = ωt = {provided['ω']:.4f} · {provided['t']:.4f} = {theta_result:.4f} rad"
-                    solution_data['θ'] = theta_result
-                elif 'N' in provided:
-                    # θ = 2πN
-                    theta_result = 2 * sp.pi * provided['N']
-                    solution_text = f"θ = 2πN = 2π · {provided['N']:.4f} = {theta_result:.4f} rad"
-                    solution_data['θ'] = theta_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el ángulo (θ) en MCU, necesita proporcionar: (ω, t) o (N)"
-                    
-            elif solve_for == 'v':  # 🔹 VELOCIDAD TANGENCIAL
-                if 'ω' in provided and 'r' in provided:
-                    # v = ωr
-                    vel_result = provided['ω'] * provided['r']
-                    solution_text = f"v = ωr = {provided['ω']:.4f} · {provided['r']:.4f} = {vel_result:.4f} m/s"
-                    solution_data['v'] = vel_result
-                elif 'r' in provided and 'T' in provided:
-                    # v = 2πr / T
-                    vel_result = 2 * sp.pi * provided['r'] / provided['T']
-                    solution_text = f"v = 2πr / T = 2π · {provided['r']:.4f} / {provided['T']:.4f} = {vel_result:.4f} m/s"
-                    solution_data['v'] = vel_result
-                elif 'r' in provided and 'f' in provided:
-                    # v = 2πrf
-                    vel_result = 2 * sp.pi * provided['r'] * provided['f']
-                    solution_text = f"v = 2πrf = 2π · {provided['r']:.4f} · {provided['f']:.4f} = {vel_result:.4f} m/s"
-                    solution_data['v'] = vel_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la velocidad tangencial (v) en MCU, necesita proporcionar: (ω, r), (r, T), o (r, f)"
-            
-            elif solve_for == 'r':  # 🔹 RADIO
-                if 'v' in provided and 'ω' in provided:
-                    # r = v / ω
-                    radius_result = provided['v'] / provided['ω']
-                    solution_text = f"r = v / ω = {provided['v']:.4f} / {provided['ω']:.4f} = {radius_result:.4f} m"
-                    solution_data['r'] = radius_result
-                elif 'v' in provided and 'a_c' in provided:
-                    # r = v² / a_c
-                    radius_result = provided['v']**2 / provided['a_c']
-                    solution_text = f"r = v² / a_c = {provided['v']:.4f}² / {provided['a_c']:.4f} = {radius_result:.4f} m"
-                    solution_data['r'] = radius_result
-                elif 'v' in provided and 'T' in provided:
-                    # r = vT / 2π
-                    radius_result = provided['v'] * provided['T'] / (2 * sp.pi)
-                    solution_text = f"r = vT / 2π = {provided['v']:.4f} · {provided['T']:.4f} / 2π = {radius_result:.4f} m"
-                    solution_data['r'] = radius_result
-                elif 'v' in provided and 'f' in provided:
-                    # r = v / 2πf
-                    radius_result = provided['v'] / (2 * sp.pi * provided['f'])
-                    solution_text = f"r = v / 2πf = {provided['v']:.4f} / (2π · {provided['f']:.4f}) = {radius_result:.4f} m"
-                    solution_data['r'] = radius_result
-                elif 'a_c' in provided and 'ω' in provided:
-                    # r = a_c / ω²
-                    radius_result = provided['a_c'] / (provided['ω']**2)
-                    solution_text = f"r = a_c / ω² = {provided['a_c']:.4f} / {provided['ω']:.4f}² = {radius_result:.4f} m"
-                    solution_data['r'] = radius_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el radio (r) en MCU, necesita proporcionar: (v, ω), (v, a_c), (v, T), (v, f), o (a_c, ω)"
-            
-            elif solve_for == 'a_c':  # 🔹 ACELERACIÓN CENTRÍPETA
-                if 'v' in provided and 'r' in provided:
-                    # a_c = v² / r
-                    a_c_result = provided['v']**2 / provided['r']
-                    solution_text = f"a_c = v² / r = {provided['v']:.4f}² / {provided['r']:.4f} = {a_c_result:.4f} m/s²"
-                    solution_data['a_c'] = a_c_result
-                elif 'ω' in provided and 'r' in provided:
-                    # a_c = ω²r
-                    a_c_result = provided['ω']**2 * provided['r']
-                    solution_text = f"a_c = ω²r = {provided['ω']:.4f}² · {provided['r']:.4f} = {a_c_result:.4f} m/s²"
-                    solution_data['a_c'] = a_c_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la aceleración centrípeta (a_c) en MCU, necesita proporcionar: (v, r) o (ω, r)"
-            
-            elif solve_for == 'N':  # 🔹 NÚMERO DE VUELTAS
-                if 'θ' in provided:
-                    # N = θ / 2π
-                    n_result = provided['θ'] / (2 * sp.pi)
-                    solution_text = f"N = θ / 2π = {provided['θ']:.4f} / 2π = {n_result:.4f} vueltas"
-                    solution_data['N'] = n_result
-                elif 'ω' in provided and 't' in provided:
-                    # N = ωt / 2π
-                    n_result = provided['ω'] * provided['t'] / (2 * sp.pi)
-                    solution_text = f"N = ωt / 2π = {provided['ω']:.4f} · {provided['t']:.4f} / 2π = {n_result:.4f} vueltas"
-                    solution_data['N'] = n_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el número de vueltas (N) en MCU, necesita proporcionar: (θ) o (ω, t)"
-        
-        # Movimiento Circular No Uniforme (MCNU)
-        elif exercise_type == 'MCNU':
-            if solve_for == 't':  # 🔹 TIEMPO
-                if 'ω_f' in provided and 'ω_i' in provided and 'alpha' in provided:
-                    # t = (ω_f - ω_i) / α
-                    time_result = (provided['ω_f'] - provided['ω_i']) / provided['alpha']
-                    solution_text = f"t = (ω_f - ω_i) / α = ({provided['ω_f']:.4f} - {provided['ω_i']:.4f}) / {provided['alpha']:.4f} = {time_result:.4f} s"
-                    solution_data['t'] = time_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el tiempo (t) en MCNU, necesita proporcionar: (ω_f, ω_i, α)"
-            
-            elif solve_for == 'alpha':  # 🔹 ACELERACIÓN ANGULAR
-                if 'ω_f' in provided and 'ω_i' in provided and 't' in provided:
-                    # α = (ω_f - ω_i) / t
-                    alpha_result = (provided['ω_f'] - provided['ω_i']) / provided['t']
-                    solution_text = f"α = (ω_f - ω_i) / t = ({provided['ω_f']:.4f} - {provided['ω_i']:.4f}) / {provided['t']:.4f} = {alpha_result:.4f} rad/s²"
-                    solution_data['alpha'] = alpha_result
-                elif 'θ' in provided and 'ω_i' in provided and 't' in provided:
-                    # α = (θ - ω_i·t) * 2 / t²
-                    alpha_result = (provided['θ'] - provided['ω_i'] * provided['t']) * 2 / (provided['t']**2)
-                    solution_text = f"α = (θ - ω_i·t) * 2 / t² = ({provided['θ']:.4f} - {provided['ω_i']:.4f}·{provided['t']:.4f}) * 2 / {provided['t']:.4f}² = {alpha_result:.4f} rad/s²"
-                    solution_data['alpha'] = alpha_result
-                elif 'ω_f' in provided and 'ω_i' in provided and 'θ' in provided:
-                    # α = (ω_f² - ω_i²) / (2θ)
-                    alpha_result = (provided['ω_f']**2 - provided['ω_i']**2) / (2 * provided['θ'])
-                    solution_text = f"α = (ω_f² - ω_i²) / (2θ) = ({provided['ω_f']:.4f}² - {provided['ω_i']:.4f}²) / (2 · {provided['θ']:.4f}) = {alpha_result:.4f} rad/s²"
-                    solution_data['alpha'] = alpha_result
-                elif 'a_t' in provided and 'r' in provided:
-                    # α = a_t / r
-                    alpha_result = provided['a_t'] / provided['r']
-                    solution_text = f"α = a_t / r = {provided['a_t']:.4f} / {provided['r']:.4f} = {alpha_result:.4f} rad/s²"
-                    solution_data['alpha'] = alpha_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la aceleración angular (α) en MCNU, necesita proporcionar: (ω_f, ω_i, t), (θ, ω_i, t), (ω_f, ω_i, θ), o (a_t, r)"
-            
-            elif solve_for == 'ω_f':  # 🔹 VELOCIDAD ANGULAR FINAL
-                if 'ω_i' in provided and 'alpha' in provided and 't' in provided:
-                    # ω_f = ω_i + αt
-                    omega_f_result = provided['ω_i'] + provided['alpha'] * provided['t']
-                    solution_text = f"ω_f = ω_i + αt = {provided['ω_i']:.4f} + {provided['alpha']:.4f}·{provided['t']:.4f} = {omega_f_result:.4f} rad/s"
-                    solution_data['ω_f'] = omega_f_result
-                elif 'ω_i' in provided and 'alpha' in provided and 'θ' in provided:
-                    # ω_f² = ω_i² + 2αθ
-                    omega_f_result = sp.sqrt(provided['ω_i']**2 + 2 * provided['alpha'] * provided['θ'])
-                    solution_text = f"ω_f = √(ω_i² + 2αθ) = √({provided['ω_i']:.4f}² + 2·{provided['alpha']:.4f}·{provided['θ']:.4f}) = {omega_f_result:.4f} rad/s"
-                    solution_data['ω_f'] = omega_f_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la velocidad angular final (ω_f) en MCNU, necesita proporcionar: (ω_i, α, t) o (ω_i, α, θ)"
-            
-            elif solve_for == 'ω_i':  # 🔹 VELOCIDAD ANGULAR INICIAL
-                if 'ω_f' in provided and 'alpha' in provided and 't' in provided:
-                    # ω_i = ω_f - αt
-                    omega_i_result = provided['ω_f'] - provided['alpha'] * provided['t']
-                    solution_text = f"ω_i = ω_f - αt = {provided['ω_f']:.4f} - {provided['alpha']:.4f}·{provided['t']:.4f} = {omega_i_result:.4f} rad/s"
-                    solution_data['ω_i'] = omega_i_result
-                elif 'ω_f' in provided and 'alpha' in provided and 'θ' in provided:
-                    # ω_i² = ω_f² - 2αθ
-                    omega_i_result = sp.sqrt(provided['ω_f']**2 - 2 * provided['alpha'] * provided['θ'])
-                    solution_text = f"ω_i = √(ω_f² - 2αθ) = √({provided['ω_f']:.4f}² - 2·{provided['alpha']:.4f}·{provided['θ']:.4f}) = {omega_i_result:.4f} rad/s"
-                    solution_data['ω_i'] = omega_i_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la velocidad angular inicial (ω_i) en MCNU, necesita proporcionar: (ω_f, α, t) o (ω_f, α, θ)"
-            
-            elif solve_for == 'θ':  # 🔹 ÁNGULO
-                if 'ω_i' in provided and 'alpha' in provided and 't' in provided:
-                    # θ = ω_i t + ½ α t²
-                    theta_result = provided['ω_i'] * provided['t'] + 0.5 * provided['alpha'] * (provided['t']**2)
-                    solution_text = f"θ = ω_i·t + ½·α·t² = {provided['ω_i']:.4f}·{provided['t']:.4f} + 0.5·{provided['alpha']:.4f}·{provided['t']:.4f}² = {theta_result:.4f} rad"
-                    solution_data['θ'] = theta_result
-                elif 'ω_f' in provided and 'ω_i' in provided and 'alpha' in provided:
-                    # θ = (ω_f² - ω_i²) / (2α)
-                    theta_result = (provided['ω_f']**2 - provided['ω_i']**2) / (2 * provided['alpha'])
-                    solution_text = f"θ = (ω_f² - ω_i²) / (2α) = ({provided['ω_f']:.4f}² - {provided['ω_i']:.4f}²) / (2·{provided['alpha']:.4f}) = {theta_result:.4f} rad"
-                    solution_data['θ'] = theta_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el ángulo (θ) en MCNU, necesita proporcionar: (ω_i, α, t) o (ω_f, ω_i, α)"
-            
-            elif solve_for == 'a_t':  # 🔹 ACELERACIÓN TANGENCIAL
-                if 'alpha' in provided and 'r' in provided:
-                    # a_t = αr
-                    a_t_result = provided['alpha'] * provided['r']
-                    solution_text = f"a_t = αr = {provided['alpha']:.4f}·{provided['r']:.4f} = {a_t_result:.4f} m/s²"
-                    solution_data['a_t'] = a_t_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la aceleración tangencial (a_t) en MCNU, necesita proporcionar: (α, r)"
-            
-            elif solve_for == 'a_c':  # 🔹 ACELERACIÓN CENTRÍPETA
-                if 'ω_f' in provided and 'r' in provided:
-                    # a_c = ω²r
-                    a_c_result = provided['ω_f']**2 * provided['r']
-                    solution_text = f"a_c = ω²r = {provided['ω_f']:.4f}²·{provided['r']:.4f} = {a_c_result:.4f} m/s²"
-                    solution_data['a_c'] = a_c_result
-                elif 'v' in provided and 'r' in provided:
-                    # a_c = v² / r
-                    a_c_result = provided['v']**2 / provided['r']
-                    solution_text = f"a_c = v² / r = {provided['v']:.4f}² / {provided['r']:.4f} = {a_c_result:.4f} m/s²"
-                    solution_data['a_c'] = a_c_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la aceleración centrípeta (a_c) en MCNU, necesita proporcionar: (ω, r) o (v, r)"
-            
-            elif solve_for == 'a':  # 🔹 ACELERACIÓN TOTAL
-                if 'a_t' in provided and 'a_c' in provided:
-                    # a = √(a_t² + a_c²)
-                    a_result = sp.sqrt(provided['a_t']**2 + provided['a_c']**2)
-                    solution_text = f"a = √(a_t² + a_c²) = √({provided['a_t']:.4f}² + {provided['a_c']:.4f}²) = {a_result:.4f} m/s²"
-                    solution_data['a'] = a_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la aceleración total (a) en MCNU, necesita proporcionar: (a_t, a_c)"
-                    
-            elif solve_for == 'r':  # 🔹 RADIO
-                if 'v' in provided and 'a_c' in provided:
-                    # r = v² / a_c
-                    radius_result = provided['v']**2 / provided['a_c']
-                    solution_text = f"r = v² / a_c = {provided['v']:.4f}² / {provided['a_c']:.4f} = {radius_result:.4f} m"
-                    solution_data['r'] = radius_result
-                elif 'a_t' in provided and 'alpha' in provided:
-                    # r = a_t / α
-                    radius_result = provided['a_t'] / provided['alpha']
-                    solution_text = f"r = a_t / α = {provided['a_t']:.4f} / {provided['alpha']:.4f} = {radius_result:.4f} m"
-                    solution_data['r'] = radius_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el radio (r) en MCNU, necesita proporcionar: (v, a_c) o (a_t, α)"
-            
-        # Movimiento Parabólico (TP)
-        elif exercise_type == 'TP':
-            if solve_for == 't':  # 🔹 TIEMPO DE VUELO
-                if 'v_0' in provided and 'θ' in provided and 'g' in provided:
-                    # Caso especial para ángulo 0 (movimiento horizontal)
-                    if abs(provided['θ']) < 1e-6:  # Prácticamente 0
-                        if 'R' in provided:
-                            time_result = provided['R'] / provided['v_0']
-                            solution_text = f"t = R / v₀ = {provided['R']:.4f} / {provided['v_0']:.4f} = {time_result:.4f} s (caso especial: trayectoria horizontal)"
-                            solution_data['t'] = time_result
-                        else:
-                            solution_text = "Para ángulo 0° (horizontal), se necesita el alcance (R) para calcular el tiempo de vuelo."
-                    else:
-                        # t = (2 v₀ sinθ) / g
-                        time_result = (2 * provided['v_0'] * sp.sin(provided['θ'])) / provided['g']
-                        solution_text = f"t = (2 v₀ sinθ) / g = (2 · {provided['v_0']:.4f} · sin({provided['θ']:.4f})) / {provided['g']:.4f} = {time_result:.4f} s"
-                        solution_data['t'] = time_result
-                elif 'x' in provided and 'v_0x' in provided:
-                    # t = x / v₀ₓ
-                    time_result = provided['x'] / provided['v_0x']
-                    solution_text = f"t = x / v₀ₓ = {provided['x']:.4f} / {provided['v_0x']:.4f} = {time_result:.4f} s"
-                    solution_data['t'] = time_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el tiempo de vuelo (t) en tiro parabólico, necesita proporcionar: (v_0, θ, g) o (x, v_0x)"
-            
-            elif solve_for == 'v_0':  # 🔹 VELOCIDAD INICIAL
-                if 'v_0x' in provided and 'v_0y' in provided:
-                    # v₀ = √(v₀ₓ² + v₀ᵧ²)
-                    v0_result = sp.sqrt(provided['v_0x']**2 + provided['v_0y']**2)
-                    solution_text = f"v₀ = √(v₀ₓ² + v₀ᵧ²) = √({provided['v_0x']:.4f}² + {provided['v_0y']:.4f}²) = {v0_result:.4f} m/s"
-                    solution_data['v_0'] = v0_result
-                elif 'R' in provided and 'θ' in provided and 'g' in provided:
-                    # v₀ = √(Rg / sin(2θ))
-                    v0_result = sp.sqrt(provided['R'] * provided['g'] / sp.sin(2 * provided['θ']))
-                    solution_text = f"v₀ = √(Rg / sin(2θ)) = √({provided['R']:.4f} · {provided['g']:.4f} / sin(2 · {provided['θ']:.4f})) = {v0_result:.4f} m/s"
-                    solution_data['v_0'] = v0_result
-                elif 'H' in provided and 'θ' in provided and 'g' in provided:
-                    # v₀ = √(2gH / sin²θ)
-                    v0_result = sp.sqrt(2 * provided['g'] * provided['H'] / (sp.sin(provided['θ'])**2))
-                    solution_text = f"v₀ = √(2gH / sin²θ) = √(2 · {provided['g']:.4f} · {provided['H']:.4f} / sin²({provided['θ']:.4f})) = {v0_result:.4f} m/s"
-                    solution_data['v_0'] = v0_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la velocidad inicial (v_0) en tiro parabólico, necesita proporcionar: (v_0x, v_0y), (R, θ, g), o (H, θ, g)"
-                    
-            elif solve_for == 'v_0x':  # 🔹 COMPONENTE HORIZONTAL DE VELOCIDAD INICIAL
-                if 'v_0' in provided and 'θ' in provided:
-                    # v₀ₓ = v₀ cos(θ)
-                    v0x_result = provided['v_0'] * sp.cos(provided['θ'])
-                    solution_text = f"v₀ₓ = v₀ cos(θ) = {provided['v_0']:.4f} · cos({provided['θ']:.4f}) = {v0x_result:.4f} m/s"
-                    solution_data['v_0x'] = v0x_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la componente horizontal de la velocidad inicial (v_0x) en tiro parabólico, necesita proporcionar: (v_0, θ)"
-                    
-            elif solve_for == 'v_0y':  # 🔹 COMPONENTE VERTICAL DE VELOCIDAD INICIAL
-                if 'v_0' in provided and 'θ' in provided:
-                    # v₀ᵧ = v₀ sin(θ)
-                    v0y_result = provided['v_0'] * sp.sin(provided['θ'])
-                    solution_text = f"v₀ᵧ = v₀ sin(θ) = {provided['v_0']:.4f} · sin({provided['θ']:.4f}) = {v0y_result:.4f} m/s"
-                    solution_data['v_0y'] = v0y_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la componente vertical de la velocidad inicial (v_0y) en tiro parabólico, necesita proporcionar: (v_0, θ)"
-                    
-            elif solve_for == 'θ':  # 🔹 ÁNGULO DE LANZAMIENTO
-                if 'v_0x' in provided and 'v_0y' in provided:
-                    # θ = arctan(v₀ᵧ / v₀ₓ)
-                    theta_result = sp.atan(provided['v_0y'] / provided['v_0x'])
-                    solution_text = f"θ = arctan(v₀ᵧ / v₀ₓ) = arctan({provided['v_0y']:.4f} / {provided['v_0x']:.4f}) = {theta_result:.4f} rad"
-                    solution_data['θ'] = theta_result
-                elif 'R' in provided and 'H' in provided and 'g' in provided:
-                    # θ = arctan(4H / R)
-                    theta_result = sp.atan(4 * provided['H'] / provided['R'])
-                    solution_text = f"θ = arctan(4H / R) = arctan(4 · {provided['H']:.4f} / {provided['R']:.4f}) = {theta_result:.4f} rad"
-                    solution_data['θ'] = theta_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el ángulo de lanzamiento (θ) en tiro parabólico, necesita proporcionar: (v_0x, v_0y) o (R, H, g)"
-                    
-            elif solve_for == 'H':  # 🔹 ALTURA MÁXIMA
-                if 'v_0' in provided and 'θ' in provided and 'g' in provided:
-                    # H = (v₀² sin²θ) / (2g)
-                    height_result = (provided['v_0']**2 * (sp.sin(provided['θ'])**2)) / (2 * provided['g'])
-                    solution_text = f"H = (v₀² sin²θ) / (2g) = ({provided['v_0']:.4f}² · sin²({provided['θ']:.4f})) / (2 · {provided['g']:.4f}) = {height_result:.4f} m"
-                    solution_data['H'] = height_result
-                elif 'v_0y' in provided and 'g' in provided:
-                    # H = v₀ᵧ² / (2g)
-                    height_result = provided['v_0y']**2 / (2 * provided['g'])
-                    solution_text = f"H = v₀ᵧ² / (2g) = {provided['v_0y']:.4f}² / (2 · {provided['g']:.4f}) = {height_result:.4f} m"
-                    solution_data['H'] = height_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la altura máxima (H) en tiro parabólico, necesita proporcionar: (v_0, θ, g) o (v_0y, g)"
-                    
-            elif solve_for == 'R':  # 🔹 ALCANCE HORIZONTAL
-                if 'v_0' in provided and 'θ' in provided and 'g' in provided:
-                    # R = (v₀² sin(2θ)) / g
-                    range_result = (provided['v_0']**2 * sp.sin(2 * provided['θ'])) / provided['g']
-                    solution_text = f"R = (v₀² sin(2θ)) / g = ({provided['v_0']:.4f}² · sin(2 · {provided['θ']:.4f})) / {provided['g']:.4f} = {range_result:.4f} m"
-                    solution_data['R'] = range_result
-                elif 'v_0x' in provided and 't' in provided:
-                    # R = v₀ₓ · t
-                    range_result = provided['v_0x'] * provided['t']
-                    solution_text = f"R = v₀ₓ · t = {provided['v_0x']:.4f} · {provided['t']:.4f} = {range_result:.4f} m"
-                    solution_data['R'] = range_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el alcance horizontal (R) en tiro parabólico, necesita proporcionar: (v_0, θ, g) o (v_0x, t)"
-                    
-            elif solve_for == 'g':  # 🔹 ACELERACIÓN GRAVITACIONAL
-                if 'v_0' in provided and 'θ' in provided and 'R' in provided:
-                    # g = (v₀² sin(2θ)) / R
-                    g_result = (provided['v_0']**2 * sp.sin(2 * provided['θ'])) / provided['R']
-                    solution_text = f"g = (v₀² sin(2θ)) / R = ({provided['v_0']:.4f}² · sin(2 · {provided['θ']:.4f})) / {provided['R']:.4f} = {g_result:.4f} m/s²"
-                    solution_data['g'] = g_result
-                elif 'v_0' in provided and 'θ' in provided and 'H' in provided:
-                    # g = (v₀² sin²θ) / (2H)
-                    g_result = (provided['v_0']**2 * (sp.sin(provided['θ'])**2)) / (2 * provided['H'])
-                    solution_text = f"g = (v₀² sin²θ) / (2H) = ({provided['v_0']:.4f}² · sin²({provided['θ']:.4f})) / (2 · {provided['H']:.4f}) = {g_result:.4f} m/s²"
-                    solution_data['g'] = g_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la aceleración gravitacional (g) en tiro parabólico, necesita proporcionar: (v_0, θ, R) o (v_0, θ, H)"
-        
-        # Movimiento Curvilíneo General (MCG)
-        elif exercise_type == 'MCG':
-            if solve_for == 'v':  # 🔹 VELOCIDAD
-                if 'a_c' in provided and 'rho' in provided:
-                    # v = √(a_c * ρ)
-                    vel_result = sp.sqrt(provided['a_c'] * provided['rho'])
-                    solution_text = f"v = √(a_c · ρ) = √({provided['a_c']:.4f} · {provided['rho']:.4f}) = {vel_result:.4f} m/s"
-                    solution_data['v'] = vel_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la velocidad (v) en MCG, necesita proporcionar: (a_c, ρ)"
-                    
-            elif solve_for == 'a_c':  # 🔹 ACELERACIÓN NORMAL/CENTRÍPETA
-                if 'v' in provided and 'rho' in provided:
-                    # a_c = v² / ρ
-                    a_c_result = provided['v']**2 / provided['rho']
-                    solution_text = f"a_c = v² / ρ = {provided['v']:.4f}² / {provided['rho']:.4f} = {a_c_result:.4f} m/s²"
-                    solution_data['a_c'] = a_c_result
-                elif 'a' in provided and 'a_t' in provided and provided['a'] > provided['a_t']:
-                    # a_c = √(a² - a_t²)
-                    a_c_result = sp.sqrt(provided['a']**2 - provided['a_t']**2)
-                    solution_text = f"a_c = √(a² - a_t²) = √({provided['a']:.4f}² - {provided['a_t']:.4f}²) = {a_c_result:.4f} m/s²"
-                    solution_data['a_c'] = a_c_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la aceleración normal (a_c) en MCG, necesita proporcionar: (v, ρ) o (a, a_t)"
-                    
-            elif solve_for == 'rho':  # 🔹 RADIO DE CURVATURA
-                if 'v' in provided and 'a_c' in provided:
-                    # ρ = v² / a_c
-                    rho_result = provided['v']**2 / provided['a_c']
-                    solution_text = f"ρ = v² / a_c = {provided['v']:.4f}² / {provided['a_c']:.4f} = {rho_result:.4f} m"
-                    solution_data['rho'] = rho_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular el radio de curvatura (ρ) en MCG, necesita proporcionar: (v, a_c)"
-                    
-            elif solve_for == 'a_t':  # 🔹 ACELERACIÓN TANGENCIAL
-                if 'a' in provided and 'a_c' in provided and provided['a'] > provided['a_c']:
-                    # a_t = √(a² - a_c²)
-                    a_t_result = sp.sqrt(provided['a']**2 - provided['a_c']**2)
-                    solution_text = f"a_t = √(a² - a_c²) = √({provided['a']:.4f}² - {provided['a_c']:.4f}²) = {a_t_result:.4f} m/s²"
-                    solution_data['a_t'] = a_t_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la aceleración tangencial (a_t) en MCG, necesita proporcionar: (a, a_c)"
-                    
-            elif solve_for == 'a':  # 🔹 ACELERACIÓN TOTAL
-                if 'a_t' in provided and 'a_c' in provided:
-                    # a = √(a_t² + a_c²)
-                    a_result = sp.sqrt(provided['a_t']**2 + provided['a_c']**2)
-                    solution_text = f"a = √(a_t² + a_c²) = √({provided['a_t']:.4f}² + {provided['a_c']:.4f}²) = {a_result:.4f} m/s²"
-                    solution_data['a'] = a_result
-                else:
-                    solution_text = "Datos insuficientes. Para calcular la aceleración total (a) en MCG, necesita proporcionar: (a_t, a_c)"
-        
+        computation = Computation(options)
+    except PipelineError as e:
+        return jsonify(e.payload), e.status
+
+    computation.solve()  # Calcula soluciones para problemas de física si se solicitan
+    results = computation.results
+    if options['stream']:
+        return Response(stream_with_context(stream_chunks(computation.evaluate_all, results, options['t_max'], options['intervals'],
+                                                          options['chunk_size'], binary, dtype)),
+                        mimetype=BINARY_MIMETYPE if binary else NDJSON_MIMETYPE)
+
+    # Generación de valores de tiempo; en modo adaptativo `intervals` es el máximo de puntos
+    t_vals = computation.time_grid()
+    results['sampling'] = options['sampling']
+    arrays = {'t': t_vals}  # Series numéricas, que se serializan al final según el formato pedido
+    computation.evaluate_all(t_vals, arrays, results['invalid_points'])
+    if options['max_points']:
+        # Los datos escalares (longitud de arco, eventos...) ya se calcularon con todos los puntos
+        arrays, downsampling = downsample_arrays(arrays, options['max_points'])
+        if downsampling is not None:
+            results['downsampling'] = downsampling
+
+    with timed('serialize'):
+        if binary:
+            # Cabecera JSON seguida de los búferes crudos de cada serie
+            response = Response(encode_columnar(arrays, results, dtype), mimetype=BINARY_MIMETYPE)
         else:
-            solution_text = f"Tipo de ejercicio no reconocido: {exercise_type}"
-            
-    except Exception as e:
-        logging.error(f"Error al calcular la solución: {str(e)}")
-        solution_text = f"Error al calcular la solución: {str(e)}"
-    
-    return solution_text, solution_data
\ No newline at end of file
+            response = jsonify(arrays_to_json(arrays, results))  # Devuelve los resultados en formato JSON
+    response_cache.put(key, response.get_data(), response.mimetype)
+    return cacheable(response, key)
+
+# Función para añadir los validadores HTTP a una respuesta de /get_data
+def cacheable(response, etag):
+    """
+    Añade el ETag y las cabeceras que obligan al navegador a revalidar la
+    respuesta con If-None-Match antes de reutilizarla.
+    """
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept')  # El formato (JSON o binario) puede depender de la cabecera Accept
+    return response
+
+# Función generadora de la respuesta por bloques de /get_data
+def stream_chunks(evaluate_all, results, t_max, intervals, chunk_size, binary, dtype):
+    """
+    Evalúa las funciones vectoriales sobre bloques consecutivos de la malla
+    temporal y envía cada bloque en cuanto está listo, de modo que la memoria
+    no crece con `intervals`. Cada bloque lleva 'offset' (índice de su primer
+    punto) y sus propias series, incluida 't'. Antes de los bloques se envía
+    una cabecera con los datos de la solución y, al final, un cierre con
+    'done' y el total de puntos inválidos por serie.
+    En NDJSON cada mensaje es una línea; en binario es un marco con prefijo de
+    longitud codificado con encode_frame.
+    """
+    def frame(arrays, metadata):
+        return encode_frame(arrays, metadata, dtype) if binary else ndjson_line(arrays_to_json(arrays, metadata))
+
+    invalid_points = {}
+    yield frame({}, dict({k: v for k, v in results.items() if k != 'invalid_points'}, intervals=intervals, chunk_size=chunk_size))
+    for offset, t_vals in time_chunks(0.0, t_max, intervals, chunk_size):
+        arrays = {'t': t_vals}
+        evaluate_all(t_vals, arrays, invalid_points)
+        yield frame(arrays, {'offset': offset})
+    yield frame({}, {'done': True, 'invalid_points': invalid_points})
+
+# Número máximo de curvas aceptadas por una petición a /batch
+BATCH_MAX_CURVES = int(os.environ.get('CURVIPATH_BATCH_MAX_CURVES', 1000))
+
+# Función para leer una especificación de malla temporal
+def parse_time_grid(spec, defaults):
+    """
+    Lee t_min, t_max e intervals de un diccionario, usando `defaults` para
+    los valores ausentes. Devuelve una tupla (t_min, t_max, intervals).
+    """
+    t_min = float(spec.get('t_min', defaults[0]))  # Tiempo inicial
+    t_max = float(spec.get('t_max', defaults[1]))  # Tiempo máximo
+    intervals = int(spec.get('intervals', defaults[2]))  # Número de intervalos
+    if intervals < 1:
+        raise ValueError('intervals must be positive')
+    return t_min, t_max, intervals
+
+# Ruta para evaluar muchas funciones vectoriales en una sola petición
+@app.route('/batch', methods=['POST'])
+def batch():
+    """
+    Evalúa una lista de funciones vectoriales (JSON con "grid", "curves" y "variables").
+    Cada curva devuelve sus series o su propio error, sin invalidar el resto.
+    """
+    payload = request.get_json(silent=True)
+    try:
+        if not isinstance(payload, dict) or not isinstance(payload.get('curves'), list):
+            raise ValueError('expected a JSON object with a "curves" list')
+        curves = payload['curves']
+        if len(curves) > BATCH_MAX_CURVES:
+            raise ValueError(f'at most {BATCH_MAX_CURVES} curves per request')
+        shared_grid = parse_time_grid(payload.get('grid') or {}, (0.0, 10.0, 100))
+        simplify_mode = payload.get('simplify', DEFAULT_SIMPLIFY_MODE)  # Política de simplificación
+        if simplify_mode not in SIMPLIFY_MODES:
+            raise ValueError(f"simplify must be one of {', '.join(SIMPLIFY_MODES)}")
+        shared_params = physics.parameter_values(payload.get('variables') or {})  # Parámetros comunes de las ecuaciones
+    except (AttributeError, TypeError, ValueError) as e:
+        logging.error(f"Invalid batch parameters: {str(e)}")
+        return jsonify({'error': 'Invalid parameters: ' + str(e)}), 400
+
+    shared_t = np.linspace(*shared_grid)  # Malla común a todas las curvas sin rango propio
+    grids = {shared_grid: shared_t}  # Mallas ya generadas, reutilizadas entre curvas con el mismo rango
+    response = {'t': shared_t.tolist(), 'curves': [], 'errors': 0}
+
+    # Compila todas las componentes de todas las curvas en una sola pasada
+    compiled_curves = compile_vector_functions([
+        [(name, '' if curve.get(name) is None else str(curve.get(name))) for name in ('x', 'y', 'z')]
+        if isinstance(curve, dict) else []
+        for curve in curves
+    ], simplify_mode)
+
+    for idx, (curve, components) in enumerate(zip(curves, compiled_curves)):
+        entry = {'index': idx + 1}
+        try:
+            if not isinstance(curve, dict):
+                raise ValueError('each curve must be a JSON object')
+            grid = parse_time_grid(curve, shared_grid)
+            if isinstance(components, EquationError):
+                raise components
+            if not components:
+                raise ValueError('the curve has no equations')
+            if grid not in grids:
+                grids[grid] = np.linspace(*grid)
+                entry['t'] = grids[grid].tolist()  # Solo las curvas con rango propio llevan su malla
+            elif grid != shared_grid:
+                entry['t'] = grids[grid].tolist()
+
+            params = dict(shared_params, **physics.parameter_values(curve.get('variables') or {}))
+            missing = sorted({name for _, compiled in components for name in compiled.params} - params.keys())
+            if missing:
+                raise ValueError(f'Missing value for parameter(s) {", ".join(missing)}')
+            entry['invalid_points'] = {}
+            with timed('evaluate'):
+                evaluated = evaluate_vector_function(components, grids[grid], params)
+            for key, (values, invalid) in evaluated.items():
+                entry[key] = series_to_list(values)
+                if invalid:
+                    entry['invalid_points'][key] = invalid
+        except EquationError as e:
+            entry = {'index': idx + 1, 'error': f'Error parsing {e.component} equation: {str(e)}', 'component': e.component}
+            if isinstance(e, EquationLimitError):
+                entry['limit_exceeded'] = True  # Superó los límites de tiempo o memoria de la compilación
+            elif isinstance(e, EquationUnavailableError):
+                entry['unavailable'] = True  # Cayó el grupo de procesos de compilación; se puede reintentar
+        except (TypeError, ValueError) as e:
+            entry = {'index': idx + 1, 'error': str(e)}
+        if 'error' in entry:
+            response['errors'] += 1
+        response['curves'].append(entry)
+
+    return jsonify(response)
+
+# Número máximo de puntos de la malla de una petición a /sweep
+SWEEP_MAX_POINTS = int(os.environ.get('CURVIPATH_SWEEP_MAX_POINTS', 1000000))
+
+# Función para leer el valor de un dato de un barrido
+def parse_sweep_value(value):
+    """
+    Convierte el valor de un dato de /sweep en un número o en un arreglo 1-D:
+    un número, una lista de valores, {"start", "stop", "num"} (como linspace)
+    o {"start", "stop", "step"} (como arange).
+    """
+    if isinstance(value, dict):
+        start, stop = float(value['start']), float(value['stop'])
+        if 'num' in value:
+            return np.linspace(start, stop, int(value['num']))
+        step = float(value['step'])
+        if step <= 0:
+            raise ValueError('step must be positive')
+        return np.arange(start, stop + step / 2, step)
+    if isinstance(value, list):
+        return np.array([float(v) for v in value])
+    return float(value)
+
+# Ruta para resolver un problema de física sobre una malla de valores
+@app.route('/sweep', methods=['POST'])
+def sweep():
+    """
+    Resuelve una incógnita de MCU, MCNU, TP o MCG para todas las combinaciones
+    de los datos que se indican como listas o rangos, en una sola pasada
+    vectorizada:
+        {"exercise_type": "TP", "solve_for": "R",
+         "variables": {"v_0": {"start": 1, "stop": 50, "num": 50},
+                       "θ": {"start": 1, "stop": 89, "step": 1}}}
+    Igual que en /get_data, θ se indica en grados. El resultado es una malla
+    N-dimensional con un eje por cada dato variable, en el orden de
+    'variables' (listados en 'axes'); los puntos sin solución válida valen null y se cuentan en
+    'invalid_points'. 'formula_index' indica la fórmula de 'formulas' usada en
+    cada punto (-1 si ninguna).
+    """
+    payload = request.get_json(silent=True)
+    try:
+        if not isinstance(payload, dict) or not isinstance(payload.get('variables'), dict):
+            raise ValueError('expected a JSON object with a "variables" object')
+        variables = {key: parse_sweep_value(value) for key, value in payload['variables'].items()}
+        for key in ('θ', 'theta'):
+            if key in variables:
+                variables[key] = np.radians(variables[key])  # Grados a radianes
+        size = int(np.prod([len(v) for v in variables.values() if np.ndim(v) == 1]))
+        if size > SWEEP_MAX_POINTS:
+            raise ValueError(f'at most {SWEEP_MAX_POINTS} grid points per request')
+        axes, result, used, formulas = physics.solve_grid(payload.get('solve_for'), payload.get('exercise_type'), variables)
+    except (KeyError, TypeError, ValueError) as e:
+        logging.error(f"Invalid sweep parameters: {str(e)}")
+        return jsonify({'error': 'Invalid parameters: ' + str(e)}), 400
+
+    return jsonify({
+        'axes': [{'name': name, 'values': (np.degrees(values) if name == 'θ' else values).tolist()} for name, values in axes.items()],
+        'shape': list(result.shape),
+        'result': series_to_list(result),
+        'invalid_points': int(np.isnan(result).sum()),
+        'formulas': [f"{formula.target} = {formula.text}" for formula in formulas],
+        'formula_index': used.tolist(),
+    })
+
+# Número máximo de puntos (instantes × condiciones iniciales) de una petición a /integrate
+INTEGRATE_MAX_POINTS = int(os.environ.get('CURVIPATH_INTEGRATE_MAX_POINTS', 2000000))
+
+# Función para leer las condiciones iniciales de /integrate
+def parse_initial_conditions(value):
+    """
+    Convierte las condiciones iniciales de /integrate (un objeto o una lista
+    de objetos con x, y, z, v_x, v_y, v_z; las ausentes valen 0) en un
+    arreglo (n, 6) en ese orden.
+    """
+    conditions = value if isinstance(value, list) else [value]
+    if not conditions:
+        raise ValueError('at least one initial condition is required')
+    names = COORDINATES + VELOCITY_NAMES
+    initial = np.zeros((len(conditions), len(names)))
+    for k, condition in enumerate(conditions):
+        if not isinstance(condition, dict):
+            raise ValueError('each initial condition must be a JSON object')
+        unknown = sorted(set(condition) - set(names))
+        if unknown:
+            raise ValueError(f'unknown initial value(s) {", ".join(unknown)}; expected {", ".join(names)}')
+        initial[k] = [float(condition.get(name, 0.0)) for name in names]
+    return initial
+
+# Ruta para integrar numéricamente leyes de aceleración
+@app.route('/integrate', methods=['POST'])
+def integrate_route():
+    """
+    Integra numéricamente x'' = a(t, x, v) para una o varias condiciones
+    iniciales a la vez, enviadas como JSON:
+        {"acceleration": {"x": "-k*v_x*sqrt(v_x**2 + v_y**2)",
+                          "y": "-g - k*v_y*sqrt(v_x**2 + v_y**2)"},
+         "initial": [{"v_x": 20, "v_y": 20}, {"v_x": 25, "v_y": 15}],
+         "variables": {"k": 0.02, "g": 9.81},
+         "t_min": 0, "t_max": 3, "intervals": 200, "method": "rk45"}
+    Las leyes pueden usar t, x, y, z, v_x, v_y, v_z y parámetros con valor en
+    'variables'; las componentes sin ley tienen aceleración nula. 'method' es
+    'rk4' (paso fijo, con 'substeps' pasos por intervalo) o 'rk45' (paso
+    adaptativo con 'rtol' y 'atol'). La respuesta tiene el formato de
+    /get_data: 't' y, por condición inicial k y componente con ley, las series
+    x_eq_k, x_v_k y x_a_k, de modo que se dibujan igual que una función vectorial.
+    """
+    payload = request.get_json(silent=True)
+    try:
+        if not isinstance(payload, dict) or not isinstance(payload.get('acceleration'), dict):
+            raise ValueError('expected a JSON object with an "acceleration" object')
+        laws = [(name, str(payload['acceleration'][name]).strip()) for name in COORDINATES
+                if payload['acceleration'].get(name) is not None and str(payload['acceleration'][name]).strip()]
+        unknown = sorted(set(payload['acceleration']) - set(COORDINATES))
+        if unknown or not laws:
+            raise ValueError(f'acceleration must define at least one of {", ".join(COORDINATES)}')
+        initial = parse_initial_conditions(payload.get('initial', {}))
+        t_min, t_max, intervals = parse_time_grid(payload, (0.0, 10.0, 100))
+        if t_max <= t_min:
+            raise ValueError('t_max must be greater than t_min')
+        if intervals * len(initial) > INTEGRATE_MAX_POINTS:
+            raise ValueError(f'at most {INTEGRATE_MAX_POINTS} points (intervals × initial conditions) per request')
+        method = payload.get('method', 'rk45')  # Método de integración
+        if method not in INTEGRATION_METHODS:
+            raise ValueError(f"method must be one of {', '.join(INTEGRATION_METHODS)}")
+        substeps = int(payload.get('substeps', 1))  # Pasos de 'rk4' por intervalo de salida
+        rtol = float(payload.get('rtol', INTEGRATION_RTOL))  # Tolerancia relativa de 'rk45'
+        atol = float(payload.get('atol', INTEGRATION_ATOL))  # Tolerancia absoluta de 'rk45'
+        if substeps < 1 or rtol <= 0 or atol <= 0:
+            raise ValueError('substeps, rtol and atol must be positive')
+        simplify_mode = payload.get('simplify', 'none')  # Las leyes no se derivan: simplificar rara vez compensa
+        if simplify_mode not in SIMPLIFY_MODES:
+            raise ValueError(f"simplify must be one of {', '.join(SIMPLIFY_MODES)}")
+        params = physics.parameter_values(payload.get('variables') or {})  # Parámetros de las leyes
+        binary = wants_binary(request)  # Respuesta binaria columnar en lugar de JSON
+        dtype = request.args.get('dtype', 'float64')  # Tipo de dato de los búferes binarios
+        binary_dtype(dtype)
+    except (AttributeError, TypeError, ValueError) as e:
+        logging.error(f"Invalid integration parameters: {str(e)}")
+        return jsonify({'error': 'Invalid parameters: ' + str(e)}), 400
+
+    # Cada ley se compila (o se recupera de la caché) como una componente más, con los mismos límites
+    components = compile_vector_functions([laws], simplify_mode)[0]
+    if isinstance(components, EquationError):
+        e = components
+        logging.error(f"Error processing {e.component} acceleration: {str(e)}")
+        return jsonify({'error': f'Error parsing {e.component} acceleration: {str(e)}', 'component': e.component}), \
+            e.status
+    system = get_or_build_system(components)
+    missing = sorted(set(system.params) - params.keys())
+    if missing:
+        return jsonify({'error': f'Missing value for parameter(s) {", ".join(missing)}'}), 400
+
+    t_vals = np.linspace(t_min, t_max, intervals)
+    try:
+        series, stats = integrate(system, t_vals, initial, tuple(params[name] for name in system.params),
+                                  method, substeps, rtol, atol)
+    except IntegrationError as e:
+        logging.error(f"Integration failed: {str(e)}")
+        return jsonify({'error': f'Integration failed: {str(e)}'}), 422
+
+    arrays = dict(series, t=t_vals)
+    results = dict(stats, method=method, trajectories=len(initial),
+                   invalid_points={key: int(np.isnan(values).sum()) for key, values in series.items() if np.isnan(values).any()})
+    with timed('serialize'):
+        if binary:
+            return Response(encode_columnar(arrays, results, dtype), mimetype=BINARY_MIMETYPE)
+        return jsonify(arrays_to_json(arrays, results))
+
+# Segundos entre comentarios de mantenimiento de la conexión en /jobs/<id>/events
+JOB_EVENTS_HEARTBEAT = float(os.environ.get('CURVIPATH_JOB_EVENTS_HEARTBEAT', 15))
+
+# Función para leer los parámetros de un trabajo
+def job_arguments():
+    """
+    Devuelve los parámetros de POST /jobs como un MultiDict con el formato de
+    la consulta de /get_data. Acepta un objeto JSON (las listas son valores
+    repetidos y 'variables' puede ser un objeto), un formulario o la consulta.
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return CombinedMultiDict([request.args, request.form])
+    args = MultiDict()
+    for key, value in payload.items():
+        if key == 'variables' and isinstance(value, dict):
+            value = json.dumps(value)
+        for item in value if isinstance(value, list) else [value]:
+            args.add(key, item if isinstance(item, str) else json.dumps(item))
+    return args
+
+# Función para buscar un trabajo o responder 404
+def find_job(job_id):
+    """Devuelve el trabajo `job_id` o lanza un 404 JSON si no existe o caducó."""
+    job = job_store.get(job_id)
+    if job is None:
+        abort(make_response(jsonify({'error': f'Unknown or expired job {job_id}'}), 404))
+    return job
+
+# Función para serializar las series de un trabajo
+def job_response(arrays, results):
+    """Responde con las series en JSON o en binario columnar, como /get_data."""
+    dtype = request.args.get('dtype', 'float64')  # Tipo de dato de los búferes binarios
+    try:
+        binary_dtype(dtype)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': 'Invalid parameters: ' + str(e)}), 400
+    with timed('serialize'):
+        if wants_binary(request):
+            return Response(encode_columnar(arrays, results, dtype), mimetype=BINARY_MIMETYPE)
+        return jsonify(arrays_to_json(arrays, results))
+
+# Ruta para lanzar un cálculo largo de /get_data en segundo plano
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Acepta los mismos parámetros que /get_data (salvo stream) y responde en el
+    acto con 202 y el identificador del trabajo. El progreso se consulta en
+    /jobs/<id> o se recibe por Server-Sent Events en /jobs/<id>/events; las
+    series de cada curva están en /jobs/<id>/curves/<curva> en cuanto
+    terminan, y la respuesta completa en /jobs/<id>/result.
+    """
+    try:
+        options = parse_options(job_arguments())
+        if options['stream']:
+            raise PipelineError('Invalid parameters: jobs cannot be streamed; use /jobs/<id>/events for progress')
+        job = job_store.submit(options)
+    except PipelineError as e:
+        return jsonify(e.payload), e.status
+    status_url = url_for('job_status', job_id=job.id)
+    response = jsonify(dict(job.describe(), status_url=status_url,
+                            events_url=url_for('job_events', job_id=job.id),
+                            result_url=url_for('job_result', job_id=job.id)))
+    response.headers['Location'] = status_url
+    return response, 202
+
+# Ruta para consultar el estado de un trabajo
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Devuelve el estado, la etapa, el progreso y las curvas terminadas del trabajo."""
+    return jsonify(find_job(job_id).describe())
+
+# Ruta para cancelar un trabajo y descartar sus resultados
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancela el trabajo si no terminó y descarta sus resultados."""
+    job = job_store.cancel(job_id)
+    if job is None:
+        return jsonify({'error': f'Unknown or expired job {job_id}'}), 404
+    return jsonify({'id': job.id, 'status': job.status if job.status in FINISHED else 'cancelled'})
+
+# Ruta de eventos de progreso de un trabajo (Server-Sent Events)
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Envía los eventos del trabajo como Server-Sent Events: 'stage' al empezar
+    cada etapa (compile, solve, sampling, evaluate), 'curve' al terminar cada
+    curva y, al final, 'done', 'error' o 'cancelled' con el estado del
+    trabajo, tras lo que se cierra el flujo. Cada evento lleva su número en
+    'id', de modo que un cliente que se reconecta con la cabecera
+    Last-Event-ID (o ?last_event_id=) recibe solo los que le faltan.
+    """
+    job = find_job(job_id)
+    try:
+        after = int(request.headers.get('Last-Event-ID') or request.args.get('last_event_id', 0))
+    except ValueError:
+        after = 0
+
+    def generate(after):
+        while True:
+            events, finished = job.wait_events(after, JOB_EVENTS_HEARTBEAT)
+            for seq, kind, data in events:
+                yield f'id: {seq}\nevent: {kind}\ndata: {json.dumps(data)}\n\n'
+                after = seq
+            if finished and not events:
+                return
+            if not events:
+                yield ': keep-alive\n\n'  # Comentario que mantiene abierta la conexión a través de los proxies
+
+    return Response(generate(after), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# Ruta para obtener las series de una curva ya evaluada
+@app.route('/jobs/<job_id>/curves/<label>')
+def job_curve(job_id, label):
+    """
+    Devuelve las series de la curva `label` ('1', '2'... o 'z_function') en
+    el formato de /get_data, en cuanto está evaluada, aunque el trabajo no
+    haya terminado. Responde 202 con el estado si aún no lo está.
+    """
+    job = find_job(job_id)
+    if label not in job.curves:
+        if job.status in FINISHED:
+            return jsonify({'error': f'Curve {label} is not part of job {job_id}'}), 404
+        return jsonify(job.describe()), 202
+    return job_response(*job.result(labels={label}))
+
+# Ruta para obtener el resultado de un trabajo
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """
+    Devuelve la misma respuesta que /get_data cuando el trabajo termina, o
+    202 con su estado mientras no. Con ?partial=1 devuelve las curvas ya
+    evaluadas, con 'partial' y 'curves_done'. Un trabajo fallido devuelve su
+    error con el código que habría devuelto /get_data.
+    """
+    job = find_job(job_id)
+    if job.status == 'error':
+        return jsonify(job.error), job.error_status
+    if job.status == 'cancelled':
+        return jsonify({'error': f'Job {job_id} was cancelled'}), 410
+    if job.status == 'done':
+        return job_response(*job.result())
+    partial = request.args.get('partial', 'false').lower() in ('1', 'true', 'yes')
+    if not partial or job.t_vals is None:
+        return jsonify(job.describe()), 202
+    return job_response(*job.result(partial=True))
+
+# Ruta para consultar el estado de la caché de expresiones compiladas
+@app.route('/cache_stats')
+def cache_stats():
+    """
+    Devuelve los contadores de aciertos, fallos y descartes de la caché de
+    expresiones, en 'responses' los de la caché de respuestas de /get_data y
+    en 'store' los del almacén persistente de expresiones.
+    """
+    return jsonify(dict(expression_cache.stats(), responses=response_cache.stats(), store=expression_store.stats()))
+
+# Ruta de comprobación de estado para balanceadores y orquestadores
+@app.route('/health')
+def health():
+    """
+    Indica si el proceso puede atender peticiones. Mientras se precalienta
+    (warmup.warm_up) responde 503, para que no reciba tráfico hasta tener
+    SymPy cargado y las ecuaciones frecuentes compiladas.
+    """
+    status = warmup_status()
+    return jsonify(status), 503 if status['status'] == 'warming' else 200
+
+# Ruta de métricas del proceso en formato de texto de Prometheus
+@app.route('/metrics')
+def metrics_endpoint():
+    """
+    Devuelve los histogramas de latencia por ruta y por etapa, los contadores
+    de peticiones, de evaluación punto por punto y de simplificaciones
+    abandonadas, y el estado de las cachés de expresiones y de respuestas y
+    del almacén persistente de expresiones.
+    Con varios workers, cada proceso expone sus propias métricas.
+    """
+    stats = expression_cache.stats()
+    lookups = stats['hits'] + stats['misses']
+    gauges = [('curvipath_expression_cache', value, {'field': field}) for field, value in stats.items()]
+    gauges.append(('curvipath_expression_cache_hit_ratio', stats['hits'] / lookups if lookups else 0.0, {}))
+    gauges += [('curvipath_response_cache', value, {'field': field}) for field, value in response_cache.stats().items()]
+    gauges += [('curvipath_expression_store', int(value), {'field': field}) for field, value in expression_store.stats().items()]
+    return Response(metrics.render(gauges), mimetype='text/plain; version=0.0.4')
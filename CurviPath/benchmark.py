@@ -0,0 +1,266 @@
+# Banco de pruebas de rendimiento reproducible de /get_data y de calculate_solution
+"""
+Ejecuta la aplicación en el propio proceso con el cliente de pruebas de Flask
+sobre un corpus fijo de ecuaciones y escribe los resultados en JSON para poder
+compararlos entre commits.
+
+Uso:
+    python benchmark.py                          # Corpus completo, resultados en benchmark-results.json
+    python benchmark.py --quick -o base.json     # Versión reducida (hasta 10 000 puntos y 10 curvas)
+    python benchmark.py --compare base.json new.json [--threshold 1.2]
+
+Cada caso se mide en frío (cachés vacías: compila las ecuaciones) y en
+caliente (ecuaciones ya compiladas; la caché de respuestas se vacía antes de
+cada ejecución en ambos casos y el almacén persistente de expresiones está
+desactivado salvo que se indique CURVIPATH_EXPR_STORE); la importación de SymPy y el registro de
+fórmulas de física se miden aparte, una sola vez, como 'startup_ms'. Se
+informa la mediana y el mínimo de la latencia total, la mediana de cada etapa
+de la cabecera Server-Timing, el tamaño de la respuesta y el pico de memoria
+de una ejecución adicional con tracemalloc.
+"""
+import os  # Acceso a variables de entorno del sistema operativo
+import sys  # Código de salida y versión de Python
+import json  # Manejo de datos en formato JSON
+import time  # Medición de la latencia
+import logging  # Registro de eventos y errores
+import argparse  # Argumentos de la línea de órdenes
+import platform  # Descripción de la máquina
+import statistics  # Medianas de las repeticiones
+import subprocess  # Commit actual de git
+import tracemalloc  # Pico de memoria de cada caso
+
+# Corpus de ecuaciones por familia: (x, y, z, variables, máximo de puntos).
+# 'fallback' usa funciones sin equivalente en numpy, que se evalúan punto por punto.
+CORPUS = {
+    'polynomial': ('t**3 - 2*t**2 + t', '3*t**2 + 1', 't', {}, None),
+    'trig': ('cos(3*t)*sin(t)', 'sin(2*t)**2', 't/2', {}, None),
+    'exponential': ('exp(-t/5)*cos(t)', 'exp(-t/5)*sin(t)', 'log(1 + t)', {}, None),
+    'nested': ('sin(cos(tan(t/10)))', 'sqrt(1 + sin(t)**2)*exp(cos(t))', 'atan(sinh(t/10))', {}, None),
+    'piecewise': ('Piecewise((t, t < 5), (10 - t, True))', 'Piecewise((sin(t), t < 3), (cos(t), True))', 'Max(t, 3)', {}, 10_000),
+    'parametric': ('r*cos(ω*t)', 'r*sin(ω*t)', 'v*t', {'r': 2, 'ω': 3, 'v': 0.5}, None),
+    'fallback': ('besselj(0, t)', 'erf(t)', '', {}, 10_000),
+}
+
+# Número de puntos de la malla temporal de los casos del corpus
+INTERVALS = (100, 10_000, 1_000_000)
+QUICK_INTERVALS = (100, 10_000)
+
+# Número de curvas de los casos de escalado (ecuaciones distintas, 1 000 puntos)
+CURVES = (1, 10, 50)
+QUICK_CURVES = (1, 10)
+
+# Problemas de física resueltos con calculate_solution (tipo, incógnita, datos)
+SOLVE_CASES = (
+    ('TP', 'R', {'v_0': 20, 'θ': 35}),
+    ('MCU', 'a_c', {'r': 2, 'T': 4}),
+    ('MCNU', 'ω_f', {'ω_i': 1, 'alpha': 0.5, 't': 4}),
+)
+
+
+def git_commit():
+    """Devuelve el commit actual del repositorio, o None fuera de git."""
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_server_timing(header):
+    """Convierte la cabecera Server-Timing en {etapa: milisegundos}, sin las entradas por componente."""
+    stages = {}
+    for entry in filter(None, (part.strip() for part in (header or '').split(','))):
+        name, _, duration = entry.partition(';dur=')
+        if '.' not in name and duration:
+            stages[name] = float(duration)
+    return stages
+
+
+def clear_caches():
+    """Vacía la caché de expresiones y la caché interna de SymPy para medir en frío."""
+    from compiler import expression_cache
+    from sympy.core.cache import clear_cache
+    expression_cache.clear()
+    clear_cache()
+
+
+def clear_responses():
+    """Vacía la caché de respuestas, para medir el cálculo y no la copia guardada."""
+    from response_cache import response_cache
+    response_cache.clear()
+
+
+def curve_params(x_equations, y_equations, z_equations, intervals, variables=None, **extra):
+    """Parámetros de /get_data para una o varias funciones vectoriales."""
+    params = {'t_max': 10, 'intervals': intervals, 'x_equations': x_equations,
+              'y_equations': y_equations, 'z_equations': z_equations,
+              'variables': json.dumps(variables or {})}
+    params.update(extra)
+    return params
+
+
+def build_cases(quick):
+    """Devuelve la lista de casos: (nombre, grupo, parámetros de /get_data, datos descriptivos)."""
+    cases = []
+    for family, (x, y, z, variables, max_intervals) in CORPUS.items():
+        for intervals in QUICK_INTERVALS if quick else INTERVALS:
+            if max_intervals is None or intervals <= max_intervals:
+                cases.append((f'{family}/intervals={intervals}', 'corpus',
+                              curve_params([x], [y], [z], intervals, variables),
+                              {'family': family, 'intervals': intervals, 'curves': 1}))
+    for curves in QUICK_CURVES if quick else CURVES:
+        ks = range(1, curves + 1)  # Coeficientes distintos para que no se compartan compilaciones
+        cases.append((f'curves={curves}', 'scaling',
+                      curve_params([f'cos({k}*t)' for k in ks], [f'sin({k}*t)' for k in ks], [f't/{k}' for k in ks], 1000),
+                      {'intervals': 1000, 'curves': curves}))
+    for intervals in (10_000,) if quick else (10_000, 100_000):
+        cases.append((f'geometry/intervals={intervals}', 'geometry',
+                      curve_params(['cos(t)'], ['sin(t)'], ['t/4'], intervals, geometry='true'),
+                      {'intervals': intervals, 'curves': 1}))
+    for exercise_type, solve_for, variables in SOLVE_CASES:
+        cases.append((f'solve/{exercise_type}/{solve_for}', 'solve',
+                      {'t_max': 10, 'intervals': 100, 'exercise_type': exercise_type,
+                       'solve_for': solve_for, 'variables': json.dumps(variables)},
+                      {'intervals': 100, 'curves': 0}))
+    return cases
+
+
+def measure(client, params, cold, repeat):
+    """Ejecuta la petición `repeat` veces y resume la latencia total y por etapa."""
+    totals = []
+    stages = {}
+    size = None
+    if not cold:
+        client.get('/get_data', query_string=params)  # Compila antes de medir en caliente
+    for _ in range(repeat):
+        clear_responses()
+        if cold:
+            clear_caches()
+        start = time.perf_counter()
+        response = client.get('/get_data', query_string=params)
+        totals.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"{response.status_code}: {response.get_data(as_text=True)[:200]}")
+        size = len(response.get_data())
+        for stage, ms in parse_server_timing(response.headers.get('Server-Timing')).items():
+            stages.setdefault(stage, []).append(ms)
+    return {
+        'total_ms': round(statistics.median(totals), 3),
+        'min_ms': round(min(totals), 3),
+        'stages_ms': {stage: round(statistics.median(values), 3) for stage, values in stages.items()},
+        'response_bytes': size,
+    }
+
+
+def peak_memory(client, params):
+    """Pico de memoria (MB) de una petición en frío medido con tracemalloc (incluye los arreglos numpy)."""
+    clear_caches()
+    clear_responses()
+    tracemalloc.start()
+    try:
+        client.get('/get_data', query_string=params)
+        return round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def run(quick=False, repeat=3, output='benchmark-results.json', only=None):
+    """Ejecuta todos los casos (o los que contienen `only`) y escribe los resultados en `output`."""
+    # Sin almacén persistente de expresiones, para que la medida en frío compile de verdad
+    os.environ.setdefault('CURVIPATH_EXPR_STORE', '')
+    start = time.perf_counter()
+    from app import app  # Importación tardía, para medir el arranque
+    import numpy
+    import sympy
+    import physics
+    physics.get_formulas()
+    startup_ms = round((time.perf_counter() - start) * 1000, 3)
+    logging.getLogger().setLevel(logging.ERROR)  # Los registros de depuración distorsionan la medida
+    client = app.test_client()
+
+    results = []
+    for name, group, params, info in build_cases(quick):
+        if only and only not in name:
+            continue
+        heavy = info['intervals'] >= 1_000_000
+        runs = 1 if heavy else repeat  # Los casos de un millón de puntos tardan segundos por ejecución
+        entry = dict(info, case=name, group=group)
+        try:
+            entry['cold'] = measure(client, params, True, runs)
+            entry['warm'] = measure(client, params, False, runs)
+            entry['peak_memory_mb'] = peak_memory(client, params)
+        except RuntimeError as e:
+            entry['error'] = str(e)
+        results.append(entry)
+        summary = entry.get('error') or f"cold {entry['cold']['total_ms']:.1f} ms, warm {entry['warm']['total_ms']:.1f} ms, " \
+                                        f"peak {entry['peak_memory_mb']} MB"
+        print(f"{name:32s} {summary}", flush=True)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'numpy': numpy.__version__,
+            'sympy': sympy.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'quick': quick,
+            'repeat': repeat,
+            'startup_ms': startup_ms,
+            'env': {key: value for key, value in os.environ.items() if key.startswith('CURVIPATH_')},
+        },
+        'results': results,
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {output}")
+    return report
+
+
+def compare(base_path, new_path, threshold):
+    """
+    Compara dos ficheros de resultados caso por caso (latencia mediana en frío
+    y en caliente). Devuelve 1 si algún caso es más lento que `threshold`
+    veces el de referencia, para poder usarlo en integración continua.
+    """
+    with open(base_path, encoding='utf-8') as f:
+        base = {entry['case']: entry for entry in json.load(f)['results']}
+    with open(new_path, encoding='utf-8') as f:
+        new = {entry['case']: entry for entry in json.load(f)['results']}
+
+    regressions = 0
+    print(f"{'case':32s} {'cold base':>10s} {'cold new':>10s} {'ratio':>6s} {'warm base':>10s} {'warm new':>10s} {'ratio':>6s}")
+    for case in (case for case in new if case in base):
+        row = [f"{case:32s}"]
+        for mode in ('cold', 'warm'):
+            if mode not in base[case] or mode not in new[case]:
+                row.append(f"{'error':>29s}")
+                continue
+            before, after = base[case][mode]['total_ms'], new[case][mode]['total_ms']
+            ratio = after / before if before else float('inf')
+            flag = ' !' if ratio > threshold else ''
+            regressions += ratio > threshold
+            row.append(f"{before:10.1f} {after:10.1f} {ratio:6.2f}{flag}")
+        print(' '.join(row))
+    print(f"{regressions} regression(s) above {threshold:.2f}x")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CurviPath equation pipeline benchmarks')
+    parser.add_argument('--quick', action='store_true', help='reduced corpus (up to 10 000 points and 10 curves)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per case and mode (median is reported)')
+    parser.add_argument('--only', help='run only the cases whose name contains this text')
+    parser.add_argument('-o', '--output', default='benchmark-results.json', help='results file')
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'), help='compare two results files')
+    parser.add_argument('--threshold', type=float, default=1.2, help='slowdown ratio reported as a regression')
+    args = parser.parse_args()
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+    run(args.quick, args.repeat, args.output, args.only)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,834 @@
+# Compilación de ecuaciones paramétricas y caché de expresiones compiladas
+import re  # Expresiones regulares para manipulación de cadenas
+import os  # Acceso a variables de entorno del sistema operativo
+import threading  # Bloqueos para el acceso concurrente a la caché
+import time  # Medición del presupuesto de tiempo de simplificación
+import logging  # Registro de eventos y errores
+import signal  # Aviso de tiempo de CPU agotado en los procesos de compilación
+import multiprocessing  # Contexto de arranque de los procesos de compilación
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, CancelledError, TimeoutError as FutureTimeoutError  # Ejecución con límite de tiempo y en paralelo
+from concurrent.futures.process import BrokenProcessPool  # Grupo de procesos caído
+from collections import OrderedDict  # Diccionario ordenado para la política LRU
+from lazy import LazyModule  # Importación diferida de SymPy
+from expression_store import expression_store  # Expresiones ya simplificadas por otros procesos o arranques
+import physics  # Nombres de las magnitudes físicas y de sus alias
+try:
+    import resource  # Límites de CPU y memoria de los procesos de compilación (solo Unix)
+except ImportError:
+    resource = None
+from metrics import metrics, record, timed  # Tiempos por etapa de la compilación
+
+# Biblioteca para cálculos simbólicos, importada al compilar la primera ecuación
+sp = LazyModule('sympy')
+
+# Nombres de parámetros que SymPy interpretaría como funciones o constantes propias
+# (N es sympy.N, E el número e, I la unidad imaginaria, beta y gamma funciones especiales...)
+PARAMETER_NAMES = ('N', 'E', 'I', 'S', 'Q', 'O', 'beta', 'gamma', 'zeta')
+
+# Tamaño máximo de la caché de expresiones (número de ecuaciones distintas)
+EXPRESSION_CACHE_SIZE = int(os.environ.get('CURVIPATH_EXPR_CACHE_SIZE', 256))
+
+# Políticas de simplificación disponibles:
+# - 'none': usa la expresión tal como se analizó
+# - 'cheap': pasadas dirigidas (cancel para funciones racionales, trigsimp en otro caso)
+# - 'full': sp.simplify completo
+SIMPLIFY_MODES = ('none', 'cheap', 'full')
+DEFAULT_SIMPLIFY_MODE = os.environ.get('CURVIPATH_SIMPLIFY', 'full')  # Política por defecto del servidor
+
+# Presupuesto de tiempo (segundos) para simplificar una componente completa; 0 desactiva el límite
+SIMPLIFY_TIME_BUDGET = float(os.environ.get('CURVIPATH_SIMPLIFY_BUDGET', 1.0))
+
+# Hilos dedicados a simplificar con límite de tiempo fuera de los procesos de compilación (se crean bajo demanda)
+SIMPLIFY_THREADS = int(os.environ.get('CURVIPATH_SIMPLIFY_THREADS', 4))
+# Simplificaciones abandonadas por agotar su presupuesto que pueden seguir ocupando esos hilos;
+# al alcanzarlo, las nuevas se omiten en lugar de esperar a que quede un hilo libre
+SIMPLIFY_MAX_ABANDONED = int(os.environ.get('CURVIPATH_SIMPLIFY_MAX_ABANDONED', max(1, SIMPLIFY_THREADS - 1)))
+_simplify_executor = None
+_simplify_executor_lock = threading.Lock()
+_simplify_abandoned = 0  # Simplificaciones abandonadas que siguen ejecutándose
+_in_compile_worker = False  # Verdadero en los procesos de compilación, donde se puede interrumpir con SIGALRM
+
+# Procesos dedicados a la compilación simbólica en paralelo, por proceso del servidor; 0 compila siempre en
+# el propio proceso. Con gunicorn, gunicorn.conf.py reparte por defecto los núcleos entre sus workers
+COMPILE_WORKERS = int(os.environ.get('CURVIPATH_COMPILE_WORKERS', os.cpu_count() or 1))
+# Método de arranque de esos procesos; 'spawn' evita heredar los bloqueos de los hilos del servidor
+COMPILE_START_METHOD = os.environ.get('CURVIPATH_COMPILE_START_METHOD', 'spawn')
+
+# Aislamiento: si es '1', toda compilación (también la de una sola ecuación) se
+# hace en los procesos de compilación, con los límites siguientes, de modo que
+# una ecuación patológica no bloquea los hilos del servidor
+COMPILE_SANDBOX = os.environ.get('CURVIPATH_COMPILE_SANDBOX', '1') == '1' and COMPILE_WORKERS > 0
+# Tiempo de CPU (segundos) de cada compilación en un proceso de compilación (solo Unix); 0 sin límite
+COMPILE_CPU_LIMIT = float(os.environ.get('CURVIPATH_COMPILE_CPU_LIMIT', 10))
+# Memoria virtual máxima (MB) de cada proceso de compilación (solo Unix); 0 sin límite
+COMPILE_MEMORY_LIMIT = int(os.environ.get('CURVIPATH_COMPILE_MEMORY_LIMIT', 1024))
+# Tiempo real (segundos) que se espera una compilación antes de matar los procesos; 0 sin límite
+COMPILE_WALL_LIMIT = float(os.environ.get('CURVIPATH_COMPILE_WALL_LIMIT', 15))
+_compile_executor = None
+_compile_executor_lock = threading.Lock()
+
+
+def _reset_executors_after_fork():
+    """
+    En un proceso hijo creado con fork (por ejemplo, un worker de gunicorn con
+    preload_app) los hilos y procesos de los grupos del padre no existen: se
+    descartan para que el hijo cree los suyos bajo demanda.
+    """
+    global _simplify_executor, _simplify_executor_lock, _simplify_abandoned, _compile_executor, _compile_executor_lock
+    _simplify_executor = None
+    _simplify_executor_lock = threading.Lock()
+    _simplify_abandoned = 0
+    _compile_executor = None
+    _compile_executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_executors_after_fork)
+
+
+def preprocess_equation(eq):
+    """
+    Preprocesa cadenas de ecuaciones para corregir problemas comunes de notación:
+    - Elimina espacios
+    - Reemplaza 'sen' por 'sin' (función seno en español)
+    - Inserta signos de multiplicación explícitos donde faltan, salvo en los
+      dígitos que forman parte de un nombre de parámetro (v0x, v_0x, ω_1...)
+    """
+    if not eq or eq.strip() == '':
+        return eq
+
+    eq = eq.replace(' ', '')  # Elimina espacios
+    eq = eq.replace('sen', 'sin')  # Reemplaza 'sen' por 'sin'
+    eq = re.sub(r'(?<!\w)(\d+)([a-zA-Z\(])', r'\1*\2', eq)  # Inserta multiplicación explícita
+    return eq
+
+
+def time_symbol():
+    """Símbolo de tiempo compartido por todas las ecuaciones."""
+    return sp.Symbol('t')
+
+
+def _splittable(name):
+    """Indica si un nombre sin declarar se separa en factores (xy -> x*y); los que llevan dígitos (v0x) no."""
+    return not any(char.isdigit() for char in name) and sp.parsing.sympy_parser._token_splittable(name)
+
+
+def _transformations():
+    """
+    Transformaciones para analizar expresiones simbólicas: las de
+    implicit_multiplication_application, pero sin separar los nombres con dígitos.
+    """
+    parser = sp.parsing.sympy_parser
+    return parser.standard_transformations + (parser.split_symbols_custom(_splittable), parser.implicit_multiplication,
+                                              parser.implicit_application, parser.function_exponentiation)
+
+
+def _parameter_dict():
+    """
+    Símbolos de los nombres que se analizan siempre como un parámetro: los de
+    PARAMETER_NAMES, las magnitudes de physics y todos sus alias (v0, omega...),
+    para que ni se separen en factores ni se confundan con objetos de SymPy.
+    """
+    names = set(PARAMETER_NAMES) | set(physics.QUANTITIES)
+    names.update(name for group in physics.PARAMETER_ALIASES for name in group)
+    return {name: sp.Symbol(name) for name in names}
+
+
+def _get_simplify_executor():
+    """Crea bajo demanda el grupo de hilos usado para simplificar con límite de tiempo."""
+    global _simplify_executor
+    with _simplify_executor_lock:
+        if _simplify_executor is None:
+            _simplify_executor = ThreadPoolExecutor(max_workers=SIMPLIFY_THREADS, thread_name_prefix='simplify')
+        return _simplify_executor
+
+
+def _apply_simplification(expr, mode):
+    """Aplica la política de simplificación sin límite de tiempo."""
+    if mode == 'full':
+        return sp.simplify(expr)
+    if mode == 'cheap':
+        if expr.is_rational_function(time_symbol()):
+            return sp.cancel(expr)  # Funciones racionales: cancela factores comunes
+        return sp.trigsimp(expr)  # Resto: identidades trigonométricas
+    return expr
+
+
+class SimplifyBudget:
+    """Tiempo de simplificación que le queda a una ecuación; solo descuenta el tiempo en que se simplifica."""
+
+    def __init__(self, seconds):
+        self.remaining = seconds  # Segundos restantes
+        self.exhausted = False  # Alguna simplificación se interrumpió y su expresión quedó sin simplificar
+
+
+class SimplifyTimeout(BaseException):
+    """
+    La simplificación agotó su presupuesto (o no había hilos libres para
+    intentarla). Deriva de BaseException porque la alarma la lanza dentro de
+    SymPy, cuyos `except Exception` la atraparían y seguirían simplificando.
+    """
+
+
+def _simplify_alarm(signum, frame):
+    """Manejador de SIGALRM en los procesos de compilación: interrumpe la simplificación en curso."""
+    raise SimplifyTimeout()
+
+
+def _simplify_with_alarm(expr, mode, budget):
+    """
+    Simplifica en el hilo principal de un proceso de compilación con un
+    temporizador SIGALRM, que interrumpe sp.simplify al agotar el presupuesto.
+    """
+    start = time.monotonic()
+    previous = signal.signal(signal.SIGALRM, _simplify_alarm)
+    signal.setitimer(signal.ITIMER_REAL, budget.remaining)
+    try:
+        return _apply_simplification(expr, mode)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        budget.remaining -= time.monotonic() - start
+
+
+def _release_abandoned(future):
+    """Descuenta una simplificación abandonada cuando por fin termina."""
+    global _simplify_abandoned
+    with _simplify_executor_lock:
+        _simplify_abandoned -= 1
+
+
+def _abandon(future):
+    """Deja de esperar una simplificación que no se puede cancelar y la cuenta hasta que termine."""
+    global _simplify_abandoned
+    if future.cancel():
+        return
+    with _simplify_executor_lock:
+        _simplify_abandoned += 1
+    future.add_done_callback(_release_abandoned)
+
+
+def _simplify_in_thread(expr, mode, budget):
+    """
+    Simplifica en el grupo de hilos: el presupuesto se cuenta desde que la
+    simplificación empieza a ejecutarse (la espera en la cola está acotada
+    por el mismo presupuesto y no lo consume). Una simplificación que lo
+    agota no se puede detener y sigue ocupando su hilo, así que con
+    SIMPLIFY_MAX_ABANDONED de ellas en curso las nuevas no se intentan.
+    """
+    with _simplify_executor_lock:
+        saturated = _simplify_abandoned >= SIMPLIFY_MAX_ABANDONED
+    if saturated:
+        raise SimplifyTimeout()
+    started = threading.Event()
+    start = []  # Instante en que empezó a ejecutarse
+
+    def run():
+        start.append(time.monotonic())
+        started.set()
+        return _apply_simplification(expr, mode)
+
+    future = _get_simplify_executor().submit(run)
+    try:
+        if not started.wait(budget.remaining):  # La espera en la cola también está acotada
+            raise FutureTimeoutError()
+        return future.result(timeout=max(0.0, start[0] + budget.remaining - time.monotonic()))
+    except FutureTimeoutError:
+        _abandon(future)
+        raise SimplifyTimeout() from None
+    finally:
+        if start:
+            budget.remaining -= time.monotonic() - start[0]
+
+
+def simplify_expression(expr, mode, budget=None):
+    """
+    Simplifica una expresión según la política indicada sin superar el
+    presupuesto `budget` (SimplifyBudget), que comparten las tres expresiones
+    de una ecuación. En los procesos de compilación la simplificación que lo
+    agota se interrumpe; en el resto se abandona (ver _simplify_in_thread).
+    En ambos casos devuelve la expresión sin simplificar, que es
+    numéricamente equivalente, y marca el presupuesto como agotado.
+    """
+    if mode == 'none':
+        return expr
+    if budget is None:
+        return _apply_simplification(expr, mode)
+
+    try:
+        if budget.remaining <= 0:
+            raise SimplifyTimeout()
+        if _in_compile_worker and threading.current_thread() is threading.main_thread():
+            return _simplify_with_alarm(expr, mode, budget)
+        return _simplify_in_thread(expr, mode, budget)
+    except SimplifyTimeout:
+        budget.exhausted = True
+        metrics.inc('curvipath_simplify_timeouts_total', mode=mode)
+        logging.warning(f"Simplification budget exceeded ({mode}), using unsimplified expression: {expr}")
+        return expr
+
+
+def parameter_symbols(exprs):
+    """Devuelve, ordenados por nombre, los símbolos distintos de t que aparecen en las expresiones."""
+    return sorted(set().union(*(e.free_symbols for e in exprs)) - {time_symbol()}, key=lambda s: s.name)
+
+
+def parameter_args(names, params):
+    """
+    Devuelve los valores de los parámetros `names`, en orden, tomados de
+    `params`; lanza ValueError si falta alguno.
+    """
+    missing = [name for name in names if name not in params]
+    if missing:
+        raise ValueError(f"missing value for parameter(s): {', '.join(missing)}")
+    return tuple(params[name] for name in names)
+
+
+class CompiledExpression:
+    """
+    Resultado de compilar una componente: la posición, la velocidad y la
+    aceleración simplificadas junto con sus funciones numpy equivalentes.
+    Los símbolos distintos de t (v_0, θ, ω...) son parámetros: se compilan
+    como argumentos adicionales de las funciones, después de t, y su valor se
+    indica al evaluar, de modo que cambiarlo no requiere recompilar.
+    """
+
+    def __init__(self, key, expr, d_expr, dd_expr):
+        self.key = key  # Clave de caché (texto canónico, política de simplificación)
+        self.exprs = (expr, d_expr, dd_expr)  # Expresiones simbólicas (posición, velocidad, aceleración)
+        self._symbols = parameter_symbols(self.exprs)
+        self.params = tuple(sym.name for sym in self._symbols)  # Nombres de los parámetros, en orden
+        self.funcs = tuple(sp.lambdify([time_symbol()] + self._symbols, e, 'numpy') for e in self.exprs)  # Funciones numéricas vectorizadas
+        self._scalar_funcs = {}  # Funciones mpmath por orden, creadas bajo demanda
+        self._jerk_func = None  # Función numpy de la tercera derivada, creada bajo demanda
+
+    def scalar_func(self, order):
+        """
+        Devuelve una función escalar basada en mpmath para la derivada de orden
+        `order`. Cubre funciones sin equivalente en numpy y es mucho más rápida
+        que subs().evalf() cuando hay que evaluar punto por punto.
+        """
+        func = self._scalar_funcs.get(order)
+        if func is None:
+            func = sp.lambdify([time_symbol()] + self._symbols, self.exprs[order], 'mpmath')
+            self._scalar_funcs[order] = func
+        return func
+
+    def jerk_func(self):
+        """
+        Devuelve la función numpy de la tercera derivada (sobreaceleración),
+        necesaria solo para la torsión, por lo que se deriva bajo demanda.
+        """
+        if self._jerk_func is None:
+            t = time_symbol()
+            self._jerk_func = sp.lambdify([t] + self._symbols, sp.diff(self.exprs[2], t), 'numpy')
+        return self._jerk_func
+
+    def args(self, params):
+        """Valores de los parámetros de la expresión, en el orden de sus funciones."""
+        return parameter_args(self.params, params or {})
+
+    def substitutions(self, params):
+        """Sustituciones {símbolo: valor} de los parámetros, para subs()."""
+        return dict(zip(self._symbols, self.args(params)))
+
+
+class VectorKernel:
+    """Una sola función numpy (con cse) que evalúa posición, velocidad y aceleración de todas las componentes."""
+
+    def __init__(self, components):
+        self.components = tuple(components)  # CompiledExpression de cada componente, en orden
+        exprs = [e for compiled in self.components for e in compiled.exprs]
+        symbols = parameter_symbols(exprs)
+        self.params = tuple(sym.name for sym in symbols)  # Nombres de los parámetros, en orden
+        self._func = sp.lambdify([time_symbol()] + symbols, exprs, 'numpy', cse=True)
+
+    def evaluate_raw(self, vals, params=None):
+        """Evalúa el núcleo sin convertir los resultados ([pos, vel, acc] por componente)."""
+        return self._func(vals, *parameter_args(self.params, params or {}))
+
+
+def _timed_call(timings, stage, func, *args, **kwargs):
+    """Llama a func y suma su duración a timings[stage]."""
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def _new_budget():
+    """Presupuesto de simplificación de una ecuación (None si SIMPLIFY_TIME_BUDGET no limita)."""
+    return SimplifyBudget(SIMPLIFY_TIME_BUDGET) if SIMPLIFY_TIME_BUDGET > 0 else None
+
+
+def derive_expressions(equation, simplify_mode=DEFAULT_SIMPLIFY_MODE, timings=None, budget=None):
+    """
+    Analiza, simplifica y deriva dos veces una ecuación ya preprocesada.
+    La simplificación de las tres expresiones comparte `budget` (por defecto,
+    uno nuevo de SIMPLIFY_TIME_BUDGET; al pasarlo se puede consultar después si
+    se agotó). Devuelve la tupla (posición, velocidad, aceleración) de
+    expresiones SymPy, que se pueden enviar entre procesos. Si se pasa el
+    diccionario `timings`, acumula en él la duración (segundos) de las etapas
+    'parse', 'simplify' y 'diff'.
+    """
+    timings = {} if timings is None else timings
+    budget = _new_budget() if budget is None else budget
+    t = time_symbol()
+    local_dict = _parameter_dict()
+    expr = _timed_call(timings, 'parse', sp.parsing.sympy_parser.parse_expr, equation,
+                       local_dict=local_dict, transformations=_transformations())  # Analiza la ecuación
+    if isinstance(expr, tuple):  # Si la expresión es una tupla, toma el primer elemento
+        expr = expr[0]
+    expr = _timed_call(timings, 'simplify', simplify_expression, expr, simplify_mode, budget)  # Simplifica la ecuación
+    d_expr = _timed_call(timings, 'diff', sp.diff, expr, t)  # Primera derivada (velocidad)
+    d_expr = _timed_call(timings, 'simplify', simplify_expression, d_expr, simplify_mode, budget)
+    dd_expr = _timed_call(timings, 'diff', sp.diff, d_expr, t)  # Segunda derivada (aceleración)
+    dd_expr = _timed_call(timings, 'simplify', simplify_expression, dd_expr, simplify_mode, budget)
+    return expr, d_expr, dd_expr
+
+
+def _derive_timed(equation, simplify_mode):
+    """
+    Versión de derive_expressions para los procesos de compilación: devuelve
+    (expresiones, tiempos, completa), donde `completa` es falso si alguna
+    simplificación agotó el presupuesto y la expresión quedó sin simplificar.
+    """
+    timings = {}
+    budget = _new_budget()
+    exprs = derive_expressions(equation, simplify_mode, timings, budget)
+    return exprs, timings, budget is None or not budget.exhausted
+
+
+def compile_equation(equation, simplify_mode=DEFAULT_SIMPLIFY_MODE):
+    """
+    Compila una ecuación ya preprocesada en el propio proceso, cargando sus
+    expresiones del almacén persistente si ya están y guardándolas si no (ni
+    si la simplificación agotó su presupuesto, para volver a intentarla).
+    Devuelve un CompiledExpression listo para evaluar con numpy.
+    """
+    exprs = expression_store.load_many([equation], simplify_mode).get(equation)
+    if exprs is not None:
+        return CompiledExpression((equation, simplify_mode), *exprs)
+    exprs, _, complete = _derive_timed(equation, simplify_mode)
+    entry = CompiledExpression((equation, simplify_mode), *exprs)
+    if complete:
+        expression_store.save(equation, simplify_mode, exprs)
+    return entry
+
+
+class CompileLimitError(Exception):
+    """La compilación de una ecuación superó el límite de tiempo o de memoria de los procesos de compilación."""
+
+
+def _cpu_limit_exceeded(signum, frame):
+    """Manejador de SIGXCPU en los procesos de compilación: interrumpe la compilación en curso."""
+    raise CompileLimitError(f'compilation exceeded the {COMPILE_CPU_LIMIT:g} s CPU time limit')
+
+
+def _init_compile_worker():
+    """
+    Prepara un proceso de compilación: limita su memoria virtual, instala el
+    manejador del límite de CPU e importa SymPy antes de recibir trabajos.
+    """
+    global _in_compile_worker
+    _in_compile_worker = hasattr(signal, 'setitimer')
+    if resource is not None:
+        if COMPILE_MEMORY_LIMIT > 0:
+            limit = COMPILE_MEMORY_LIMIT * 2 ** 20
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        if COMPILE_CPU_LIMIT > 0:
+            signal.signal(signal.SIGXCPU, _cpu_limit_exceeded)
+    sp.load()
+
+
+def _derive_limited(equation, simplify_mode):
+    """
+    Trabajo de un proceso de compilación: _derive_timed con un límite de CPU
+    de COMPILE_CPU_LIMIT segundos para este trabajo (el límite de RLIMIT_CPU es
+    acumulado por proceso, así que se fija respecto al consumo actual). Al
+    superarlo el núcleo envía SIGXCPU y _cpu_limit_exceeded aborta el trabajo.
+    Los errores de memoria y de recursión se convierten en CompileLimitError.
+    """
+    limited = resource is not None and COMPILE_CPU_LIMIT > 0
+    if limited:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        soft = int(usage.ru_utime + usage.ru_stime + COMPILE_CPU_LIMIT) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (soft if hard == resource.RLIM_INFINITY else min(soft, hard), hard))
+    try:
+        return _derive_timed(equation, simplify_mode)
+    except MemoryError:
+        raise CompileLimitError(f'compilation exceeded the {COMPILE_MEMORY_LIMIT} MB memory limit') from None
+    except RecursionError:
+        raise CompileLimitError('expression is too deeply nested') from None
+    finally:
+        if limited:
+            resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+
+
+def _get_compile_executor():
+    """Crea bajo demanda el grupo de procesos usado para compilar en paralelo (y aislado)."""
+    global _compile_executor
+    with _compile_executor_lock:
+        if _compile_executor is None:
+            _compile_executor = ProcessPoolExecutor(max_workers=max(1, COMPILE_WORKERS),
+                                                    mp_context=multiprocessing.get_context(COMPILE_START_METHOD),
+                                                    initializer=_init_compile_worker)
+        return _compile_executor
+
+
+def _reset_compile_executor(executor, kill=False):
+    """
+    Descarta un grupo de procesos caído para que la siguiente petición cree
+    otro. Con `kill`, termina además sus procesos (trabajos que no responden).
+    """
+    global _compile_executor
+    with _compile_executor_lock:
+        if _compile_executor is executor:
+            _compile_executor = None
+    if kill:
+        for process in list((getattr(executor, '_processes', None) or {}).values()):
+            process.kill()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def start_compile_workers():
+    """
+    Arranca los procesos de compilación (que importan SymPy al iniciarse) sin
+    esperar a la primera petición. Se llama en cada worker del servidor.
+    """
+    if COMPILE_WORKERS > 0:
+        executor = _get_compile_executor()
+        for _ in range(max(1, COMPILE_WORKERS)):
+            executor.submit(int)
+
+
+# Señales con las que termina un proceso de compilación que supera sus límites: SIGXCPU
+# (RLIMIT_CPU) y las de una reserva de memoria fallida con RLIMIT_AS dentro de código C
+_LIMIT_SIGNALS = {getattr(signal, name) for name in ('SIGXCPU', 'SIGSEGV', 'SIGBUS', 'SIGABRT') if hasattr(signal, name)}
+
+
+class CompileUnavailableError(Exception):
+    """El grupo de procesos de compilación cayó por una causa ajena a los límites de la ecuación."""
+
+
+def _pool_failure(executor):
+    """
+    Causa de la caída de un grupo de procesos según cómo terminaron sus
+    procesos (los que terminate_broken para después con SIGTERM no cuentan):
+    'limit' si alguno murió por una de _LIMIT_SIGNALS, 'start' si alguno salió
+    sin señal (falló el inicializador o la importación) y 'crash' en otro caso.
+    """
+    processes = list((getattr(executor, '_processes', None) or {}).values())
+    deadline = time.monotonic() + 1.0  # El estado de salida puede tardar en estar disponible (volcado de memoria)
+    for process in processes:
+        process.join(max(0.0, deadline - time.monotonic()))
+    codes = [process.exitcode for process in processes]
+    codes = [code for code in codes if code is not None and code != -signal.SIGTERM]
+    if any(-code in _LIMIT_SIGNALS for code in codes if code < 0):
+        return 'limit'
+    if any(code >= 0 for code in codes):
+        return 'start'
+    return 'crash'
+
+
+def _submit_all(pending, simplify_mode):
+    """Envía las compilaciones al grupo de procesos, recreándolo si estaba caído."""
+    executor = _get_compile_executor()
+    try:
+        return executor, {eq: executor.submit(_derive_limited, eq, simplify_mode) for eq in pending}
+    except BrokenProcessPool:
+        _reset_compile_executor(executor)
+        executor = _get_compile_executor()
+        return executor, {eq: executor.submit(_derive_limited, eq, simplify_mode) for eq in pending}
+
+
+def _run_in_workers(pending, simplify_mode, derived):
+    """
+    Una pasada de _derive_in_workers: guarda en `derived` el resultado de cada
+    ecuación de `pending` que termina (o supera COMPILE_WALL_LIMIT, en cuyo caso
+    se matan los procesos del grupo) y devuelve {ecuación: causa} de las que
+    perdieron su proceso por la caída del grupo (ver _pool_failure).
+    """
+    executor, futures = _submit_all(pending, simplify_mode)
+    deadline = time.monotonic() + COMPILE_WALL_LIMIT if COMPILE_WALL_LIMIT > 0 else None
+    failures = {}
+    for eq, future in futures.items():
+        try:
+            derived[eq] = future.result(timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            logging.error(f"Compilation exceeded {COMPILE_WALL_LIMIT:g} s, killing compile workers: {eq}")
+            derived[eq] = CompileLimitError(f'compilation exceeded the {COMPILE_WALL_LIMIT:g} s time limit')
+            _reset_compile_executor(executor, kill=True)
+            deadline = None  # Las demás terminan en cuanto el grupo detecta la caída
+        except BrokenProcessPool:
+            failures[eq] = _pool_failure(executor)
+        except CancelledError:
+            failures[eq] = 'crash'
+        except Exception as e:
+            derived[eq] = e
+    if failures:
+        _reset_compile_executor(executor)
+    return failures
+
+
+def _derive_in_workers(pending, simplify_mode):
+    """
+    Compila `pending` en los procesos de compilación. Las ecuaciones afectadas
+    por una caída del grupo (de esta u otras peticiones) se reintentan una vez
+    juntas y, si vuelve a caer con varias, de una en una, de modo que la caída
+    se atribuye solo a la ecuación cuyo propio proceso murió. Si murió por un
+    límite de memoria o CPU es un CompileLimitError; si los procesos no pueden
+    arrancar se compila en el propio proceso, y cualquier otra caída es un
+    CompileUnavailableError. Devuelve {ecuación: (expresiones, tiempos, completa) o excepción}.
+    """
+    derived = {}
+    failures = _run_in_workers(pending, simplify_mode, derived)
+    if failures and 'start' not in failures.values():
+        logging.error(f"Compile worker pool failed, retrying {len(failures)} equation(s)")
+        failures = _run_in_workers(list(failures), simplify_mode, derived)
+        if len(failures) > 1 and 'start' not in failures.values():
+            isolated = {}
+            for eq in failures:
+                isolated.update(_run_in_workers([eq], simplify_mode, derived))
+            failures = isolated
+    for eq, failure in failures.items():
+        if failure == 'start':
+            logging.error(f"Compile workers could not start, compiling in-process: {eq}")
+            derived.update(_derive_locally([eq], simplify_mode))
+        elif failure == 'limit':
+            derived[eq] = CompileLimitError('the compile worker was terminated by the memory or CPU limit')
+        else:
+            derived[eq] = CompileUnavailableError('the compile worker pool failed; try again later')
+    metrics.inc('curvipath_compile_limit_total', sum(isinstance(result, CompileLimitError) for result in derived.values()))
+    return derived
+
+
+def _derive_locally(pending, simplify_mode):
+    """Compila `pending` en el propio proceso. Devuelve {ecuación: (expresiones, tiempos, completa) o excepción}."""
+    derived = {}
+    for eq in pending:
+        try:
+            derived[eq] = _derive_timed(eq, simplify_mode)
+        except Exception as e:
+            derived[eq] = e
+    return derived
+
+
+def _derive_all(pending, simplify_mode):
+    """
+    Obtiene las expresiones de cada ecuación canónica de `pending`. Con
+    COMPILE_SANDBOX, o con varias ecuaciones y COMPILE_WORKERS > 1, el trabajo
+    se hace en los procesos de compilación; en paralelo, el tiempo total es
+    aproximadamente el de la ecuación más lenta.
+    Devuelve {ecuación: (tupla de expresiones, tiempos por etapa, completa) o excepción}.
+    """
+    if COMPILE_SANDBOX or (COMPILE_WORKERS > 1 and len(pending) > 1):
+        return _derive_in_workers(pending, simplify_mode)
+    return _derive_locally(pending, simplify_mode)
+
+
+def compile_many(equations, simplify_mode=DEFAULT_SIMPLIFY_MODE, labels=None):
+    """
+    Compila (o recupera de la caché) un conjunto de ecuaciones sin preprocesar.
+    Las que no están en caché se buscan en el almacén persistente y las
+    restantes se compilan juntas con _derive_all (y se guardan en el almacén
+    salvo si la simplificación agotó su presupuesto);
+    las funciones numpy se generan después en este proceso, ya que no se
+    pueden transferir.
+    La duración de cada etapa se registra con metrics.record, asociada a la
+    componente que indica `labels` ({ecuación canónica: nombre}) si se pasa.
+    Devuelve {ecuación canónica: CompiledExpression o excepción}.
+    """
+    compiled = {}
+    pending = []
+    for equation in equations:
+        canonical = preprocess_equation(equation)
+        if canonical in compiled or canonical in pending:
+            continue
+        entry = expression_cache.get((canonical, simplify_mode))
+        if entry is not None:
+            compiled[canonical] = entry
+        else:
+            pending.append(canonical)
+
+    if not pending:
+        return compiled
+    labels = labels or {}
+    stored = {}
+    if expression_store.enabled:
+        with timed('store'):  # Lectura de las expresiones que otro proceso ya compiló
+            stored = expression_store.load_many(pending, simplify_mode)
+    derived_all = {canonical: (exprs, {}, False) for canonical, exprs in stored.items()}  # Ya guardadas
+    pending = [canonical for canonical in pending if canonical not in stored]
+    if pending:
+        with timed('compile'):  # Tiempo real de la compilación, en paralelo o no
+            derived_all.update(_derive_all(pending, simplify_mode))
+    for canonical, derived in derived_all.items():
+        if isinstance(derived, Exception):
+            compiled[canonical] = derived
+            continue
+        exprs, timings, save = derived
+        try:
+            entry = _timed_call(timings, 'lambdify', CompiledExpression, (canonical, simplify_mode), *exprs)
+        except Exception as e:
+            compiled[canonical] = e
+            continue
+        finally:
+            for stage, seconds in timings.items():
+                record(stage, seconds, labels.get(canonical))
+        if save:
+            expression_store.save(canonical, simplify_mode, exprs)
+        compiled[canonical] = expression_cache.put((canonical, simplify_mode), entry)
+    return compiled
+
+
+class EquationError(ValueError):
+    """Error al compilar la ecuación de una componente concreta ('x', 'y' o 'z')."""
+
+    status = 400  # Código HTTP de la respuesta
+
+    def __init__(self, component, message):
+        super().__init__(message)
+        self.component = component  # Componente cuya ecuación falló
+
+
+class EquationLimitError(EquationError):
+    """La ecuación de una componente superó los límites de tiempo o memoria de la compilación."""
+
+    status = 422
+
+
+class EquationUnavailableError(EquationError):
+    """La ecuación de una componente no se pudo compilar porque cayó el grupo de procesos de compilación."""
+
+    status = 503
+
+
+def compile_vector_functions(vector_functions, simplify_mode=DEFAULT_SIMPLIFY_MODE):
+    """
+    Compila en una sola pasada (en paralelo si está configurado) todas las
+    componentes no vacías de varias funciones vectoriales. Cada función es una
+    secuencia de pares (nombre, ecuación).
+    Devuelve, por función, la lista de pares (nombre, CompiledExpression) o un
+    EquationError indicando la primera componente que no se pudo compilar.
+    """
+    stripped = [[(name, (equation or '').strip()) for name, equation in equations] for equations in vector_functions]
+    labels = {}  # Componentes de cada ecuación canónica (x1, y1, x2...), para los tiempos por componente
+    for idx, equations in enumerate(stripped):
+        for name, equation in equations:
+            if equation:
+                labels.setdefault(preprocess_equation(equation), []).append(f'{name}{idx + 1}')
+    compiled = compile_many([eq for equations in stripped for _, eq in equations if eq], simplify_mode,
+                            {canonical: '+'.join(names) for canonical, names in labels.items()})
+
+    results = []
+    for equations in stripped:
+        compiled_components = []
+        for name, equation in equations:
+            if not equation:
+                continue
+            entry = compiled[preprocess_equation(equation)]
+            if isinstance(entry, Exception):
+                error_type = (EquationLimitError if isinstance(entry, CompileLimitError) else
+                              EquationUnavailableError if isinstance(entry, CompileUnavailableError) else EquationError)
+                error = error_type(name, str(entry))
+                error.__cause__ = entry
+                compiled_components = error
+                break
+            compiled_components.append((name, entry))
+        results.append(compiled_components)
+    return results
+
+
+def compile_components(equations, simplify_mode=DEFAULT_SIMPLIFY_MODE):
+    """
+    Compila (o recupera de la caché) las componentes no vacías de una función
+    vectorial. `equations` es una secuencia de pares (nombre, ecuación).
+    Devuelve una lista de pares (nombre, CompiledExpression); si una ecuación
+    no se puede compilar lanza EquationError indicando la componente.
+    """
+    compiled_components = compile_vector_functions([equations], simplify_mode)[0]
+    if isinstance(compiled_components, EquationError):
+        raise compiled_components
+    return compiled_components
+
+
+class ExpressionCache:
+    """
+    Caché LRU acotada y segura entre hilos de ecuaciones compiladas.
+    Guarda dos tipos de entradas:
+    - componentes, con clave (texto canónico tras preprocess_equation, política de simplificación)
+    - núcleos fusionados, con clave ('kernel', claves de sus componentes...)
+    """
+
+    def __init__(self, maxsize=EXPRESSION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # Clave -> CompiledExpression o VectorKernel
+        self._lock = threading.Lock()
+        self.hits = 0  # Peticiones servidas desde la caché
+        self.misses = 0  # Peticiones que requirieron compilar
+        self.evictions = 0  # Entradas descartadas por superar el tamaño máximo
+
+    def get(self, key):
+        """Devuelve la entrada de `key` o None, contando el acierto o el fallo."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)  # Marca la entrada como usada recientemente
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def put(self, key, entry):
+        """Guarda una entrada, descartando las menos usadas si se supera el tamaño máximo."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)  # Descarta la entrada menos usada
+                self.evictions += 1
+        return entry
+
+    def _get_or_create(self, key, factory):
+        """Devuelve la entrada de `key`, creándola con `factory()` solo si no está en caché."""
+        entry = self.get(key)
+        if entry is not None:
+            return entry
+        # La compilación se hace fuera del bloqueo para no serializar peticiones distintas
+        return self.put(key, factory())
+
+    def get_or_compile(self, equation, simplify_mode=DEFAULT_SIMPLIFY_MODE):
+        """Devuelve la compilación de la ecuación, compilándola solo si no está en caché."""
+        canonical = preprocess_equation(equation)
+        return self._get_or_create((canonical, simplify_mode), lambda: compile_equation(canonical, simplify_mode))
+
+    def get_or_build_kernel(self, components):
+        """Devuelve el núcleo fusionado de una lista de componentes compiladas."""
+        key = ('kernel',) + tuple(compiled.key for compiled in components)
+        def build():
+            with timed('kernel'):
+                return VectorKernel(components)
+        return self._get_or_create(key, build)
+
+    def stats(self):
+        """Devuelve los contadores de la caché."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def clear(self):
+        """Vacía la caché sin reiniciar los contadores."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Caché global compartida por todas las peticiones del proceso
+expression_cache = ExpressionCache()
@@ -0,0 +1,80 @@
+# Reducción de las series para dibujarlas: copia con pocos puntos que conserva la forma de las curvas
+import numpy as np  # Biblioteca para cálculos numéricos
+from metrics import timed  # Tiempos por etapa
+
+# Número mínimo de puntos de una serie reducida: el primero, el último y al menos un cubo intermedio
+MIN_POINTS = 3
+
+
+def _bucket_means(values, starts, counts):
+    """Media de los valores finitos de cada cubo (NaN si no tiene ninguno)."""
+    finite = np.isfinite(values)
+    sums = np.add.reduceat(np.where(finite, values, 0.0), starts)
+    valid = np.add.reduceat(finite.astype(np.int64), starts)
+    with np.errstate(all='ignore'):
+        return sums / valid
+
+
+def lttb_indices(t_vals, series, max_points):
+    """
+    Elige como mucho `max_points` índices de la malla `t_vals` comunes a
+    todas las series de `series` con Largest-Triangle-Three-Buckets: se
+    conservan el primer y el último punto, los interiores se reparten en
+    max_points - 2 cubos consecutivos y de cada cubo se toma el punto que
+    forma el triángulo de mayor área con los cubos vecinos, sumando las áreas
+    de todas las series normalizadas por su rango. Como vértices vecinos se
+    usan las medias de los cubos anterior y siguiente (no el punto elegido en
+    el anterior), de modo que todos los cubos se calculan a la vez con numpy.
+    Los puntos sin valor (NaN) se conservan para que los huecos de las
+    curvas sigan apareciendo. Devuelve los índices en orden creciente.
+    """
+    n = len(t_vals)
+    if n <= max_points:
+        return np.arange(n)
+    t_vals = np.asarray(t_vals, dtype=np.float64)
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)  # Límites de los cubos interiores
+    starts, counts = edges[:-1] - 1, np.diff(edges)  # Posiciones relativas a los puntos interiores
+    bucket = np.repeat(np.arange(len(counts)), counts)  # Cubo de cada punto interior
+
+    t_inner = t_vals[1:-1]
+    t_means = _bucket_means(t_inner, starts, counts)
+    t_prev = np.concatenate(([t_vals[0]], t_means[:-1]))[bucket]
+    t_next = np.concatenate((t_means[1:], [t_vals[-1]]))[bucket]
+    t_span = abs(t_vals[-1] - t_vals[0]) or 1.0
+
+    score = np.zeros(n - 2)
+    for values in series:
+        values = np.asarray(values, dtype=np.float64)
+        inner = values[1:-1]
+        finite = np.isfinite(inner)
+        if finite.any():
+            value_range = np.ptp(inner[finite])
+            if value_range > 0:
+                means = _bucket_means(inner, starts, counts)
+                v_prev = np.concatenate(([values[0]], means[:-1]))[bucket]
+                v_next = np.concatenate((means[1:], [values[-1]]))[bucket]
+                with np.errstate(all='ignore'):
+                    area = np.abs((t_prev - t_next) * (inner - v_prev) - (t_prev - t_inner) * (v_next - v_prev))
+                score += np.nan_to_num(area / (value_range * t_span), nan=0.0, posinf=0.0)
+        score[~finite] = np.inf  # Los huecos tienen prioridad
+
+    best = np.maximum.reduceat(score, starts)
+    candidates = np.flatnonzero(score == best[bucket])
+    _, first = np.unique(bucket[candidates], return_index=True)  # Primer punto de mayor área de cada cubo
+    return np.concatenate(([0], candidates[first] + 1, [n - 1]))
+
+
+def downsample_arrays(arrays, max_points):
+    """
+    Copia reducida a como mucho `max_points` puntos de las series de una
+    respuesta de /get_data (todas sobre la malla arrays['t']), con los mismos
+    índices para todas (ver lttb_indices). Devuelve (series, datos de la
+    reducción) o (arrays, None) si ya caben.
+    """
+    t_vals = arrays['t']
+    if len(t_vals) <= max_points:
+        return arrays, None
+    with timed('downsample'):
+        indices = lttb_indices(t_vals, [values for key, values in arrays.items() if key != 't'], max_points)
+        reduced = {key: np.asarray(values)[indices] for key, values in arrays.items()}
+    return reduced, {'method': 'lttb', 'points': len(t_vals), 'returned': len(indices)}
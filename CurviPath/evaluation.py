@@ -0,0 +1,182 @@
+# Evaluación numérica de expresiones compiladas sobre arreglos de tiempo
+import os  # Acceso a variables de entorno del sistema operativo
+import logging  # Registro de eventos y errores
+import numpy as np  # Biblioteca para cálculos numéricos
+from compiler import time_symbol, expression_cache  # Símbolo de tiempo compartido y caché de expresiones
+from metrics import metrics, timed  # Tiempos y contadores de la evaluación punto por punto
+
+# Número máximo de puntos que se evalúan uno a uno con mpmath cuando numpy no puede evaluar la expresión
+SCALAR_FALLBACK_MAX_POINTS = int(os.environ.get('CURVIPATH_SCALAR_FALLBACK_MAX_POINTS', 200000))
+
+# Número máximo de puntos que se evalúan con subs().evalf(), el último recurso (milisegundos por punto)
+SYMPY_FALLBACK_MAX_POINTS = int(os.environ.get('CURVIPATH_FALLBACK_MAX_POINTS', 1000))
+
+# Tolerancia relativa para considerar real un resultado complejo
+IMAG_TOLERANCE = 1e-12
+
+
+def to_real_array(values, size):
+    """
+    Convierte el resultado de una evaluación en un arreglo float64 de longitud `size`.
+    Los valores complejos con parte imaginaria no despreciable y los infinitos se marcan como NaN.
+    """
+    arr = np.asarray(values)
+    if np.iscomplexobj(arr):
+        is_real = np.abs(arr.imag) <= IMAG_TOLERANCE * np.maximum(1.0, np.abs(arr.real))
+        arr = np.where(is_real, arr.real, np.nan)
+    arr = np.array(np.broadcast_to(arr.astype(np.float64), (size,)))  # Copia escribible; expande constantes
+    arr[np.isinf(arr)] = np.nan
+    return arr
+
+
+def _repair_invalid(compiled, order, vals, y_vals, params=None):
+    """
+    Reevalúa en aritmética compleja solo los puntos no finitos, de modo que
+    los intermedios complejos que se cancelan (p. ej. sqrt(t - 5)**2) den un
+    resultado real en lugar de NaN.
+    """
+    mask = np.isnan(y_vals)
+    if mask.any():
+        try:
+            y_vals[mask] = to_real_array(compiled.funcs[order](vals[mask].astype(np.complex128), *compiled.args(params)), int(mask.sum()))
+        except Exception:
+            pass  # Los puntos siguen marcados como NaN
+    return y_vals
+
+
+def _evaluate_pointwise(compiled, order, vals, params=None):
+    """
+    Último recurso cuando numpy no puede evaluar la expresión: evalúa punto por
+    punto con mpmath y, si también falla, con subs().evalf(). Ambos bucles
+    están acotados; los puntos que quedan fuera del límite se marcan como NaN.
+    """
+    y_vals = np.full(len(vals), np.nan)
+    scalar = compiled.scalar_func(order)
+    args = compiled.args(params)
+    failed = []
+    with timed('fallback'):
+        for i, val in enumerate(vals[:SCALAR_FALLBACK_MAX_POINTS]):
+            try:
+                y_vals[i] = to_real_array(complex(scalar(float(val), *args)), 1)[0]
+            except Exception:
+                failed.append(i)
+
+        expr = compiled.exprs[order].subs(compiled.substitutions(params))
+        for i in failed[:SYMPY_FALLBACK_MAX_POINTS]:
+            try:
+                y_vals[i] = to_real_array(complex(expr.subs(time_symbol(), vals[i]).evalf()), 1)[0]
+            except Exception:
+                pass  # El punto sigue marcado como NaN
+    metrics.inc('curvipath_fallback_points_total', min(len(vals), SCALAR_FALLBACK_MAX_POINTS), kind='mpmath')
+    metrics.inc('curvipath_fallback_points_total', min(len(failed), SYMPY_FALLBACK_MAX_POINTS), kind='sympy')
+
+    skipped = max(0, len(vals) - SCALAR_FALLBACK_MAX_POINTS) + max(0, len(failed) - SYMPY_FALLBACK_MAX_POINTS)
+    if skipped:
+        logging.warning(f"Element-wise fallback limit reached, {skipped} points left as NaN: {expr}")
+    return y_vals
+
+
+def safe_evalf_array(compiled, order, vals, params=None):
+    """
+    Evalúa de forma segura la derivada de orden `order` (0, 1 o 2) de una
+    expresión compilada sobre un arreglo de valores, con los parámetros
+    {nombre: valor} de `params`.
+    Orden de intentos:
+    1. Evaluación vectorizada real; los puntos inválidos se reevalúan en aritmética compleja.
+    2. Evaluación vectorizada con el arreglo completo en aritmética compleja.
+    3. Evaluación punto por punto (mpmath y, como último recurso, SymPy), acotada.
+    Devuelve el arreglo (NaN en los puntos sin valor real) y el número de puntos inválidos.
+    """
+    f = compiled.funcs[order]
+    args = compiled.args(params)  # Falla aquí, y no en la evaluación, si falta algún parámetro
+    with np.errstate(all='ignore'):
+        try:
+            y_vals = _repair_invalid(compiled, order, vals, to_real_array(f(vals, *args), len(vals)), params)
+        except Exception as e:
+            logging.debug(f"Vectorized evaluation failed, retrying with complex dtype: {str(e)}")
+            try:
+                y_vals = to_real_array(f(vals.astype(np.complex128), *args), len(vals))
+            except Exception as e:
+                logging.debug(f"Complex evaluation failed, falling back to element-wise: {str(e)}")
+                y_vals = _evaluate_pointwise(compiled, order, vals, params)
+    return y_vals, int(np.isnan(y_vals).sum())
+
+
+def evaluate_kernel(kernel, vals, params=None):
+    """
+    Evalúa un núcleo fusionado y devuelve una lista de pares (arreglo, puntos
+    inválidos) con el orden [pos, vel, acc] por componente. Si el núcleo no se
+    puede evaluar, cada serie se evalúa por separado con safe_evalf_array.
+    """
+    try:
+        with np.errstate(all='ignore'):
+            raw = kernel.evaluate_raw(vals, params)  # Las series de todas las componentes en una sola pasada
+    except Exception as e:
+        logging.debug(f"Fused kernel evaluation failed, evaluating series separately: {str(e)}")
+        return [safe_evalf_array(compiled, order, vals, params) for compiled in kernel.components for order in range(3)]
+
+    series = []
+    for i, values in enumerate(raw):
+        compiled, order = kernel.components[i // 3], i % 3
+        try:
+            with np.errstate(all='ignore'):
+                y_vals = _repair_invalid(compiled, order, vals, to_real_array(values, len(vals)), params)
+        except Exception:
+            series.append(safe_evalf_array(compiled, order, vals, params))
+            continue
+        series.append((y_vals, int(np.isnan(y_vals).sum())))
+    return series
+
+
+def evaluate_vector_function(components, vals, params=None):
+    """
+    Evalúa con un único núcleo fusionado una función vectorial ya compilada.
+    `components` es una lista de pares (nombre, CompiledExpression) y `params`
+    el diccionario {nombre: valor} de los parámetros de sus ecuaciones.
+    Devuelve un diccionario {'x_eq': (arreglo, puntos inválidos), 'x_v': ..., 'x_a': ..., ...}.
+    """
+    kernel = expression_cache.get_or_build_kernel([compiled for _, compiled in components])
+    series = evaluate_kernel(kernel, vals, params)  # Todas las series en una sola pasada
+    evaluated = {}
+    for i, (name, _) in enumerate(components):
+        for j, kind in enumerate(('eq', 'v', 'a')):  # Posición, velocidad y aceleración
+            evaluated[f'{name}_{kind}'] = series[3 * i + j]
+    return evaluated
+
+
+def series_to_list(arr):
+    """Convierte un arreglo en lista para JSON, sustituyendo NaN por None (null)."""
+    mask = np.isnan(arr)
+    if not mask.any():
+        return arr.tolist()
+    values = arr.astype(object)
+    values[mask] = None
+    return values.tolist()
+
+
+def time_chunks(t_min, t_max, intervals, chunk_size):
+    """
+    Genera la malla np.linspace(t_min, t_max, intervals) por bloques de como
+    máximo `chunk_size` valores, sin materializar el arreglo completo.
+    Produce pares (índice del primer valor, arreglo del bloque).
+    """
+    step = (t_max - t_min) / (intervals - 1) if intervals > 1 else 0.0
+    for start in range(0, intervals, chunk_size):
+        stop = min(start + chunk_size, intervals)
+        vals = t_min + np.arange(start, stop) * step
+        if stop == intervals and intervals > 1:
+            vals[-1] = t_max  # Igual que linspace, el último valor es exactamente t_max
+        yield start, vals
+
+
+def evaluate_jerk(compiled, vals, params=None):
+    """
+    Evalúa la tercera derivada de una expresión compilada sobre un arreglo de
+    valores. Si numpy no puede evaluarla, devuelve NaN en todos los puntos.
+    """
+    with np.errstate(all='ignore'):
+        try:
+            return to_real_array(compiled.jerk_func()(vals, *compiled.args(params)), len(vals))
+        except Exception as e:
+            logging.debug(f"Jerk evaluation failed: {str(e)}")
+            return np.full(len(vals), np.nan)
@@ -0,0 +1,175 @@
+# Detección numérica de eventos (aterrizaje, altura máxima, cruces) sobre trayectorias ya evaluadas
+import os  # Acceso a variables de entorno del sistema operativo
+import re  # Formato de las especificaciones de eventos
+import logging  # Registro de eventos y errores
+import numpy as np  # Biblioteca para cálculos numéricos
+from evaluation import to_real_array, safe_evalf_array, evaluate_jerk, evaluate_vector_function, series_to_list  # Evaluación de las expresiones compiladas
+from metrics import timed  # Tiempos por etapa
+
+# Número máximo de eventos por serie y curva (p. ej., cruces de una función oscilante con muchos puntos)
+EVENTS_MAX = int(os.environ.get('CURVIPATH_EVENTS_MAX', 1000))
+
+# Iteraciones máximas del refinamiento de cada raíz
+EVENTS_MAX_ITERATIONS = 60
+
+# Tolerancia relativa (respecto al rango de tiempos) del instante de cada evento
+EVENTS_XTOL = 1e-12
+
+# Especificación de un evento: serie (x_eq, y_v, z_a...) y nivel opcional ('y_eq', 'y_eq:10', 'x_v:-2.5')
+_EVENT_PATTERN = re.compile(r'^([xyz])_(eq|v|a)(?::(.+))?$')
+
+# Orden de derivación de cada tipo de serie
+_ORDERS = {'eq': 0, 'v': 1, 'a': 2}
+_KINDS = ('eq', 'v', 'a')
+
+
+def parse_event(spec):
+    """
+    Convierte una especificación de evento ('y_eq', 'y_v', 'x_eq:5'...) en la
+    tupla (componente, tipo de serie, nivel). El evento ocurre cuando la serie
+    cruza el nivel (0 por defecto): 'y_eq' es el aterrizaje, 'y_v' el punto
+    más alto. Lanza ValueError si el formato no es válido.
+    """
+    match = _EVENT_PATTERN.match(spec.strip())
+    if not match:
+        raise ValueError(f"invalid event '{spec}'; expected <x|y|z>_<eq|v|a>[:level], e.g. y_eq or y_v")
+    component, kind, level = match.groups()
+    level = float(level) if level is not None else 0.0
+    if not np.isfinite(level):
+        raise ValueError(f"invalid event level in '{spec}'")
+    return component, kind, level
+
+
+def _compiled_series(compiled, order, params):
+    """
+    Devuelve la función t -> serie de orden `order` (0 a 3) de una expresión
+    compilada, sobre arreglos de tiempos. Usa la función numpy y, si falla,
+    la evaluación con respaldo de safe_evalf_array.
+    """
+    if order == 3:
+        return lambda vals: evaluate_jerk(compiled, vals, params)
+
+    def series(vals):
+        try:
+            with np.errstate(all='ignore'):
+                return to_real_array(compiled.funcs[order](vals, *compiled.args(params)), len(vals))
+        except Exception as e:
+            logging.debug(f"Event refinement falling back to safe evaluation: {str(e)}")
+            return safe_evalf_array(compiled, order, vals, params)[0]
+    return series
+
+
+def refine_roots(f, df, lo, hi, f_lo, f_hi, xtol):
+    """
+    Refina a la vez todas las raíces de `f` encerradas en los intervalos
+    [lo, hi] (con f_lo y f_hi de signo opuesto) y devuelve sus instantes.
+    Con la derivada `df` usa Newton salvaguardado: si el paso sale del
+    intervalo o no es finito, bisección. Sin derivada alterna falsa posición y
+    bisección. El intervalo se reduce en cada iteración, así que converge
+    siempre; termina cuando todas las raíces cambian menos de `xtol`.
+    """
+    x = lo - f_lo * (hi - lo) / (f_hi - f_lo)  # Primera aproximación: la secante del intervalo
+    active = np.ones(len(x), dtype=bool)
+    for iteration in range(EVENTS_MAX_ITERATIONS):
+        idx = np.flatnonzero(active)
+        if not idx.size:
+            break
+        xs = x[idx]
+        fx = f(xs)
+        left = np.sign(fx) == np.sign(f_lo[idx])  # La raíz está a la derecha de xs
+        lo[idx] = np.where(left, xs, lo[idx])
+        f_lo[idx] = np.where(left, fx, f_lo[idx])
+        hi[idx] = np.where(left, hi[idx], xs)
+        f_hi[idx] = np.where(left, f_hi[idx], fx)
+        mid = 0.5 * (lo[idx] + hi[idx])
+        with np.errstate(all='ignore'):
+            if df is not None:
+                candidate = xs - fx / df(xs)
+            elif iteration % 2 == 0:
+                candidate = lo[idx] - f_lo[idx] * (hi[idx] - lo[idx]) / (f_hi[idx] - f_lo[idx])
+            else:
+                candidate = mid
+        inside = np.isfinite(candidate) & (candidate > lo[idx]) & (candidate < hi[idx])
+        candidate = np.where(inside, candidate, mid)
+        converged = (fx == 0) | ~np.isfinite(fx) | (np.abs(candidate - xs) <= xtol) | (hi[idx] - lo[idx] <= xtol)
+        x[idx] = np.where(fx == 0, xs, candidate)
+        active[idx[converged]] = False
+    return x
+
+
+def find_crossings(t_vals, values, f, df, level=0.0, limit=EVENTS_MAX):
+    """
+    Busca los instantes en que la serie muestreada `values` (sobre `t_vals`)
+    cruza `level`: detecta los cambios de signo de values - level en toda la
+    malla a la vez y refina cada uno con refine_roots sobre la función
+    continua `f` (con su derivada `df`, si se conoce). Los puntos de la malla
+    donde la serie vale exactamente `level` también son eventos.
+    Devuelve (instantes, sentidos, truncado): el sentido es 1 si la serie
+    pasa a ser mayor que el nivel, -1 si pasa a ser menor y 0 si solo lo toca.
+    """
+    g = values - level
+    with np.errstate(invalid='ignore'):
+        brackets = np.flatnonzero(g[:-1] * g[1:] < 0)  # Cambios de signo entre puntos consecutivos (NaN no cuenta)
+    zeros = np.flatnonzero(g == 0)
+    truncated = len(brackets) + len(zeros) > limit
+    brackets, zeros = brackets[:limit], zeros[:max(0, limit - len(brackets))]
+
+    times = [t_vals[zeros]]
+    previous, following = g[np.maximum(zeros - 1, 0)], g[np.minimum(zeros + 1, len(g) - 1)]
+    directions = [np.nan_to_num(np.sign(following - previous)).astype(int)]
+    if brackets.size:
+        span = abs(t_vals[-1] - t_vals[0]) or 1.0
+        roots = refine_roots(lambda t: f(t) - level, df, t_vals[brackets].astype(float), t_vals[brackets + 1].astype(float),
+                             g[brackets].astype(float), g[brackets + 1].astype(float), EVENTS_XTOL * span)
+        times.append(roots)
+        directions.append(np.where(g[brackets] < 0, 1, -1))
+    times, directions = np.concatenate(times), np.concatenate(directions)
+    order = np.argsort(times, kind='stable')
+    return times[order], directions[order], truncated
+
+
+def curve_events(specs, label, suffix, t_vals, arrays, components=None, closed_form=None, params=None):
+    """
+    Calcula los eventos `specs` (tuplas de parse_event) de una curva ya
+    evaluada: `arrays` contiene sus series con el sufijo `suffix` y la curva
+    es una función vectorial compilada (`components`, pares (nombre,
+    CompiledExpression)) o una trayectoria en forma cerrada (`closed_form`).
+    Devuelve una lista de diccionarios con la curva, la serie, el nivel, los
+    instantes, los sentidos y el valor de todas las series en esos instantes;
+    las series que la curva no tiene se omiten.
+    """
+    compiled_by_name = dict(components or [])
+    found = []
+    with timed('events'):
+        for component, kind, level in specs:
+            key = f'{component}_{kind}'
+            if f'{key}{suffix}' not in arrays:
+                continue
+            order = _ORDERS[kind]
+            if closed_form is not None:
+                f = lambda t, key=key: closed_form(t)[key]
+                df = (lambda t, key=f'{component}_{_KINDS[order + 1]}': closed_form(t)[key]) if order < 2 else None
+            else:
+                compiled = compiled_by_name[component]
+                f = _compiled_series(compiled, order, params)
+                df = _compiled_series(compiled, order + 1, params)
+            times, directions, truncated = find_crossings(t_vals, arrays[f'{key}{suffix}'], f, df, level)
+
+            if closed_form is not None:
+                at_events = closed_form(times) if times.size else {}
+            elif times.size:
+                at_events = {name: values for name, (values, _) in evaluate_vector_function(components, times, params).items()}
+            else:
+                at_events = {}
+            event = {
+                'curve': label,
+                'series': f'{key}{suffix}',
+                'level': level,
+                't': series_to_list(times),
+                'direction': directions.tolist(),
+                'values': {f'{name}{suffix}': series_to_list(np.asarray(values, dtype=float)) for name, values in at_events.items()},
+            }
+            if truncated:
+                event['truncated'] = True
+            found.append(event)
+    return found
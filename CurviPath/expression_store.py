@@ -0,0 +1,304 @@
+# Almacén persistente de expresiones simplificadas, compartido por los procesos y entre reinicios
+import os  # Acceso a variables de entorno del sistema operativo
+import json  # Formato de las expresiones guardadas
+import time  # Marca de último uso para la política LRU
+import hashlib  # Clave de cada ecuación
+import logging  # Registro de eventos y errores
+import sqlite3  # Base de datos del almacén
+import threading  # Una conexión por hilo y contadores compartidos
+from lazy import LazyModule  # Importación diferida de SymPy
+
+# Biblioteca para cálculos simbólicos, importada al leer o guardar la primera expresión
+sp = LazyModule('sympy')
+
+# Ruta del fichero SQLite del almacén; vacía lo desactiva. Todos los workers
+# deben usar la misma ruta en un disco local (SQLite no admite bien NFS).
+EXPR_STORE_PATH = os.environ.get('CURVIPATH_EXPR_STORE', os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), 'curvipath', 'expressions.sqlite3'))
+
+# Tamaño máximo (MB) de las expresiones guardadas; al superarlo se descartan las menos usadas
+EXPR_STORE_MB = float(os.environ.get('CURVIPATH_EXPR_STORE_MB', 64))
+
+# Segundos que un proceso espera a que otro termine de escribir antes de renunciar
+EXPR_STORE_TIMEOUT = float(os.environ.get('CURVIPATH_EXPR_STORE_TIMEOUT', 5))
+
+# Versión del formato de las entradas; cambiarla invalida las guardadas
+STORE_FORMAT = 2
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS expressions (
+    key TEXT PRIMARY KEY,       -- SHA-256 de (formato, versión de SymPy, política, ecuación canónica)
+    equation TEXT NOT NULL,     -- Ecuación canónica (preprocess_equation)
+    simplify TEXT NOT NULL,     -- Política de simplificación
+    payload TEXT NOT NULL,      -- JSON con el árbol de posición, velocidad y aceleración (encode_expression)
+    size INTEGER NOT NULL,      -- Bytes de payload
+    created REAL NOT NULL,      -- Momento en que se guardó
+    last_used REAL NOT NULL     -- Último uso, para descartar las menos usadas
+);
+CREATE INDEX IF NOT EXISTS expressions_last_used ON expressions (last_used);
+'''
+
+# Nodos hoja de encode_expression; los demás nodos son [nombre de la clase, hijos...]
+_LEAF_TAGS = ('Integer', 'Rational', 'Float', 'Symbol', 'Function', 'S')
+_basic_classes = None  # Subclases de sp.Basic por nombre, para reconstruir los nodos compuestos
+
+
+def _classes():
+    """
+    Clases con las que decode_expression puede reconstruir un nodo: las del
+    paquete SymPy y, para los demás nombres, todas las subclases de sp.Basic
+    (también las que no exporta, como ExprCondPair).
+    """
+    global _basic_classes
+    if _basic_classes is None:
+        module = sp.load()
+        classes = {name: value for name, value in vars(module).items()
+                   if not name.startswith('_') and isinstance(value, type) and issubclass(value, module.Basic)}
+        pending = [module.Basic]
+        while pending:
+            cls = pending.pop()
+            classes.setdefault(cls.__name__, cls)
+            pending.extend(cls.__subclasses__())
+        _basic_classes = classes
+    return _basic_classes
+
+
+def encode_expression(expr):
+    """
+    Convierte una expresión SymPy en un árbol de listas que se guarda como
+    JSON: enteros, racionales y flotantes (exactos), símbolos con sus
+    supuestos, funciones no definidas, constantes de sp.S y, para el resto,
+    [nombre de la clase, hijos...]. Lanza ValueError si la expresión contiene
+    algo que decode_expression no sabría reconstruir.
+    """
+    if expr.is_Integer:
+        return ['Integer', str(expr.p)]
+    if expr.is_Rational:
+        return ['Rational', str(expr.p), str(expr.q)]
+    if expr.is_Float:
+        sign, man, exp, bc = expr._mpf_
+        return ['Float', [sign, str(man), exp, bc], expr._prec]
+    if isinstance(expr, sp.Symbol):
+        if type(expr) is not sp.Symbol:
+            raise ValueError(f'cannot store symbols of type {type(expr).__name__}')
+        assumptions = getattr(expr, '_assumptions_orig', None)
+        return ['Symbol', expr.name, dict(expr.assumptions0 if assumptions is None else assumptions)]
+    if isinstance(expr, sp.core.function.AppliedUndef):
+        return ['Function', expr.func.__name__] + [encode_expression(arg) for arg in expr.args]
+    name = type(expr).__name__
+    if not expr.args:
+        if getattr(sp.S, name, None) is not expr:
+            raise ValueError(f'cannot store atom {expr!r}')
+        return ['S', name]
+    if _classes().get(name) is not type(expr):
+        raise ValueError(f'cannot store expressions of type {name}')
+    return [name] + [encode_expression(arg) for arg in expr.args]
+
+
+def decode_expression(node):
+    """
+    Reconstruye una expresión guardada con encode_expression sin evaluar
+    texto: cada nodo solo puede crear números, símbolos, funciones no
+    definidas, constantes de sp.S o instancias de subclases de sp.Basic a
+    partir de sus hijos ya reconstruidos. Lanza ValueError si el árbol no
+    tiene esa forma.
+    """
+    if not isinstance(node, list) or not node or not isinstance(node[0], str):
+        raise ValueError('malformed stored expression')
+    tag, args = node[0], node[1:]
+    if tag == 'Integer' and len(args) == 1 and isinstance(args[0], str):
+        return sp.Integer(int(args[0]))
+    if tag == 'Rational' and len(args) == 2 and all(isinstance(arg, str) for arg in args):
+        return sp.Rational(int(args[0]), int(args[1]))
+    if tag == 'Float' and len(args) == 2 and isinstance(args[0], list) and len(args[0]) == 4 and isinstance(args[1], int):
+        sign, man, exp, bc = args[0]
+        if not (isinstance(sign, int) and isinstance(man, str) and isinstance(exp, int) and isinstance(bc, int)):
+            raise ValueError('malformed stored float')
+        return sp.Float._new((sign, int(man), exp, bc), args[1])
+    if tag == 'Symbol' and len(args) == 2 and isinstance(args[0], str) and isinstance(args[1], dict):
+        assumptions = args[1]
+        if not all(key.isidentifier() and not key.startswith('_') and isinstance(value, bool)
+                   for key, value in assumptions.items()):
+            raise ValueError('malformed stored symbol assumptions')
+        return sp.Symbol(args[0], **assumptions)
+    if tag == 'Function' and args and isinstance(args[0], str) and args[0].isidentifier():
+        return sp.Function(args[0])(*(decode_expression(arg) for arg in args[1:]))
+    if tag == 'S' and len(args) == 1 and isinstance(args[0], str) and not args[0].startswith('_'):
+        value = getattr(sp.S, args[0], None)
+        if not isinstance(value, sp.Basic):
+            raise ValueError(f'unknown stored constant {args[0]!r}')
+        return value
+    cls = None if tag in _LEAF_TAGS else _classes().get(tag)
+    if cls is None or not args:
+        raise ValueError(f'unexpected node {tag!r} in stored expression')
+    return cls(*(decode_expression(arg) for arg in args))
+
+
+class ExpressionStore:
+    """
+    Almacén SQLite de expresiones ya analizadas, simplificadas y derivadas
+    (posición, velocidad y aceleración) por ecuación canónica y política de
+    simplificación. Un proceso recién arrancado (o un worker de gunicorn
+    nuevo) carga de aquí las expresiones que otro ya compiló, y solo tiene que
+    generar sus funciones numpy con lambdify, sin analizar ni simplificar.
+    El fichero usa el modo WAL, de modo que varios procesos pueden leer y
+    escribir a la vez; cada hilo abre su propia conexión. Las entradas se
+    guardan como árboles JSON (encode_expression), ligadas a la versión de
+    SymPy que las generó, y se leen sin evaluar texto. Cualquier
+    error de la base de datos solo se registra: el almacén es una
+    optimización y la compilación sigue funcionando sin él.
+    """
+
+    def __init__(self, path=EXPR_STORE_PATH, max_bytes=int(EXPR_STORE_MB * 2 ** 20)):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._local = threading.local()  # Conexión de cada hilo, con el pid que la abrió
+        self._lock = threading.Lock()  # Protege los contadores
+        self._disabled = not path  # Se desactiva también si no se puede abrir el fichero
+        self.hits = 0  # Expresiones cargadas del almacén
+        self.misses = 0  # Expresiones que no estaban en el almacén
+        self.writes = 0  # Expresiones guardadas por este proceso
+        self.evictions = 0  # Entradas descartadas por este proceso al superar el tamaño máximo
+        self.errors = 0  # Errores de la base de datos
+
+    @property
+    def enabled(self):
+        """Indica si el almacén está configurado y se pudo abrir."""
+        return not self._disabled
+
+    def _connection(self):
+        """
+        Devuelve la conexión del hilo actual, abriéndola (y creando el esquema)
+        si no existe o si se heredó de otro proceso con fork.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=EXPR_STORE_TIMEOUT, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(_SCHEMA)
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _failed(self, action, error):
+        """Registra un error de la base de datos; si no se puede abrir el fichero, desactiva el almacén."""
+        with self._lock:
+            self.errors += 1
+        logging.warning(f"Expression store {action} failed ({self.path}): {str(error)}")
+        if isinstance(error, OSError) or 'unable to open' in str(error):
+            self._disabled = True
+
+    @staticmethod
+    def key(equation, simplify_mode):
+        """Clave de una ecuación canónica con una política de simplificación."""
+        text = f'{STORE_FORMAT}\0{sp.__version__}\0{simplify_mode}\0{equation}'
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def load_many(self, equations, simplify_mode):
+        """
+        Devuelve {ecuación canónica: (posición, velocidad, aceleración)} con las
+        ecuaciones de `equations` que están en el almacén, y marca su uso.
+        """
+        if self._disabled or not equations:
+            return {}
+        keys = {self.key(eq, simplify_mode): eq for eq in equations}
+        try:
+            conn = self._connection()
+            placeholders = ','.join('?' * len(keys))
+            rows = conn.execute(f'SELECT key, payload FROM expressions WHERE key IN ({placeholders})', tuple(keys)).fetchall()
+            if rows:
+                conn.execute(f'UPDATE expressions SET last_used = ? WHERE key IN ({",".join("?" * len(rows))})',
+                             (time.time(),) + tuple(key for key, _ in rows))
+        except (sqlite3.Error, OSError) as e:
+            self._failed('read', e)
+            return {}
+
+        loaded = {}
+        for key, payload in rows:
+            try:
+                loaded[keys[key]] = tuple(decode_expression(node) for node in json.loads(payload))
+            except Exception as e:  # Entrada dañada: se vuelve a compilar y se sobrescribe
+                logging.warning(f"Discarding unreadable stored expression for {keys[key]}: {str(e)}")
+        with self._lock:
+            self.hits += len(loaded)
+            self.misses += len(keys) - len(loaded)
+        return loaded
+
+    def save(self, equation, simplify_mode, exprs):
+        """
+        Guarda las expresiones de una ecuación y descarta las entradas menos
+        usadas si el almacén supera max_bytes. La escritura y el descarte se
+        hacen en una sola transacción con bloqueo de escritura (BEGIN IMMEDIATE),
+        así que los escritores concurrentes se esperan en lugar de mezclarse.
+        """
+        if self._disabled:
+            return
+        try:
+            trees = [encode_expression(expr) for expr in exprs]
+            if any(decode_expression(tree) != expr for tree, expr in zip(trees, exprs)):
+                raise ValueError('the stored form does not reproduce the expression')
+            payload = json.dumps(trees)
+        except (ValueError, TypeError, RecursionError) as e:  # Se sigue compilando cada vez, sin almacén
+            logging.debug(f"Not storing expressions for {equation}: {str(e)}")
+            return
+        now = time.time()
+        try:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute('INSERT OR REPLACE INTO expressions (key, equation, simplify, payload, size, created, last_used) '
+                             'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (self.key(equation, simplify_mode), equation, simplify_mode, payload, len(payload), now, now))
+                evicted = self._evict(conn)
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        except (sqlite3.Error, OSError) as e:
+            self._failed('write', e)
+            return
+        with self._lock:
+            self.writes += 1
+            self.evictions += evicted
+
+    def _evict(self, conn):
+        """Descarta las entradas menos usadas que no caben en max_bytes; devuelve cuántas."""
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM expressions').fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        return conn.execute('''
+            DELETE FROM expressions WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS kept FROM expressions
+                ) WHERE kept > ?
+            )''', (self.max_bytes,)).rowcount
+
+    def stats(self):
+        """Devuelve los contadores del proceso y el tamaño actual del almacén."""
+        with self._lock:
+            stats = {'enabled': self.enabled, 'hits': self.hits, 'misses': self.misses, 'writes': self.writes,
+                     'evictions': self.evictions, 'errors': self.errors, 'max_bytes': self.max_bytes}
+        if self.enabled:
+            try:
+                stats['size'], stats['bytes'] = self._connection().execute(
+                    'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM expressions').fetchone()
+            except (sqlite3.Error, OSError) as e:
+                self._failed('read', e)
+        return stats
+
+    def clear(self):
+        """Borra todas las entradas del almacén (de todos los procesos)."""
+        if self._disabled:
+            return
+        try:
+            self._connection().execute('DELETE FROM expressions')
+        except (sqlite3.Error, OSError) as e:
+            self._failed('write', e)
+
+
+# Almacén compartido por todos los procesos que usan la misma ruta
+expression_store = ExpressionStore()
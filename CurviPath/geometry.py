@@ -0,0 +1,85 @@
+# Magnitudes de geometría diferencial calculadas sobre las series evaluadas
+import numpy as np  # Biblioteca para cálculos numéricos
+from evaluation import evaluate_jerk  # Evaluación de la tercera derivada
+
+
+def _vectors(components, evaluated, kind):
+    """
+    Agrupa las series de un tipo ('eq', 'v' o 'a') en una matriz n × 3; las
+    componentes ausentes de la función vectorial valen 0.
+    """
+    n = len(next(iter(evaluated.values()))[0])
+    present = {name: evaluated[f'{name}_{kind}'][0] for name, _ in components}
+    return np.column_stack([present.get(name, np.zeros(n)) for name in ('x', 'y', 'z')])
+
+
+def cumulative_arc_length(t_vals, speed):
+    """Longitud de arco acumulada desde t_vals[0] por la regla del trapecio (admite mallas no uniformes)."""
+    arc = np.zeros(len(t_vals))
+    if len(t_vals) > 1:
+        arc[1:] = np.cumsum(np.diff(t_vals) * (speed[:-1] + speed[1:]) / 2)
+    return arc
+
+
+def geometry_series(components, t_vals, evaluated, params=None):
+    """
+    Calcula, con operaciones vectorizadas sobre la velocidad y la aceleración
+    exactas ya evaluadas (y la tercera derivada para la torsión):
+    - 'speed': rapidez |v|
+    - 'arc_length': longitud de arco acumulada
+    - 'curvature': κ = |v × a| / |v|³
+    - 'torsion': τ = (v × a) · j / |v × a|²
+    - 'a_t', 'a_n': aceleración tangencial y normal
+    - 'T_x'...'B_z': componentes del triedro de Frenet (tangente, normal y binormal unitarios)
+    `components` es la lista de pares (nombre, CompiledExpression) y `evaluated`
+    el diccionario devuelto por evaluate_vector_function con los parámetros
+    `params`. Los puntos donde una magnitud no está definida (velocidad nula,
+    recta) valen NaN.
+    """
+    vel = _vectors(components, evaluated, 'v')
+    acc = _vectors(components, evaluated, 'a')
+    compiled = dict(components)
+    jerk = np.column_stack([
+        evaluate_jerk(compiled[name], t_vals, params) if name in compiled else np.zeros(len(t_vals))
+        for name in ('x', 'y', 'z')
+    ])
+    return frenet_series(t_vals, vel, acc, jerk)
+
+
+def planar_geometry_series(t_vals, series):
+    """
+    Magnitudes de geometry_series de una trayectoria en forma cerrada, cuyas
+    series {'x_v', 'x_a', 'y_v', ...} describen un movimiento en el plano xy:
+    la tercera derivada también está en el plano, así que la torsión es nula.
+    """
+    n = len(t_vals)
+    vel = np.column_stack([series.get(f'{name}_v', np.zeros(n)) for name in ('x', 'y', 'z')])
+    acc = np.column_stack([series.get(f'{name}_a', np.zeros(n)) for name in ('x', 'y', 'z')])
+    return frenet_series(t_vals, vel, acc, np.zeros((n, 3)))
+
+
+def frenet_series(t_vals, vel, acc, jerk):
+    """Magnitudes de geometry_series a partir de las matrices n × 3 de velocidad, aceleración y tercera derivada."""
+    with np.errstate(all='ignore'):
+        speed = np.linalg.norm(vel, axis=1)
+        cross = np.cross(vel, acc)
+        cross_norm = np.linalg.norm(cross, axis=1)
+        moving = speed > 0
+        bending = cross_norm > 0
+
+        tangent = np.where(moving[:, None], vel / speed[:, None], np.nan)
+        binormal = np.where(bending[:, None], cross / cross_norm[:, None], np.nan)
+        normal = np.cross(binormal, tangent)
+
+        metrics = {
+            'speed': speed,
+            'arc_length': cumulative_arc_length(t_vals, np.nan_to_num(speed)),
+            'curvature': np.where(moving, cross_norm / speed ** 3, np.nan),
+            'torsion': np.where(bending, np.sum(cross * jerk, axis=1) / cross_norm ** 2, np.nan),
+            'a_t': np.where(moving, np.sum(vel * acc, axis=1) / speed, np.nan),
+            'a_n': np.where(moving, cross_norm / speed, np.nan),
+        }
+        for label, frame in (('T', tangent), ('N', normal), ('B', binormal)):
+            for i, name in enumerate(('x', 'y', 'z')):
+                metrics[f'{label}_{name}'] = frame[:, i]
+    return metrics
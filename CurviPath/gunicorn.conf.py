@@ -0,0 +1,55 @@
+# Configuración de producción para gunicorn: gunicorn -c gunicorn.conf.py app:app
+import os  # Acceso a variables de entorno del sistema operativo
+import multiprocessing  # Número de núcleos disponibles
+
+# Dirección de escucha (mismo PORT que main.py)
+bind = os.environ.get('CURVIPATH_BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+
+# Procesos worker: las peticiones de SymPy usan CPU y el GIL limita cada proceso a un núcleo
+workers = int(os.environ.get('CURVIPATH_WORKERS', multiprocessing.cpu_count()))
+
+# Procesos de compilación aislados de cada worker (compiler.COMPILE_WORKERS, unos 50 MB
+# cada uno con SymPy): por defecto se reparten los núcleos entre los workers, uno por
+# worker con la configuración por defecto, en lugar de crear tantos como núcleos en
+# cada worker (núcleos² procesos). Se fija antes de que preload_app importe la aplicación.
+os.environ.setdefault('CURVIPATH_COMPILE_WORKERS', str(max(1, multiprocessing.cpu_count() // max(1, workers))))
+
+# Hilos por worker, para que las peticiones ligeras no esperen a las que compilan
+worker_class = 'gthread'
+threads = int(os.environ.get('CURVIPATH_THREADS', 4))
+
+# Carga la aplicación (y la precalienta) en el proceso maestro antes de crear los
+# workers, que comparten SymPy, el registro de fórmulas y la caché de expresiones
+# por copia en escritura en lugar de cargarlos cada uno
+preload_app = True
+
+# Reinicia cada worker tras atender este número de peticiones (0 lo desactiva) para
+# acotar el crecimiento de memoria de las cachés internas de SymPy; el margen
+# aleatorio evita que todos los workers se reinicien a la vez
+max_requests = int(os.environ.get('CURVIPATH_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('CURVIPATH_MAX_REQUESTS_JITTER', max_requests // 10))
+
+# Tiempo máximo (segundos) de una petición antes de reiniciar el worker, y de espera
+# a que termine las peticiones en curso al reiniciarlo
+timeout = int(os.environ.get('CURVIPATH_TIMEOUT', 120))
+graceful_timeout = int(os.environ.get('CURVIPATH_GRACEFUL_TIMEOUT', 30))
+
+# Los módulos de la aplicación se importan por nombre desde este directorio
+chdir = os.path.dirname(os.path.abspath(__file__))
+pythonpath = chdir
+
+loglevel = os.environ.get('CURVIPATH_LOG_LEVEL', 'info')
+accesslog = '-'
+
+
+def when_ready(server):
+    """Precalienta el proceso maestro antes de crear los workers (si CURVIPATH_WARMUP no es '0')."""
+    from warmup import warm_up, WARMUP_ENABLED
+    if WARMUP_ENABLED:
+        warm_up()
+
+
+def post_fork(server, worker):
+    """Arranca los procesos de compilación aislados de cada worker sin esperar a la primera petición."""
+    from compiler import start_compile_workers
+    start_compile_workers()
@@ -0,0 +1,193 @@
+# Integración numérica de leyes de aceleración (trayectorias sin forma cerrada)
+import os  # Acceso a variables de entorno del sistema operativo
+import numpy as np  # Biblioteca para cálculos numéricos
+from lazy import LazyModule  # Importación diferida de SymPy
+from compiler import time_symbol, parameter_symbols, expression_cache  # Símbolo de tiempo y caché de expresiones
+from metrics import timed  # Tiempos por etapa
+
+# Biblioteca para cálculos simbólicos, importada al compilar el primer sistema
+sp = LazyModule('sympy')
+
+# Métodos de integración disponibles:
+# - 'rk4': Runge-Kutta clásico de paso fijo (`substeps` pasos por intervalo de salida)
+# - 'rk45': Dormand-Prince 5(4) con paso adaptativo según rtol y atol
+INTEGRATION_METHODS = ('rk4', 'rk45')
+
+# Coordenadas y nombres de las velocidades que pueden usar las leyes de aceleración
+COORDINATES = ('x', 'y', 'z')
+VELOCITY_NAMES = ('v_x', 'v_y', 'v_z')
+
+# Tolerancias por defecto de 'rk45'
+INTEGRATION_RTOL = float(os.environ.get('CURVIPATH_INTEGRATION_RTOL', 1e-6))
+INTEGRATION_ATOL = float(os.environ.get('CURVIPATH_INTEGRATION_ATOL', 1e-9))
+
+# Número máximo de pasos (aceptados y rechazados) de una integración con 'rk45'
+INTEGRATION_MAX_STEPS = int(os.environ.get('CURVIPATH_INTEGRATION_MAX_STEPS', 100000))
+
+# Tablero de Butcher de Dormand-Prince: nodos, coeficientes y pesos de orden 5 y 4
+_DP_C = (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0)
+_DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_DP_B5 = np.array((35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0))
+_DP_B4 = np.array((5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40))
+_DP_E = _DP_B5 - _DP_B4  # Pesos del estimador del error local
+
+
+class IntegrationError(ValueError):
+    """La integración necesitó más pasos de los permitidos."""
+
+
+class ODESystem:
+    """
+    Sistema x'' = a(t, x, v) compilado en una sola función numpy vectorizada
+    (con eliminación de subexpresiones comunes) a partir de las leyes de
+    aceleración de algunas componentes. El estado es siempre tridimensional:
+    las componentes sin ley tienen aceleración nula. Las leyes pueden usar t,
+    las coordenadas x, y, z, las velocidades v_x, v_y, v_z y parámetros.
+    """
+
+    def __init__(self, components):
+        self.names = tuple(name for name, _ in components)  # Componentes con ley de aceleración, en orden
+        self._axes = tuple(COORDINATES.index(name) for name in self.names)
+        exprs = [compiled.exprs[0] for _, compiled in components]
+        state = [sp.Symbol(name) for name in COORDINATES + VELOCITY_NAMES]
+        symbols = [sym for sym in parameter_symbols(exprs) if sym not in state]
+        self.params = tuple(sym.name for sym in symbols)  # Nombres de los parámetros, en orden
+        self._func = sp.lambdify([time_symbol()] + state + symbols, exprs, 'numpy', cse=True)
+
+    def acceleration(self, t, pos, vel, args):
+        """
+        Aceleración de todos los estados: `pos` y `vel` tienen forma (n, 3) y
+        `t` es un escalar o un arreglo de n tiempos. Devuelve un arreglo (n, 3).
+        """
+        acc = np.zeros(pos.shape)
+        values = self._func(t, *pos.T, *vel.T, *args)
+        for axis, value in zip(self._axes, values):
+            acc[:, axis] = value  # Las leyes constantes se expanden a todos los estados
+        return acc
+
+    def derivative(self, t, state, args):
+        """Derivada del estado (n, 6) = [posición, velocidad]: [velocidad, aceleración]."""
+        return np.concatenate((state[:, 3:], self.acceleration(t, state[:, :3], state[:, 3:], args)), axis=1)
+
+
+def get_or_build_system(components):
+    """Devuelve el sistema compilado de una lista de pares (nombre, CompiledExpression), usando la caché de expresiones."""
+    key = ('ode',) + tuple((name, compiled.key) for name, compiled in components)
+    system = expression_cache.get(key)
+    if system is None:
+        with timed('kernel'):
+            system = expression_cache.put(key, ODESystem(components))
+    return system
+
+
+def rk4(system, t_vals, state, args, substeps=1):
+    """
+    Integra con Runge-Kutta clásico de paso fijo, `substeps` pasos por
+    intervalo de `t_vals`, todos los estados a la vez. Devuelve un arreglo
+    (len(t_vals), n, 6) con el estado en cada instante de salida.
+    """
+    f = system.derivative
+    states = np.empty((len(t_vals),) + state.shape)
+    states[0] = state
+    for i in range(1, len(t_vals)):
+        t, h = t_vals[i - 1], (t_vals[i] - t_vals[i - 1]) / substeps
+        for _ in range(substeps):
+            k1 = f(t, state, args)
+            k2 = f(t + h / 2, state + h / 2 * k1, args)
+            k3 = f(t + h / 2, state + h / 2 * k2, args)
+            k4 = f(t + h, state + h * k3, args)
+            state = state + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            t += h
+        states[i] = state
+    return states, {'steps': (len(t_vals) - 1) * substeps}
+
+
+def rk45(system, t_vals, state, args, rtol=INTEGRATION_RTOL, atol=INTEGRATION_ATOL):
+    """
+    Integra con Dormand-Prince 5(4) de paso adaptativo todos los estados a
+    la vez: el paso es común y se ajusta al estado con mayor error relativo,
+    y se acorta para caer exactamente en cada instante de `t_vals`. Los
+    estados que dejan de ser finitos no intervienen en el control del paso, y
+    los que obligan a un paso despreciable (divergen en tiempo finito o el
+    sistema es demasiado rígido para un método explícito) se marcan como NaN
+    desde ese instante ('diverged') para que no detengan a los demás.
+    Devuelve un arreglo (len(t_vals), n, 6) y los pasos aceptados y rechazados.
+    Lanza IntegrationError si se superan INTEGRATION_MAX_STEPS pasos.
+    """
+    f = system.derivative
+    states = np.empty((len(t_vals),) + state.shape)
+    states[0] = state
+    t = t_vals[0]
+    h = (t_vals[-1] - t_vals[0]) / max(len(t_vals) - 1, 1)  # Paso inicial: el intervalo de salida
+    k1 = f(t, state, args)
+    accepted = rejected = diverged = 0
+    for i in range(1, len(t_vals)):
+        while t < t_vals[i]:
+            if accepted + rejected >= INTEGRATION_MAX_STEPS:
+                raise IntegrationError(f'the integration needed more than {INTEGRATION_MAX_STEPS} steps; '
+                                       'relax rtol/atol or reduce the time range')
+            last = h >= t_vals[i] - t  # El paso llega al instante de salida
+            step = t_vals[i] - t if last else h
+            ks = [k1]
+            for c, a in zip(_DP_C[1:], _DP_A[1:]):
+                ks.append(f(t + c * step, state + step * sum(coef * k for coef, k in zip(a, ks)), args))
+            new_state = state + step * sum(b * k for b, k in zip(_DP_B5, ks) if b)
+            error = step * sum(e * k for e, k in zip(_DP_E, ks) if e)
+            scale = atol + rtol * np.maximum(np.abs(state), np.abs(new_state))
+            norms = np.sqrt(np.mean((error / scale) ** 2, axis=1))  # Error relativo de cada estado
+            finite = np.isfinite(norms)
+            err = norms[finite].max() if finite.any() else 0.0
+            if err <= 1.0:
+                t = t_vals[i] if last else t + step
+                state, k1 = new_state, ks[-1]  # El último nodo es el primero del paso siguiente (FSAL)
+                accepted += 1
+            else:
+                rejected += 1
+            h = step * (min(5.0, max(0.2, 0.9 * err ** -0.2)) if err > 0 else 5.0)
+            if h <= 1e-12 * max(1.0, abs(t)):
+                diverging = finite & (norms >= 0.1 * err)  # Los estados que imponen el paso
+                state = state.copy()
+                state[diverging] = np.nan
+                k1 = f(t, state, args)
+                diverged += int(diverging.sum())
+                h = (t_vals[-1] - t_vals[0]) / max(len(t_vals) - 1, 1)
+        states[i] = state
+    return states, {'steps': accepted, 'rejected_steps': rejected, 'diverged': diverged}
+
+
+def integrate(system, t_vals, initial, args, method='rk45', substeps=1, rtol=INTEGRATION_RTOL, atol=INTEGRATION_ATOL):
+    """
+    Integra `system` desde t_vals[0] para cada estado inicial de `initial`
+    (arreglo (n, 6): x, y, z, v_x, v_y, v_z) y evalúa la aceleración en los
+    instantes de salida. Devuelve ({f'{componente}_{eq|v|a}_{k}': serie},
+    estadísticas), con k = 1..n y solo las componentes con ley de
+    aceleración, igual que las series de /get_data.
+    """
+    with timed('integrate'), np.errstate(all='ignore'):
+        if method == 'rk4':
+            states, stats = rk4(system, t_vals, initial, args, substeps)
+        else:
+            states, stats = rk45(system, t_vals, initial, args, rtol, atol)
+    points, count = states.shape[:2]
+    with timed('evaluate'), np.errstate(all='ignore'):
+        flat = states.reshape(points * count, 6)
+        acc = system.acceleration(np.repeat(t_vals, count), flat[:, :3], flat[:, 3:], args).reshape(points, count, 3)
+
+    series = {}
+    for axis, name in enumerate(COORDINATES):
+        if name not in system.names:
+            continue
+        for k in range(count):
+            for kind, values in (('eq', states[:, k, axis]), ('v', states[:, k, 3 + axis]), ('a', acc[:, k, axis])):
+                values = np.array(values, dtype=np.float64)
+                values[~np.isfinite(values)] = np.nan
+                series[f'{name}_{kind}_{k + 1}'] = values
+    return series, stats
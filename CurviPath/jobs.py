@@ -0,0 +1,291 @@
+# Trabajos asíncronos: cálculos largos de /get_data que se consultan por sondeo o por Server-Sent Events
+import os  # Acceso a variables de entorno del sistema operativo
+import time  # Caducidad de los trabajos
+import uuid  # Identificadores de los trabajos
+import logging  # Registro de eventos y errores
+import threading  # Bloqueos y condiciones para los eventos de progreso
+import collections  # Trabajos en orden de creación
+from concurrent.futures import ThreadPoolExecutor  # Hilos que ejecutan los trabajos
+from pipeline import Computation, PipelineError  # Cálculo de /get_data
+from downsampling import downsample_arrays  # Reducción de las series para dibujarlas
+from metrics import metrics, start_request, current_timings, end_request  # Tiempos por etapa y métricas
+
+# Hilos que ejecutan trabajos a la vez; el resto espera en cola
+JOB_WORKERS = int(os.environ.get('CURVIPATH_JOB_WORKERS', 2))
+
+# Segundos que se conservan los resultados de un trabajo terminado
+JOB_TTL = float(os.environ.get('CURVIPATH_JOB_TTL', 600))
+
+# Número máximo de trabajos guardados (en cola, en curso o terminados)
+JOB_MAX_JOBS = int(os.environ.get('CURVIPATH_JOB_MAX_JOBS', 100))
+
+# Memoria máxima (MB) de las series guardadas de todos los trabajos
+JOB_MAX_MEMORY = int(os.environ.get('CURVIPATH_JOB_MAX_MEMORY', 512))
+
+# Etapas de un trabajo, en orden
+JOB_STAGES = ('queued', 'compile', 'solve', 'sampling', 'evaluate', 'done')
+
+# Estados finales de un trabajo
+FINISHED = ('done', 'error', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """El trabajo se canceló mientras se ejecutaba."""
+
+
+class Job:
+    """
+    Un cálculo de /get_data ejecutado en segundo plano. Guarda las series de
+    cada curva en cuanto termina y una lista de eventos numerados (etapa,
+    curva, fin o error) que los clientes leen con wait_events.
+    """
+
+    def __init__(self, options):
+        self.id = uuid.uuid4().hex  # Identificador público
+        self.options = options  # Opciones validadas con pipeline.parse_options
+        self.status = 'queued'  # queued, running, done, error o cancelled
+        self.stage = 'queued'  # Etapa actual (ver JOB_STAGES)
+        self.created = time.time()  # Momento de creación
+        self.finished = None  # Momento en que terminó (time.monotonic), para la caducidad
+        self.computation = None  # pipeline.Computation, tras compilar
+        self.t_vals = None  # Malla temporal
+        self.curves = collections.OrderedDict()  # Etiqueta de la curva -> series
+        self.invalid_points = {}  # Puntos sin valor real por serie
+        self.total_curves = None  # Número de curvas, conocido tras compilar
+        self.error = None  # Cuerpo JSON del error
+        self.error_status = None  # Código HTTP del error
+        self.timings = None  # Duración de cada etapa (metrics.RequestTimings)
+        self.nbytes = 0  # Memoria de las series guardadas
+        self.cancelled = False  # Se pidió cancelar el trabajo
+        self.events = []  # Eventos (tipo, datos); el número de cada uno es su posición + 1
+        self.condition = threading.Condition()  # Avisa de nuevos eventos
+
+    def emit(self, kind, **data):
+        """Añade un evento y despierta a los clientes que esperan."""
+        with self.condition:
+            self.events.append((kind, data))
+            self.condition.notify_all()
+
+    def wait_events(self, after, timeout):
+        """
+        Espera hasta `timeout` segundos a que haya eventos posteriores al
+        número `after`. Devuelve la lista de (número, tipo, datos) nuevos y si
+        el trabajo ya terminó.
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: len(self.events) > after or self.status in FINISHED, timeout)
+            return [(seq, kind, data) for seq, (kind, data) in enumerate(self.events[after:], start=after + 1)], \
+                self.status in FINISHED
+
+    def progress(self):
+        """Fracción de curvas evaluadas (0 antes de evaluar, 1 al terminar)."""
+        if self.status == 'done':
+            return 1.0
+        if not self.total_curves:
+            return 0.0
+        return len(self.curves) / self.total_curves
+
+    def describe(self):
+        """Estado del trabajo en formato JSON."""
+        info = {
+            'id': self.id,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': round(self.progress(), 4),
+            'curves_total': self.total_curves,
+            'curves_done': list(self.curves),
+            'created': self.created,
+            'result_bytes': self.nbytes,
+        }
+        if self.timings is not None:
+            info['stages_ms'] = {stage: round(seconds * 1000, 3) for stage, seconds in dict(self.timings.stages).items()}
+        if self.error is not None:
+            info.update(self.error, error_status=self.error_status)
+        return info
+
+    def result(self, labels=None, partial=False):
+        """
+        Series y datos de la respuesta de /get_data con las curvas ya
+        evaluadas (solo las de `labels`, si se indican). Con `partial`, los
+        datos incluyen 'partial' y las curvas incluidas en 'curves_done'.
+        Con max_points, las series se reducen al devolverlas; el trabajo
+        conserva las completas. Devuelve (arrays, results).
+        """
+        curves = [(label, series) for label, series in list(self.curves.items()) if labels is None or label in labels]
+        results = dict(self.computation.results, sampling=self.options['sampling'])
+        arrays = {'t': self.t_vals}
+        invalid_points = {}
+        for _, series in curves:
+            arrays.update(series)
+            invalid_points.update({key: count for key, count in dict(self.invalid_points).items() if key in series})
+        results['invalid_points'] = invalid_points
+        done = {label for label, _ in curves}
+        if 'arc_length' in results:
+            results['arc_length'] = {label: value for label, value in dict(results['arc_length']).items() if label in done}
+        if 'events' in results:
+            results['events'] = [event for event in list(results['events']) if event['curve'] in done]
+        if partial:
+            results.update(partial=True, curves_done=[label for label, _ in curves])
+        if self.options['max_points']:
+            arrays, downsampling = downsample_arrays(arrays, self.options['max_points'])
+            if downsampling is not None:
+                results['downsampling'] = downsampling
+        return arrays, results
+
+
+class JobStore:
+    """
+    Trabajos del proceso, seguros entre hilos. Los trabajos terminados se
+    descartan JOB_TTL segundos después de terminar o, antes, si hace falta
+    sitio para uno nuevo o memoria para las series de otro (primero los más
+    antiguos). Con varios workers de gunicorn cada proceso tiene los suyos.
+    """
+
+    def __init__(self, max_jobs=JOB_MAX_JOBS, max_bytes=JOB_MAX_MEMORY * 2 ** 20, ttl=JOB_TTL, workers=JOB_WORKERS):
+        self.max_jobs = max_jobs
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.workers = workers
+        self._jobs = collections.OrderedDict()  # Identificador -> Job, del más antiguo al más reciente
+        self._futures = {}  # Identificador -> Future de los trabajos en cola o en curso
+        self._executor = None  # ThreadPoolExecutor, creado con el primer trabajo
+        self._lock = threading.Lock()
+
+    def _purge(self, now):
+        """Descarta los trabajos terminados que caducaron (con el bloqueo tomado)."""
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished is not None and now - job.finished > self.ttl]:
+            del self._jobs[job_id]
+
+    def _evict_one(self, keep=None):
+        """Descarta el trabajo terminado más antiguo salvo `keep`; devuelve False si no hay ninguno."""
+        for job_id, job in self._jobs.items():
+            if job.status in FINISHED and job is not keep:
+                del self._jobs[job_id]
+                return True
+        return False
+
+    def submit(self, options):
+        """
+        Crea un trabajo con las opciones de pipeline.parse_options y lo pone en
+        cola. Lanza PipelineError (503) si no queda sitio.
+        """
+        job = Job(options)
+        with self._lock:
+            self._purge(time.monotonic())
+            while len(self._jobs) >= self.max_jobs and self._evict_one():
+                pass
+            if len(self._jobs) >= self.max_jobs:
+                raise PipelineError(f'Too many jobs in progress (at most {self.max_jobs}); try again later', 503)
+            self._jobs[job.id] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='curvipath-job')
+            self._futures[job.id] = self._executor.submit(self._run, job)
+        metrics.inc('curvipath_jobs_total', status='submitted')
+        return job
+
+    def get(self, job_id):
+        """Devuelve el trabajo `job_id`, o None si no existe o caducó."""
+        with self._lock:
+            self._purge(time.monotonic())
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Cancela el trabajo (si no terminó) y lo descarta con sus resultados.
+        Un trabajo en curso se detiene al terminar la curva que está evaluando.
+        Devuelve el trabajo, o None si no existe.
+        """
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            future = self._futures.get(job_id)
+        if job is None:
+            return None
+        job.cancelled = True
+        if future is not None and future.cancel():
+            self._finish(job, 'cancelled')
+        return job
+
+    def _reserve(self, job, nbytes):
+        """
+        Suma `nbytes` a la memoria del trabajo, descartando trabajos terminados
+        si hace falta. Lanza PipelineError (413) si las series no caben.
+        """
+        with self._lock:
+            while self._total_bytes() + nbytes > self.max_bytes and self._evict_one(keep=job):
+                pass
+            if self._total_bytes() + nbytes > self.max_bytes:
+                raise PipelineError(f'The results exceed the job memory budget ({self.max_bytes // 2 ** 20} MB)', 413)
+            job.nbytes += nbytes
+
+    def _total_bytes(self):
+        """Memoria de las series de todos los trabajos guardados (con el bloqueo tomado)."""
+        return sum(job.nbytes for job in self._jobs.values())
+
+    def _finish(self, job, status, error=None, error_status=None):
+        """
+        Marca el trabajo como terminado y emite el evento final ('done',
+        'error' o 'cancelled') con el mismo bloqueo, para que ningún cliente
+        vea el trabajo terminado sin su último evento.
+        """
+        with self._lock:
+            self._futures.pop(job.id, None)
+        with job.condition:
+            if error is not None:
+                job.error, job.error_status = error, error_status
+                job.curves.clear()  # Un trabajo fallido no conserva resultados parciales
+                job.nbytes = 0
+            job.status = status
+            if status == 'done':
+                job.stage = 'done'
+            job.finished = time.monotonic()
+            job.emit(status, **job.describe())
+        metrics.inc('curvipath_jobs_total', status=status)
+
+    def _stage(self, job, stage):
+        """Pasa el trabajo a la etapa `stage` y emite su evento."""
+        if job.cancelled:
+            raise JobCancelled()
+        job.stage = stage
+        job.emit('stage', stage=stage, progress=round(job.progress(), 4))
+
+    def _run(self, job):
+        """Ejecuta el trabajo en un hilo del grupo, curva por curva."""
+        job.status = 'running'
+        job.timings = start_request()  # Tiempos por etapa del trabajo, como en Server-Timing
+        try:
+            self._stage(job, 'compile')
+            job.computation = computation = Computation(job.options)
+            job.total_curves = len(computation.curves())
+            if job.options['solve_for'] and job.options['exercise_type']:
+                self._stage(job, 'solve')
+                computation.solve()
+            self._stage(job, 'sampling')
+            job.t_vals = computation.time_grid()
+            self._reserve(job, job.t_vals.nbytes)
+            self._stage(job, 'evaluate')
+            for label in computation.curves():
+                if job.cancelled:
+                    raise JobCancelled()
+                arrays = {}
+                computation.evaluate_function(label, job.t_vals, arrays, job.invalid_points)
+                self._reserve(job, sum(values.nbytes for values in arrays.values()))
+                job.curves[label] = arrays
+                job.emit('curve', curve=label, curves_done=len(job.curves), curves_total=job.total_curves,
+                         progress=round(job.progress(), 4))
+        except JobCancelled:
+            self._finish(job, 'cancelled')
+        except PipelineError as e:
+            self._finish(job, 'error', e.payload, e.status)
+        except Exception as e:
+            logging.exception(f"Job {job.id} failed")
+            self._finish(job, 'error', {'error': f'Internal error: {str(e)}'}, 500)
+        else:
+            self._finish(job, 'done')
+        finally:
+            if current_timings() is job.timings:
+                end_request()
+
+
+# Trabajos del proceso
+job_store = JobStore()
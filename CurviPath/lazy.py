@@ -0,0 +1,34 @@
+# Importación diferida de bibliotecas pesadas (SymPy) para acelerar el arranque de los procesos
+import os  # Acceso a variables de entorno del sistema operativo
+import importlib  # Importación de módulos por nombre
+
+# Si es '0', los módulos diferidos se importan en el acto, como una importación normal
+LAZY_IMPORTS = os.environ.get('CURVIPATH_LAZY_IMPORTS', '1') != '0'
+
+
+class LazyModule:
+    """
+    Módulo que se importa la primera vez que se accede a uno de sus atributos
+    (sp.Symbol, sp.lambdify...). Importar SymPy cuesta unos segundos y decenas
+    de MB por proceso; así solo lo pagan los procesos que compilan ecuaciones,
+    o el precalentamiento explícito (warmup.warm_up). La importación usa el
+    bloqueo por módulo de importlib, por lo que es segura entre hilos.
+    """
+
+    def __init__(self, name):
+        self._name = name  # Nombre completo del módulo
+        self._module = importlib.import_module(name) if not LAZY_IMPORTS else None
+
+    def load(self):
+        """Importa el módulo si aún no se importó y lo devuelve."""
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self):
+        """Indica si el módulo ya se importó."""
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
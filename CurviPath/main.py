@@ -1,8 +1,18 @@
 import os
 from app import app
+from warmup import warm_up, WARMUP_ENABLED
+from compiler import start_compile_workers
 
 if __name__ == '__main__':
     # Get port from environment variable or use default 5000
     port = int(os.environ.get('PORT', 5000))
+    # Debug mode (Werkzeug debugger and reloader) only on request: the reloader
+    # starts a second process that imports everything again
+    debug = os.environ.get('CURVIPATH_DEBUG', '0') == '1'
+    # Load SymPy and precompile the common equations before accepting requests
+    if WARMUP_ENABLED and not (debug and os.environ.get('WERKZEUG_RUN_MAIN') != 'true'):
+        warm_up()
+        # Start the sandboxed compile workers (they import SymPy on startup)
+        start_compile_workers()
     # Run the application on 0.0.0.0 to make it externally accessible
-    app.run(host='0.0.0.0', port=port, debug=True)
+    app.run(host='0.0.0.0', port=port, debug=debug)
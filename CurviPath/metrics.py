@@ -0,0 +1,184 @@
+# Medición de tiempos por etapa: cabecera Server-Timing por petición e histogramas en formato Prometheus
+import time  # Reloj de alta resolución para medir las etapas
+import math  # Infinito para el último intervalo de los histogramas
+import threading  # Bloqueo para acumular métricas desde varios hilos
+import contextlib  # Gestor de contexto para medir bloques de código
+import contextvars  # Tiempos de la petición en curso, sin depender de Flask
+
+# Límites superiores (segundos) de los intervalos de los histogramas de latencia
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, math.inf)
+
+# Descripción y tipo de cada métrica, para las líneas HELP y TYPE
+METRIC_HELP = {
+    'curvipath_request_seconds': ('histogram', 'Latencia de las peticiones HTTP por ruta'),
+    'curvipath_stage_seconds': ('histogram', 'Duración de cada etapa del cálculo (parse, simplify, diff, lambdify, evaluate...)'),
+    'curvipath_requests_total': ('counter', 'Peticiones HTTP atendidas por ruta y código de estado'),
+    'curvipath_fallback_points_total': ('counter', 'Puntos evaluados uno a uno porque numpy no pudo evaluar la expresión'),
+    'curvipath_compile_limit_total': ('counter', 'Compilaciones abortadas por los límites de tiempo o memoria'),
+    'curvipath_simplify_timeouts_total': ('counter', 'Simplificaciones abandonadas por agotar el presupuesto de tiempo'),
+    'curvipath_jobs_total': ('counter', 'Trabajos asíncronos creados y terminados, por estado'),
+    'curvipath_expression_cache': ('gauge', 'Contadores de la caché de expresiones compiladas'),
+    'curvipath_expression_cache_hit_ratio': ('gauge', 'Proporción de aciertos de la caché de expresiones compiladas'),
+    'curvipath_response_cache': ('gauge', 'Contadores de la caché de respuestas de /get_data'),
+    'curvipath_expression_store': ('gauge', 'Contadores del almacén persistente de expresiones (tamaño compartido, resto por proceso)'),
+}
+
+
+class Histogram:
+    """Histograma acumulado de duraciones con los intervalos de LATENCY_BUCKETS."""
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)  # Observaciones por intervalo (no acumuladas)
+        self.total = 0.0  # Suma de las duraciones
+        self.count = 0  # Número de observaciones
+
+    def observe(self, value):
+        """Registra una duración en segundos."""
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    Métricas acumuladas del proceso, seguras entre hilos: histogramas de
+    duraciones y contadores, cada uno identificado por su nombre y sus
+    etiquetas. Con varios workers cada proceso tiene las suyas.
+    """
+
+    def __init__(self):
+        self._histograms = {}  # (nombre, etiquetas) -> Histogram
+        self._counters = {}  # (nombre, etiquetas) -> valor
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, **labels):
+        """Añade una duración al histograma `name` con las etiquetas dadas."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        """Incrementa el contador `name` con las etiquetas dadas."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def render(self, gauges=()):
+        """
+        Devuelve todas las métricas en el formato de texto de Prometheus.
+        `gauges` son tuplas (nombre, valor, etiquetas) calculadas en el momento
+        (por ejemplo, el estado de la caché de expresiones).
+        """
+        samples = {}  # Nombre -> líneas de muestras
+        with self._lock:
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                lines = samples.setdefault(name, [])
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, histogram.counts):
+                    cumulative += count
+                    le = '+Inf' if bound == math.inf else repr(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.total!r}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+            for (name, labels), value in sorted(self._counters.items()):
+                samples.setdefault(name, []).append(f"{name}{_format_labels(labels)} {value}")
+        for name, value, labels in gauges:
+            samples.setdefault(name, []).append(f"{name}{_format_labels(tuple(sorted(labels.items())))} {value}")
+
+        output = []
+        for name, lines in samples.items():
+            kind, description = METRIC_HELP.get(name, ('untyped', name))
+            output.append(f"# HELP {name} {description}")
+            output.append(f"# TYPE {name} {kind}")
+            output.extend(lines)
+        return '\n'.join(output) + '\n'
+
+
+def _format_labels(labels):
+    """Da formato a las etiquetas de una muestra: {a="1",b="2"}."""
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + '}'
+
+
+class RequestTimings:
+    """
+    Tiempos acumulados por etapa (y por componente) durante una petición,
+    para la cabecera Server-Timing. Las etapas repetidas se suman.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()  # Inicio de la petición
+        self.stages = {}  # Etapa -> segundos
+        self.components = {}  # (etapa, componente) -> segundos
+
+    def add(self, stage, seconds, component=None):
+        """Suma la duración de una etapa, y de la componente si se indica."""
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        if component is not None:
+            key = (stage, component)
+            self.components[key] = self.components.get(key, 0.0) + seconds
+
+    def header(self):
+        """
+        Valor de la cabecera Server-Timing: una entrada por etapa, otra por
+        etapa y componente ('simplify.x1' es la simplificación de la ecuación x
+        de la función 1) y el total de la petición hasta este momento.
+        """
+        entries = [f'{stage};dur={seconds * 1000:.3f}' for stage, seconds in self.stages.items()]
+        entries += [f'{stage}.{component};dur={seconds * 1000:.3f}'
+                    for (stage, component), seconds in self.components.items()]
+        entries.append(f'total;dur={(time.perf_counter() - self.start) * 1000:.3f}')
+        return ', '.join(entries)
+
+
+# Registro global de métricas del proceso
+metrics = MetricsRegistry()
+
+# Tiempos de la petición en curso (None fuera de una petición)
+_current_timings = contextvars.ContextVar('curvipath_request_timings', default=None)
+
+
+def start_request():
+    """Empieza a medir una petición en el contexto actual y devuelve sus tiempos."""
+    timings = RequestTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def current_timings():
+    """Devuelve los tiempos de la petición en curso, o None."""
+    return _current_timings.get()
+
+
+def end_request():
+    """Deja de medir la petición en curso."""
+    _current_timings.set(None)
+
+
+def record(stage, seconds, component=None):
+    """
+    Registra la duración de una etapa en el histograma del proceso y, dentro
+    de una petición, en sus tiempos para Server-Timing.
+    """
+    metrics.observe('curvipath_stage_seconds', seconds, stage=stage)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds, component)
+
+
+@contextlib.contextmanager
+def timed(stage, component=None):
+    """Mide la duración del bloque y la registra con record()."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - start, component)
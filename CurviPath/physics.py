@@ -0,0 +1,464 @@
+# Registro de fórmulas de los problemas de física (MCU, MCNU, TP y MCG)
+import math  # Funciones matemáticas para evaluar las fórmulas compiladas
+import random  # Casos de prueba para elegir la rama principal al despejar
+import logging  # Registro de eventos y errores
+import functools  # Memorización de las magnitudes de cada tipo de ejercicio
+import threading  # Bloqueo para construir el registro una sola vez
+import numpy as np  # Biblioteca para cálculos numéricos
+from lazy import LazyModule  # Importación diferida de SymPy
+
+# Biblioteca para cálculos simbólicos, importada al construir el registro de fórmulas
+sp = LazyModule('sympy')
+
+# Nombres de todas las magnitudes. Sus símbolos se declaran positivos para que,
+# al despejar, SymPy descarte las raíces negativas (por ejemplo v = √(a_c·r) y no -√(a_c·r)).
+SYMBOL_NAMES = (
+    'r', 'ω', 'v', 'T', 'f', 'a_c', 'θ', 't', 'N',
+    'ω_i', 'ω_f', 'alpha', 'a_t', 'a',
+    'v_0', 'g', 'x', 'y', 'H', 'R', 'v_0x', 'v_0y',
+    'rho',
+)
+
+
+def symbol(name):
+    """Símbolo SymPy (positivo) de una magnitud."""
+    return sp.Symbol(name, positive=True)
+
+
+def relations():
+    """
+    Relaciones de cada tipo de ejercicio, como pares (lado izquierdo, lado derecho).
+    El orden es la prioridad: para cada incógnita se usa la primera relación cuyos
+    datos estén todos presentes y dé un resultado real y finito.
+    """
+    _s = {name: symbol(name) for name in SYMBOL_NAMES}
+    return {
+        'MCU': [
+            (_s['f'] * _s['T'], 1),
+            (_s['θ'], _s['ω'] * _s['t']),
+            (_s['ω'], 2 * sp.pi * _s['f']),
+            (_s['ω'] * _s['T'], 2 * sp.pi),
+            (_s['θ'], 2 * sp.pi * _s['N']),
+            (_s['ω'] * _s['t'], 2 * sp.pi * _s['N']),
+            (_s['v'], _s['ω'] * _s['r']),
+            (_s['a_c'], _s['v'] ** 2 / _s['r']),
+            (_s['v'] * _s['T'], 2 * sp.pi * _s['r']),
+            (_s['v'], 2 * sp.pi * _s['r'] * _s['f']),
+            (_s['a_c'], _s['ω'] ** 2 * _s['r']),
+        ],
+        'MCNU': [
+            (_s['ω_f'], _s['ω_i'] + _s['alpha'] * _s['t']),
+            (_s['θ'], _s['ω_i'] * _s['t'] + _s['alpha'] * _s['t'] ** 2 / 2),
+            (_s['ω_f'] ** 2, _s['ω_i'] ** 2 + 2 * _s['alpha'] * _s['θ']),
+            (_s['a_c'], _s['ω_f'] ** 2 * _s['r']),
+            (_s['a_c'], _s['v'] ** 2 / _s['r']),
+            (_s['a_t'], _s['alpha'] * _s['r']),
+            (_s['a'] ** 2, _s['a_t'] ** 2 + _s['a_c'] ** 2),
+        ],
+        'TP': [
+            (sp.tan(_s['θ']), _s['v_0y'] / _s['v_0x']),
+            (_s['v_0'] ** 2, _s['v_0x'] ** 2 + _s['v_0y'] ** 2),
+            (_s['R'], _s['v_0'] ** 2 * sp.sin(2 * _s['θ']) / _s['g']),
+            (_s['H'], _s['v_0'] ** 2 * sp.sin(_s['θ']) ** 2 / (2 * _s['g'])),
+            (_s['H'], _s['v_0y'] ** 2 / (2 * _s['g'])),
+            (_s['t'], 2 * _s['v_0'] * sp.sin(_s['θ']) / _s['g']),
+            (_s['R'], _s['v_0'] * sp.cos(_s['θ']) * _s['t']),
+            (_s['x'], _s['v_0x'] * _s['t']),
+            (_s['v_0x'], _s['v_0'] * sp.cos(_s['θ'])),
+            (_s['v_0y'], _s['v_0'] * sp.sin(_s['θ'])),
+            (sp.tan(_s['θ']), 4 * _s['H'] / _s['R']),
+            (_s['R'], _s['v_0x'] * _s['t']),
+        ],
+        'MCG': [
+            (_s['a_c'], _s['v'] ** 2 / _s['rho']),
+            (_s['a'] ** 2, _s['a_t'] ** 2 + _s['a_c'] ** 2),
+        ],
+    }
+
+
+# Relaciones que solo son válidas si ciertos datos no son nulos:
+# el tiempo de vuelo 2·v₀·sinθ/g no se aplica a un lanzamiento horizontal (θ = 0).
+NONZERO_INPUTS = {
+    ('TP', 5): ('θ',),
+}
+
+# Claves alternativas aceptadas en `variables` y valores por defecto
+ALIASES = {
+    'TP': {'v_0': ('v_0', 'v0'), 'θ': ('θ', 'theta'), 'v_0x': ('v_0x', 'v0x'), 'v_0y': ('v_0y', 'v0y')},
+}
+# Nombres equivalentes de los parámetros de las ecuaciones paramétricas: la interfaz
+# envía ω, θ, ω_i... y las ecuaciones pueden escribirlos en ASCII (omega, theta...)
+PARAMETER_ALIASES = (
+    ('ω', 'omega'), ('ω_i', 'omega_i'), ('ω_f', 'omega_f'), ('θ', 'theta'), ('alpha', 'α'),
+    ('v_0', 'v0'), ('v_0x', 'v0x'), ('v_0y', 'v0y'),
+)
+DEFAULTS = {
+    'TP': {'g': 9.81},
+}
+
+# Nombres de los tipos de ejercicio y descripción y unidad de cada magnitud, para el texto de la solución
+EXERCISE_NAMES = {
+    'MCU': 'MCU',
+    'MCNU': 'MCNU',
+    'TP': 'tiro parabólico',
+    'MCG': 'MCG',
+}
+QUANTITIES = {
+    'r': ('el radio', 'm'),
+    'ω': ('la velocidad angular', 'rad/s'),
+    'v': ('la velocidad tangencial', 'm/s'),
+    'T': ('el período', 's'),
+    'f': ('la frecuencia', 'Hz'),
+    'a_c': ('la aceleración centrípeta', 'm/s²'),
+    'θ': ('el ángulo', 'rad'),
+    't': ('el tiempo', 's'),
+    'N': ('el número de vueltas', 'vueltas'),
+    'ω_i': ('la velocidad angular inicial', 'rad/s'),
+    'ω_f': ('la velocidad angular final', 'rad/s'),
+    'alpha': ('la aceleración angular', 'rad/s²'),
+    'a_t': ('la aceleración tangencial', 'm/s²'),
+    'a': ('la aceleración total', 'm/s²'),
+    'v_0': ('la velocidad inicial', 'm/s'),
+    'g': ('la aceleración gravitacional', 'm/s²'),
+    'x': ('la posición horizontal', 'm'),
+    'y': ('la posición vertical', 'm'),
+    'H': ('la altura máxima', 'm'),
+    'R': ('el alcance horizontal', 'm'),
+    'v_0x': ('la componente horizontal de la velocidad inicial', 'm/s'),
+    'v_0y': ('la componente vertical de la velocidad inicial', 'm/s'),
+    'rho': ('el radio de curvatura', 'm'),
+}
+
+
+_SUPERSCRIPTS = {2: '²', 3: '³'}  # Exponentes que se escriben como superíndice
+_GREEK_NAMES = {'alpha': 'α', 'rho': 'ρ'}  # Nombres de datos que se muestran con su letra griega
+
+
+_printer_class = None  # Clase de la impresora de fórmulas, creada al cargar SymPy
+_printer = None  # Impresora de fórmulas sin datos, creada bajo demanda
+
+
+def _get_printer(values=None):
+    """
+    Devuelve la impresora de fórmulas en notación matemática: π, √(...), · para
+    el producto y superíndices para los cuadrados y cubos. Respeta el orden de
+    los términos de la expresión (order='none'), de modo que la fórmula con los
+    datos sustituidos (`values`, nombre → número) conserva la misma forma.
+    """
+    global _printer_class, _printer
+    if _printer_class is None:
+        precedence = sp.printing.precedence.PRECEDENCE
+
+        class _FormulaPrinter(sp.printing.str.StrPrinter):
+            def __init__(self, values):
+                super().__init__({'order': 'none'})
+                self.values = values  # Datos que se imprimen en lugar de su símbolo
+
+            def _print_Symbol(self, expr):
+                if expr.name in self.values:
+                    return f'{self.values[expr.name]:.4f}'
+                return _GREEK_NAMES.get(expr.name, expr.name)
+
+            def parenthesize(self, item, level, strict=False):
+                if isinstance(item, sp.Symbol) and self.values.get(item.name, 0) < 0 and level >= precedence['Add']:
+                    return f'({self._print(item)})'
+                return super().parenthesize(item, level, strict)
+
+            def _print_Pi(self, expr):
+                return 'π'
+
+            def _print_Pow(self, expr, rational=False):
+                base, exp = expr.args
+                if exp is sp.S.Half:
+                    return f'√({self._print(base)})'
+                if exp == -sp.S.Half:
+                    return f'1/√({self._print(base)})'
+                if exp.is_Integer and int(exp) in _SUPERSCRIPTS:
+                    return self.parenthesize(base, precedence['Pow']) + _SUPERSCRIPTS[int(exp)]
+                return super()._print_Pow(expr, rational).replace('**', '^')
+
+            def _print_Mul(self, expr):
+                return super()._print_Mul(expr).replace('*', '·')
+
+        _printer_class = _FormulaPrinter
+    if values:
+        return _printer_class(values)
+    if _printer is None:
+        _printer = _printer_class({})
+    return _printer
+
+
+class Formula:
+    """
+    Una relación despejada para una incógnita: la expresión simbólica, sus
+    datos de entrada (en orden) y la función numérica compilada que la evalúa.
+    """
+
+    def __init__(self, target, expr, nonzero=()):
+        self.target = target  # Magnitud que calcula la fórmula
+        self.expr = expr  # Expresión despejada
+        self.inputs = tuple(sorted(sym.name for sym in expr.free_symbols))  # Datos necesarios
+        self.nonzero = tuple(nonzero)  # Datos que no pueden ser nulos
+        self.func = sp.lambdify([symbol(name) for name in self.inputs], expr, 'math')  # Evaluación escalar
+        self._vector_func = None  # Evaluación numpy para barridos, creada bajo demanda
+        self.text = _get_printer().doprint(expr)  # Fórmula para el texto de la solución
+
+    def applies(self, provided):
+        """Indica si todos los datos de la fórmula están presentes y son válidos."""
+        return all(name in provided for name in self.inputs) and \
+            all(abs(provided[name]) > 1e-6 for name in self.nonzero)
+
+    def evaluate(self, provided):
+        """Evalúa la fórmula; devuelve None si el resultado no es un número real finito."""
+        try:
+            result = float(self.func(*(provided[name] for name in self.inputs)))
+        except (ValueError, ZeroDivisionError, OverflowError, TypeError):
+            return None
+        return result if math.isfinite(result) else None
+
+    def evaluate_array(self, provided):
+        """
+        Evalúa la fórmula sobre arreglos numpy que se pueden combinar por
+        difusión (broadcasting). Los puntos sin resultado real y finito, o que
+        no cumplen la condición de datos no nulos, valen NaN.
+        """
+        if self._vector_func is None:
+            self._vector_func = sp.lambdify([symbol(name) for name in self.inputs], self.expr, 'numpy')
+        args = [np.asarray(provided[name], dtype=np.float64) for name in self.inputs]
+        with np.errstate(all='ignore'):
+            result = np.asarray(self._vector_func(*args), dtype=np.float64)
+            result = np.broadcast_to(result, np.broadcast_shapes(result.shape, *(arg.shape for arg in args))).copy()
+            for name in self.nonzero:
+                result[np.broadcast_to(np.abs(np.asarray(provided[name])) <= 1e-6, result.shape)] = np.nan
+        result[~np.isfinite(result)] = np.nan
+        return result
+
+    def describe(self, provided, result):
+        """Texto de la solución: fórmula, fórmula con los datos sustituidos y resultado."""
+        substituted = _get_printer({name: provided[name] for name in self.inputs}).doprint(self.expr)
+        unit = QUANTITIES[self.target][1]
+        return f"{_GREEK_NAMES.get(self.target, self.target)} = {self.text} = {substituted} = {result:.4f} {unit}"
+
+
+def _principal_solution(solutions):
+    """
+    Elige la rama principal de las soluciones despejadas: la que es real y
+    positiva en más casos de prueba (datos entre 0.1 y 10) y, a igualdad, la
+    de menor valor típico; por ejemplo, el ángulo menor en sin(2θ) = Rg/v₀².
+    """
+    if len(solutions) == 1:
+        return solutions[0]
+    rng = random.Random(0)  # Casos de prueba reproducibles
+    symbols = sorted(set().union(*(solution.free_symbols for solution in solutions)), key=lambda s: s.name)
+    samples = [{sym: 10 ** rng.uniform(-1, 1) for sym in symbols} for _ in range(16)]
+
+    def score(solution):
+        func = sp.lambdify(symbols, solution, 'cmath')
+        values = []
+        for sample in samples:
+            try:
+                value = complex(func(*sample.values()))
+            except (ValueError, ZeroDivisionError, OverflowError):
+                continue
+            if abs(value.imag) < 1e-12 and value.real > 0:
+                values.append(value.real)
+        return -len(values), sorted(values)[len(values) // 2] if values else math.inf
+
+    return min(solutions, key=score)
+
+
+def _build_registry():
+    """
+    Despeja cada relación para cada una de sus magnitudes y compila el
+    resultado. Devuelve {(tipo de ejercicio, incógnita): [Formula, ...]} con
+    las fórmulas en el orden de prioridad de relations().
+    """
+    registry = {}
+    for exercise_type, exercise_relations in relations().items():
+        for index, (lhs, rhs) in enumerate(exercise_relations):
+            equation = sp.Eq(lhs, rhs)
+            for sym in sorted(equation.free_symbols, key=lambda s: s.name):
+                try:
+                    solutions = sp.solve(equation, sym)
+                except NotImplementedError:
+                    solutions = []
+                if not solutions:
+                    logging.debug(f"Could not solve {equation} for {sym} in {exercise_type}")
+                    continue
+                nonzero = [name for name in NONZERO_INPUTS.get((exercise_type, index), ()) if name != sym.name]
+                formula = Formula(sym.name, _principal_solution(solutions), nonzero)
+                registry.setdefault((exercise_type, sym.name), []).append(formula)
+    return registry
+
+
+# Fórmulas despejadas y compiladas, construidas la primera vez que se necesitan
+# (o al precalentar el proceso) porque despejarlas cuesta del orden de segundos
+_formulas = None
+_formulas_lock = threading.Lock()
+
+
+def get_formulas():
+    """Devuelve el registro de fórmulas, construyéndolo la primera vez."""
+    global _formulas
+    with _formulas_lock:
+        if _formulas is None:
+            _formulas = _build_registry()
+        return _formulas
+
+
+@functools.lru_cache(maxsize=None)
+def exercise_variables(exercise_type):
+    """Magnitudes que intervienen en un tipo de ejercicio, ordenadas por nombre."""
+    return tuple(sorted({sym.name for lhs, rhs in relations().get(exercise_type, ())
+                         for sym in sp.Eq(lhs, rhs).free_symbols}))
+
+
+def to_float(val):
+    """Convierte un valor a float si es posible; si no, devuelve None."""
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_provided(exercise_type, variables):
+    """
+    Extrae de `variables` los datos numéricos del tipo de ejercicio, aceptando
+    las claves alternativas de ALIASES y aplicando los valores de DEFAULTS.
+    Devuelve {magnitud: float} solo con los datos presentes.
+    """
+    aliases = ALIASES.get(exercise_type, {})
+    provided = dict(DEFAULTS.get(exercise_type, {}))
+    for name in exercise_variables(exercise_type):
+        for key in aliases.get(name, (name,)):
+            value = to_float(variables.get(key))
+            if value is not None:
+                provided[name] = value
+                break
+    return provided
+
+
+def parameter_values(variables, exercise_type=None):
+    """
+    Valores de los parámetros que pueden usar las ecuaciones paramétricas:
+    todas las variables numéricas de `variables`, también con los demás
+    nombres de su grupo de PARAMETER_ALIASES (ω -> omega, omega -> ω), más los
+    valores por defecto del tipo de ejercicio (g en TP). Un nombre recibido
+    directamente prevalece sobre el mismo nombre deducido de un alias.
+    """
+    groups = {key: group for group in PARAMETER_ALIASES for key in group}
+    values = dict(DEFAULTS.get(exercise_type, {}))
+    numeric = {key: to_float(value) for key, value in variables.items()}
+    numeric = {key: value for key, value in numeric.items() if value is not None}
+    values.update(numeric)
+    for key, value in numeric.items():
+        for name in groups.get(key, ()):
+            if name not in numeric:
+                values[name] = value
+    return values
+
+
+def derive_parameters(exercise_type, provided, names):
+    """
+    Completa `provided` con las magnitudes de `names` que falten, despejándolas
+    con el registro a partir de los datos presentes (y de las ya despejadas).
+    Devuelve un diccionario nuevo; las magnitudes que no se pueden calcular no aparecen.
+    """
+    provided = dict(provided)
+    progress = True
+    while progress and any(name not in provided for name in names):
+        progress = False
+        for (exercise, target), formulas in get_formulas().items():
+            if exercise != exercise_type or target in provided:
+                continue
+            for formula in formulas:
+                result = formula.evaluate(provided) if formula.applies(provided) else None
+                if result is not None:
+                    provided[target] = result
+                    progress = True
+                    break
+    return provided
+
+
+def _join_options(options):
+    """Une las combinaciones de datos como '(a, b), (c) o (d, e)'."""
+    options = [f"({', '.join(option)})" for option in options]
+    if len(options) == 1:
+        return options[0]
+    return ', '.join(options[:-1]) + ' o ' + options[-1]
+
+
+def solve(solve_for, exercise_type, variables):
+    """
+    Calcula `solve_for` con la primera fórmula del registro cuyos datos estén
+    presentes. Devuelve una cadena explicativa y un diccionario con el resultado.
+    """
+    if exercise_type not in EXERCISE_NAMES:
+        return f"Tipo de ejercicio no reconocido: {exercise_type}", {}
+
+    provided = extract_provided(exercise_type, variables)
+    logging.debug(f"Provided variables: {provided}")
+    if len(provided) < 1:
+        return "Datos insuficientes para calcular la solución. Por favor, proporcione al menos un dato.", {}
+
+    formulas = get_formulas().get((exercise_type, solve_for))
+    if not formulas:
+        return "Datos insuficientes para calcular la solución.", {}
+
+    for formula in formulas:
+        if not formula.applies(provided):
+            continue
+        result = formula.evaluate(provided)
+        if result is not None:
+            return formula.describe(provided, result), {solve_for: result}
+
+    description = QUANTITIES[solve_for][0]
+    options = _join_options(list(dict.fromkeys(formula.inputs for formula in formulas)))
+    return (f"Datos insuficientes. Para calcular {description} ({solve_for}) en "
+            f"{EXERCISE_NAMES[exercise_type]}, necesita proporcionar: {options}"), {}
+
+
+def solve_grid(solve_for, exercise_type, variables):
+    """
+    Versión vectorizada de solve para barridos de parámetros. `variables` asocia
+    cada dato con un número o con un arreglo 1-D; los arreglos definen los ejes
+    de una malla N-dimensional en el orden en que aparecen. Cada punto se
+    calcula con la primera fórmula aplicable que le dé un resultado válido,
+    igual que solve, pero evaluando toda la malla de una vez.
+    Devuelve ({eje: valores}, resultado con NaN en los puntos sin solución,
+    índice de la fórmula usada en cada punto o -1, fórmulas aplicables).
+    Lanza ValueError si el tipo de ejercicio o la incógnita no existen.
+    """
+    if exercise_type not in EXERCISE_NAMES:
+        raise ValueError(f"unknown exercise type: {exercise_type}")
+    formulas = get_formulas().get((exercise_type, solve_for))
+    if not formulas:
+        raise ValueError(f"{solve_for} cannot be solved in {exercise_type}")
+
+    canonical = {key: name for name, keys in ALIASES.get(exercise_type, {}).items() for key in keys}
+    variables_of_type = exercise_variables(exercise_type)
+    provided = dict(DEFAULTS.get(exercise_type, {}))
+    for key, value in variables.items():  # Los ejes siguen el orden de `variables`
+        name = canonical.get(key, key)
+        if name in variables_of_type:
+            provided[name] = value
+
+    axes = {name: np.asarray(value, dtype=np.float64) for name, value in provided.items() if np.ndim(value) == 1}
+    shape = tuple(len(values) for values in axes.values())
+    for i, name in enumerate(axes):
+        # Cada eje varía solo en su dimensión, para combinarse por difusión
+        provided[name] = axes[name].reshape(
+            tuple(-1 if j == i else 1 for j in range(len(axes))))
+
+    result = np.full(shape, np.nan)
+    used = np.full(shape, -1)
+    applicable = [formula for formula in formulas if all(name in provided for name in formula.inputs)]
+    for index, formula in enumerate(applicable):
+        pending = np.isnan(result)
+        if not pending.any():
+            break
+        values = np.broadcast_to(formula.evaluate_array(provided), shape)
+        fill = pending & ~np.isnan(values)
+        result[fill] = values[fill]
+        used[fill] = index
+    return axes, result, used, applicable
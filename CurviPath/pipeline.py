@@ -0,0 +1,256 @@
+# Proceso de cálculo de /get_data, independiente de la petición HTTP (lo usan /get_data y los trabajos asíncronos)
+import os  # Acceso a variables de entorno del sistema operativo
+import json  # Manejo de datos en formato JSON
+import math  # Conversión de ángulos
+import logging  # Registro de eventos y errores
+import numpy as np  # Biblioteca para cálculos numéricos
+import physics  # Registro de fórmulas de los problemas de física
+from compiler import compile_vector_functions, EquationError, SIMPLIFY_MODES, DEFAULT_SIMPLIFY_MODE  # Compilación de ecuaciones
+from evaluation import evaluate_vector_function  # Evaluación numérica de las expresiones compiladas
+from geometry import geometry_series, planar_geometry_series  # Magnitudes de geometría diferencial
+from events import parse_event, curve_events  # Detección de eventos (aterrizaje, altura máxima, cruces)
+from downsampling import MIN_POINTS  # Reducción de las series para dibujarlas
+from trajectories import closed_form_trajectory  # Trayectorias en forma cerrada de los ejercicios predefinidos
+from sampling import adaptive_time_grid, SAMPLING_MODES, ADAPTIVE_TOLERANCE  # Muestreo temporal adaptativo
+from metrics import timed  # Tiempos por etapa
+
+# Número de puntos por bloque en las respuestas por flujo de /get_data
+STREAM_CHUNK_SIZE = int(os.environ.get('CURVIPATH_STREAM_CHUNK_SIZE', 65536))
+
+
+class PipelineError(ValueError):
+    """Error de una petición de cálculo, con el código HTTP y el cuerpo JSON de la respuesta."""
+
+    def __init__(self, message, status=400, **details):
+        super().__init__(message)
+        self.status = status  # Código HTTP de la respuesta
+        self.payload = dict(details, error=message)  # Cuerpo JSON de la respuesta
+
+
+def _flag(args, name):
+    """Lee un parámetro booleano ('1', 'true' o 'yes')."""
+    return args.get(name, 'false').lower() in ('1', 'true', 'yes')
+
+
+def parse_options(args):
+    """
+    Lee y valida los parámetros de /get_data de `args` (un MultiDict de
+    werkzeug o cualquier objeto con get y getlist). Devuelve un diccionario
+    con las opciones; lanza PipelineError (400) si algún parámetro no es válido.
+    """
+    try:
+        # Obtención de parámetros de entrada desde la solicitud HTTP
+        options = {
+            't_max': float(args.get('t_max', 10.0)),  # Tiempo máximo
+            'intervals': int(args.get('intervals', 100)),  # Número de intervalos
+            'x_equations': list(args.getlist('x_equations')),  # Ecuaciones para la componente x
+            'y_equations': list(args.getlist('y_equations')),  # Ecuaciones para la componente y
+            'z_equations': list(args.getlist('z_equations')),  # Ecuaciones para la componente z
+            'z_function': args.get('z_function', '').strip(),  # Función adicional z opcional
+            'variables': json.loads(args.get('variables', '{}')),  # Variables adicionales en formato JSON
+            'solve_for': args.get('solve_for', None),  # Variable a resolver
+            'exercise_type': args.get('exercise_type', None),  # Tipo de ejercicio físico
+            'simplify_mode': args.get('simplify', DEFAULT_SIMPLIFY_MODE),  # Política de simplificación
+            'stream': _flag(args, 'stream'),  # Respuesta por bloques
+            'chunk_size': int(args.get('chunk_size', STREAM_CHUNK_SIZE)),  # Puntos por bloque
+            'sampling': args.get('sampling', 'uniform'),  # Muestreo uniforme o adaptativo
+            'tolerance': float(args.get('tolerance', ADAPTIVE_TOLERANCE)),  # Error de cuerda relativo admitido
+            'geometry': _flag(args, 'geometry'),  # Curvatura, torsión, triedro...
+            'events': [parse_event(spec) for spec in args.getlist('events')],  # Cruces por cero o por un nivel
+            'max_points': int(args.get('max_points', 0)),  # Puntos máximos de las series devueltas (0: todos)
+        }
+        if options['simplify_mode'] not in SIMPLIFY_MODES:
+            raise ValueError(f"simplify must be one of {', '.join(SIMPLIFY_MODES)}")
+        if options['intervals'] < 1 or options['chunk_size'] < 1:
+            raise ValueError('intervals and chunk_size must be positive')
+        if options['sampling'] not in SAMPLING_MODES:
+            raise ValueError(f"sampling must be one of {', '.join(SAMPLING_MODES)}")
+        if options['sampling'] == 'adaptive' and options['stream']:
+            raise ValueError('adaptive sampling cannot be streamed')
+        if options['geometry'] and options['stream']:
+            raise ValueError('geometry metrics cannot be streamed')
+        if options['events'] and options['stream']:
+            raise ValueError('events cannot be streamed')
+        if options['max_points'] and options['max_points'] < MIN_POINTS:
+            raise ValueError(f'max_points must be 0 (no downsampling) or at least {MIN_POINTS}')
+        if options['max_points'] and options['stream']:
+            raise ValueError('max_points cannot be streamed')
+        if not isinstance(options['variables'], dict):
+            raise ValueError('variables must be a JSON object')
+    except (TypeError, ValueError) as e:  # json.JSONDecodeError es un ValueError
+        # Manejo de errores en los parámetros de entrada
+        logging.error(f"Invalid parameters: {str(e)}")
+        raise PipelineError('Invalid parameters: ' + str(e)) from e
+
+    # Conversión de ángulo θ de grados a radianes si está presente
+    variables = options['variables']
+    if 'θ' in variables:
+        try:
+            variables['θ'] = math.radians(float(variables['θ']))
+        except ValueError:
+            raise PipelineError('El valor de θ no es un número válido')
+        except Exception as e:
+            raise PipelineError(f'Error al convertir el ángulo a radianes: {str(e)}')
+    return options
+
+
+def calculate_solution(solve_for, exercise_type, variables):
+    """
+    Calcula soluciones para problemas de física basados en el tipo de ejercicio.
+    Cada relación física se declara una sola vez en physics.relations() y se
+    despeja y compila la primera vez que se usa el registro (o al precalentar
+    el proceso), de modo que resolver consiste en
+    elegir la primera fórmula con todos sus datos presentes y evaluarla.
+    Devuelve una cadena explicativa y un diccionario con los datos calculados.
+    """
+    logging.debug(f"Calculating solution for: {solve_for} in {exercise_type}")
+    try:
+        return physics.solve(solve_for, exercise_type, variables)
+    except Exception as e:
+        logging.error(f"Error al calcular la solución: {str(e)}")
+        return f"Error al calcular la solución: {str(e)}", {}
+
+
+class Computation:
+    """
+    Cálculo de una petición de /get_data ya validada con parse_options:
+    compila las funciones vectoriales, enlaza sus parámetros y prepara la
+    trayectoria en forma cerrada. Después, solve resuelve el problema de
+    física y evaluate_all (o evaluate_function, curva por curva) evalúa las
+    series sobre cualquier malla temporal. Lanza PipelineError si una ecuación no se
+    puede compilar (400, o 422 si superó los límites de la compilación) o si
+    falta el valor de algún parámetro.
+    """
+
+    def __init__(self, options):
+        self.options = options
+        variables = options['variables']
+        exercise_type = options['exercise_type']
+
+        # Determina la longitud máxima de las listas de ecuaciones
+        x_equations, y_equations, z_equations = (list(options[f'{name}_equations']) for name in ('x', 'y', 'z'))
+        max_len = max(len(x_equations), len(y_equations), len(z_equations))
+
+        # Rellena las listas más cortas con cadenas vacías
+        x_equations += [''] * (max_len - len(x_equations))
+        y_equations += [''] * (max_len - len(y_equations))
+        z_equations += [''] * (max_len - len(z_equations))
+
+        # Agrupa las ecuaciones de cada función vectorial
+        all_equations = [
+            (
+                ('x', x_equations[idx]),  # Ecuación para la componente x
+                ('y', y_equations[idx]),  # Ecuación para la componente y
+                ('z', z_equations[idx]),  # Ecuación para la componente z
+            )
+            for idx in range(max_len)
+        ]
+        if options['z_function']:
+            all_equations.append((('z', options['z_function']),))
+
+        # Compila (o recupera de la caché) todas las componentes en una sola pasada antes de evaluar.
+        # Las ecuaciones que superan los límites de tiempo o memoria de la compilación devuelven 422,
+        # y las que no se compilan porque cayó el grupo de procesos de compilación, 503.
+        self.vector_functions = []  # Pares (sufijo de las series, componentes compiladas)
+        for idx, compiled_components in enumerate(compile_vector_functions(all_equations, options['simplify_mode'])):
+            if idx == max_len:  # Función adicional z
+                if isinstance(compiled_components, EquationError):
+                    logging.error(f"Error processing Z function: {str(compiled_components)}")
+                    raise PipelineError(f'Error parsing Z function: {str(compiled_components)}', compiled_components.status)
+                self.vector_functions.append(('', compiled_components))
+            elif isinstance(compiled_components, EquationError):
+                e = compiled_components
+                logging.error(f"Error processing {e.component} equation {idx+1}: {str(e)}")
+                raise PipelineError(f'Error parsing {e.component} equation {idx+1}: {str(e)}', e.status,
+                                    component=e.component, equation=idx + 1)
+            elif compiled_components:
+                self.vector_functions.append((f'_{idx+1}', compiled_components))
+
+        # Valores de los parámetros (v_0, θ, ω...) que usan las ecuaciones; se enlazan al evaluar, sin recompilar
+        self.params = physics.parameter_values(variables, exercise_type)
+        for suffix, components in self.vector_functions:
+            missing = sorted({name for _, compiled in components for name in compiled.params} - self.params.keys())
+            if missing:
+                label = f'equation {suffix.lstrip("_")}' if suffix else 'Z function'
+                raise PipelineError(f'Missing value for parameter(s) {", ".join(missing)} in {label}')
+
+        # Sin ecuaciones, los tipos MCU, MCNU y TP se dibujan con su trayectoria en forma cerrada (sin SymPy)
+        self.closed_form = None
+        if not self.vector_functions and exercise_type:
+            self.closed_form = closed_form_trajectory(exercise_type, variables)
+
+        self.results = {'invalid_points': {}}  # Datos de la respuesta distintos de las series
+        if self.closed_form is not None:
+            self.results['closed_form'] = exercise_type
+
+    def solve(self):
+        """Calcula la solución del problema de física, si se solicita, y la añade a los resultados."""
+        options = self.options
+        if options['solve_for'] and options['exercise_type']:
+            with timed('solve'):
+                solution, solution_data = calculate_solution(options['solve_for'], options['exercise_type'], options['variables'])
+            self.results['solution'] = solution
+            self.results['solution_data'] = solution_data  # Valores float de Python
+
+    def curves(self):
+        """Etiquetas de las curvas que se evalúan, en orden ('1', '2'... y 'z_function')."""
+        labels = ['1'] if self.closed_form is not None else []
+        return labels + [suffix.lstrip('_') or 'z_function' for suffix, _ in self.vector_functions]
+
+    def time_grid(self):
+        """
+        Malla temporal completa: uniforme con `intervals` puntos o adaptativa,
+        en cuyo caso `intervals` es el máximo de puntos.
+        """
+        options = self.options
+        if options['sampling'] == 'adaptive':
+            with timed('sampling'):
+                return adaptive_time_grid(self.vector_functions, 0.0, options['t_max'], options['intervals'],
+                                          options['tolerance'], params=self.params, closed_form=self.closed_form)
+        return np.linspace(0, options['t_max'], options['intervals'])  # Genera un arreglo de valores de tiempo
+
+    def evaluate_function(self, label, t_vals, arrays, invalid_points):
+        """
+        Evalúa la curva `label` (ver curves) sobre `t_vals` y guarda sus series
+        en `arrays`: posición, velocidad y aceleración de cada componente y, si
+        se piden, las magnitudes geométricas y la longitud total de la curva.
+        Los puntos sin valor real se devuelven como null (NaN en binario) y se
+        acumulan por serie en `invalid_points`. La trayectoria en forma
+        cerrada, si la hay, es la curva 1.
+        """
+        if self.closed_form is not None and label == '1':
+            with timed('evaluate'):
+                series = self.closed_form(t_vals)
+            for key, values in series.items():
+                arrays[f'{key}_1'] = values
+            if self.options['geometry']:
+                with timed('geometry'):
+                    for key, values in planar_geometry_series(t_vals, series).items():
+                        arrays[f'{key}_1'] = values
+                self.results.setdefault('arc_length', {})[label] = float(arrays['arc_length_1'][-1])
+            if self.options['events']:
+                self.results.setdefault('events', []).extend(
+                    curve_events(self.options['events'], label, '_1', t_vals, arrays, closed_form=self.closed_form))
+            return
+        suffix, components = next((suffix, components) for suffix, components in self.vector_functions
+                                  if (suffix.lstrip('_') or 'z_function') == label)
+        with timed('evaluate'):
+            evaluated = evaluate_vector_function(components, t_vals, self.params)
+        for key, (values, invalid) in evaluated.items():
+            arrays[f'{key}{suffix}'] = values
+            if invalid:
+                invalid_points[f'{key}{suffix}'] = invalid_points.get(f'{key}{suffix}', 0) + invalid
+        if self.options['geometry']:
+            with timed('geometry'):
+                series = geometry_series(components, t_vals, evaluated, self.params)
+            for key, values in series.items():
+                arrays[f'{key}{suffix}'] = values
+            self.results.setdefault('arc_length', {})[label] = float(arrays[f'arc_length{suffix}'][-1])
+        if self.options['events']:
+            self.results.setdefault('events', []).extend(
+                curve_events(self.options['events'], label, suffix, t_vals, arrays, components=components, params=self.params))
+
+    def evaluate_all(self, t_vals, arrays, invalid_points):
+        """Evalúa todas las curvas sobre `t_vals` (ver evaluate_function)."""
+        for label in self.curves():
+            self.evaluate_function(label, t_vals, arrays, invalid_points)
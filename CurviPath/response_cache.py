@@ -0,0 +1,151 @@
+# Caché de respuestas de /get_data y validadores HTTP (ETag) por petición normalizada
+import os  # Acceso a variables de entorno del sistema operativo
+import json  # Forma canónica de los parámetros
+import hashlib  # Resumen de la forma canónica y del código
+import importlib.metadata  # Versiones de numpy y SymPy
+import threading  # Bloqueo para el acceso concurrente a la caché
+from collections import OrderedDict  # Diccionario ordenado para la política LRU
+from compiler import preprocess_equation  # Texto canónico de las ecuaciones
+from physics import to_float  # Valores numéricos de las variables
+
+# Memoria máxima (MB) de las respuestas guardadas; 0 desactiva la caché (los ETag se siguen enviando)
+RESPONSE_CACHE_MB = float(os.environ.get('CURVIPATH_RESPONSE_CACHE_MB', 64))
+
+# Tamaño máximo (MB) de una respuesta para guardarla; las mayores solo llevan ETag
+RESPONSE_CACHE_MAX_ENTRY_MB = float(os.environ.get('CURVIPATH_RESPONSE_CACHE_MAX_ENTRY_MB', 16))
+
+# Módulos que no intervienen en el contenido de las respuestas de /get_data
+_VERSION_EXCLUDED = ('benchmark.py', 'gunicorn.conf.py', 'main.py')
+
+
+def _computation_version():
+    """
+    Versión de los cálculos: resumen del código fuente de los módulos de la
+    aplicación y de las versiones de numpy y SymPy, de modo que cualquier
+    despliegue que pueda cambiar los resultados cambia también los ETag.
+    """
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.py') and name not in _VERSION_EXCLUDED:
+            with open(os.path.join(directory, name), 'rb') as f:
+                digest.update(name.encode('utf-8') + b'\0' + f.read() + b'\0')
+    for package in ('numpy', 'sympy'):
+        try:
+            digest.update(f'{package}={importlib.metadata.version(package)}\0'.encode('utf-8'))
+        except importlib.metadata.PackageNotFoundError:
+            pass
+    return digest.hexdigest()[:16]
+
+
+# Versión de los cálculos incluida en los ETag: por defecto se deduce del código (ver
+# _computation_version); la variable de entorno la fija, por ejemplo para invalidar a mano
+RESPONSE_CACHE_VERSION = os.environ.get('CURVIPATH_RESPONSE_CACHE_VERSION') or _computation_version()
+
+
+def request_key(options, binary, dtype):
+    """
+    Resumen SHA-256 de la forma canónica de una petición de /get_data (las
+    opciones de pipeline.parse_options y el formato de la respuesta). Dos
+    peticiones con la misma clave producen la misma respuesta: las ecuaciones
+    se comparan por su texto canónico (preprocess_equation), las funciones
+    vectoriales vacías del final se ignoran y las variables se reducen a sus
+    valores numéricos con las claves ordenadas, que es lo único que usan el
+    cálculo y la solución. El orden de las funciones vectoriales se conserva
+    porque determina el sufijo de sus series.
+    """
+    equations = [options[f'{name}_equations'] for name in ('x', 'y', 'z')]
+    curves = [tuple(preprocess_equation(eqs[idx]) if idx < len(eqs) else '' for eqs in equations)
+              for idx in range(max(map(len, equations)))]
+    while curves and not any(curves[-1]):
+        curves.pop()
+    variables = {key: value for key, value in ((key, to_float(value)) for key, value in options['variables'].items())
+                 if value is not None}
+    exercise_type = options['exercise_type'] or None
+    canonical = {
+        'version': RESPONSE_CACHE_VERSION,
+        'curves': curves,
+        'z_function': preprocess_equation(options['z_function']),
+        'variables': variables,
+        'exercise_type': exercise_type,
+        'solve_for': options['solve_for'] if exercise_type else None,
+        'simplify': options['simplify_mode'],
+        't_max': options['t_max'],
+        'intervals': options['intervals'],
+        'sampling': options['sampling'],
+        'tolerance': options['tolerance'] if options['sampling'] == 'adaptive' else None,
+        'geometry': options['geometry'],
+        'events': options['events'],
+        'max_points': options['max_points'],
+        'format': dtype if binary else 'json',
+    }
+    text = json.dumps(canonical, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Caché LRU segura entre hilos de respuestas ya serializadas, acotada por
+    la suma de sus tamaños en bytes. Cada entrada guarda el cuerpo y su tipo MIME.
+    """
+
+    def __init__(self, max_bytes=int(RESPONSE_CACHE_MB * 2 ** 20), max_entry_bytes=int(RESPONSE_CACHE_MAX_ENTRY_MB * 2 ** 20)):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self._entries = OrderedDict()  # Clave -> (cuerpo, tipo MIME)
+        self._lock = threading.Lock()
+        self.bytes = 0  # Tamaño total de los cuerpos guardados
+        self.hits = 0  # Respuestas servidas desde la caché
+        self.misses = 0  # Respuestas que hubo que calcular
+        self.evictions = 0  # Entradas descartadas por superar la memoria máxima
+
+    def get(self, key):
+        """Devuelve (cuerpo, tipo MIME) de `key` o None, contando el acierto o el fallo."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)  # Marca la entrada como usada recientemente
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def put(self, key, body, mimetype):
+        """
+        Guarda una respuesta, descartando las menos usadas hasta que quepa.
+        Las respuestas mayores que max_entry_bytes no se guardan.
+        """
+        if len(body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= len(previous[0])
+            self._entries[key] = (body, mimetype)
+            self.bytes += len(body)
+            while self.bytes > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)[1]  # Descarta la entrada menos usada
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def stats(self):
+        """Devuelve los contadores de la caché."""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def clear(self):
+        """Vacía la caché sin reiniciar los contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+# Caché global de respuestas del proceso
+response_cache = ResponseCache()
@@ -0,0 +1,114 @@
+# Muestreo temporal adaptativo según la curvatura de las trayectorias
+import os  # Acceso a variables de entorno del sistema operativo
+import numpy as np  # Biblioteca para cálculos numéricos
+from evaluation import evaluate_vector_function  # Evaluación numérica de las expresiones compiladas
+
+# Modos de muestreo disponibles:
+# - 'uniform': np.linspace con `intervals` puntos
+# - 'adaptive': malla inicial gruesa refinada donde la curva se aparta de sus cuerdas
+SAMPLING_MODES = ('uniform', 'adaptive')
+
+# Tolerancia por defecto del error de cuerda, relativa al tamaño de cada curva
+ADAPTIVE_TOLERANCE = float(os.environ.get('CURVIPATH_ADAPTIVE_TOLERANCE', 1e-3))
+
+# Número de puntos de la malla inicial del muestreo adaptativo
+ADAPTIVE_INITIAL_POINTS = int(os.environ.get('CURVIPATH_ADAPTIVE_INITIAL_POINTS', 33))
+
+# Ángulo máximo (radianes) entre las velocidades de los extremos de un segmento visible
+ADAPTIVE_MAX_ANGLE = float(os.environ.get('CURVIPATH_ADAPTIVE_MAX_ANGLE', 0.1))
+
+
+def _velocity_acceleration(components, t_vals, params=None):
+    """
+    Evalúa una función vectorial y devuelve tres matrices (n puntos × componentes)
+    con la posición, la velocidad y la aceleración. Los puntos inválidos valen 0.
+    """
+    evaluated = evaluate_vector_function(components, t_vals, params)
+    return tuple(
+        np.nan_to_num(np.column_stack([evaluated[f'{name}_{kind}'][0] for name, _ in components]))
+        for kind in ('eq', 'v', 'a')
+    )
+
+
+def _closed_form_velocity_acceleration(closed_form, t_vals):
+    """Como _velocity_acceleration, para una trayectoria en forma cerrada (función t -> series)."""
+    series = closed_form(t_vals)
+    names = [key[:-len('_eq')] for key in series if key.endswith('_eq')]
+    return tuple(
+        np.nan_to_num(np.column_stack([series[f'{name}_{kind}'] for name in names]))
+        for kind in ('eq', 'v', 'a')
+    )
+
+
+def _segment_errors(t_vals, vel, acc, scale):
+    """
+    Estima, para cada segmento [t_i, t_i+1], el error de cuerda relativo al
+    tamaño de la curva: h²/8 · |a_n|, con a_n la aceleración normal (la parte
+    de la aceleración perpendicular a la velocidad), que es la distancia máxima
+    entre un arco de curvatura constante y su cuerda. Los segmentos visibles
+    (longitud mayor que la tolerancia) con un giro mayor que ADAPTIVE_MAX_ANGLE
+    se marcan con error infinito para refinarlos en cualquier caso.
+    """
+    speed = np.linalg.norm(vel, axis=1)
+    unit = np.divide(vel, speed[:, None], out=np.zeros_like(vel), where=speed[:, None] > 0)
+    a_normal = np.linalg.norm(acc - np.sum(acc * unit, axis=1)[:, None] * unit, axis=1)
+    h = np.diff(t_vals)
+    errors = h ** 2 / 8 * np.maximum(a_normal[:-1], a_normal[1:]) / scale
+
+    cos_turn = np.clip(np.sum(unit[:-1] * unit[1:], axis=1), -1.0, 1.0)
+    length = h * np.maximum(speed[:-1], speed[1:]) / scale
+    turning = (np.arccos(cos_turn) > ADAPTIVE_MAX_ANGLE) & (speed[:-1] > 0) & (speed[1:] > 0)
+    return errors, turning, length
+
+
+def adaptive_time_grid(vector_functions, t_min, t_max, max_points,
+                       tolerance=ADAPTIVE_TOLERANCE, initial_points=ADAPTIVE_INITIAL_POINTS, params=None, closed_form=None):
+    """
+    Construye una malla temporal no uniforme para `vector_functions` (lista de
+    pares (sufijo, componentes compiladas)). Parte de una malla uniforme gruesa
+    y divide por la mitad los segmentos cuyo error de cuerda, en cualquiera de
+    las curvas, supera `tolerance` (relativa a la diagonal de la caja que
+    contiene la curva), empezando por los peores, hasta no superar `max_points`.
+    En cada iteración solo se evalúan los puntos nuevos. `params` son los
+    valores de los parámetros de las ecuaciones; `closed_form`, una
+    trayectoria en forma cerrada que se refina como una curva más.
+    Devuelve el arreglo ordenado de tiempos.
+    """
+    evaluators = [lambda t, components=components: _velocity_acceleration(components, t, params)
+                  for _, components in vector_functions]
+    if closed_form is not None:
+        evaluators.append(lambda t: _closed_form_velocity_acceleration(closed_form, t))
+    t_vals = np.linspace(t_min, t_max, max(2, min(initial_points, max_points)))
+    if not evaluators or max_points <= len(t_vals):
+        return t_vals
+
+    curves = []  # Por curva: [posición, velocidad, aceleración] en los puntos de t_vals
+    scales = []  # Tamaño de cada curva, para que la tolerancia sea relativa
+    for evaluate in evaluators:
+        pos, vel, acc = evaluate(t_vals)
+        curves.append([vel, acc])
+        scale = np.linalg.norm(np.ptp(pos, axis=0))
+        scales.append(scale if scale > 0 else 1.0)
+
+    min_step = (t_max - t_min) * 1e-12  # Evita refinar indefinidamente alrededor de singularidades
+    while len(t_vals) < max_points:
+        errors = np.zeros(len(t_vals) - 1)
+        for (vel, acc), scale in zip(curves, scales):
+            curve_errors, turning, length = _segment_errors(t_vals, vel, acc, scale)
+            curve_errors[turning & (length > tolerance)] = np.inf
+            errors = np.maximum(errors, curve_errors)
+        errors[np.diff(t_vals) <= min_step] = 0.0
+
+        bad = np.flatnonzero(errors > tolerance)
+        if bad.size == 0:
+            break
+        bad = bad[np.argsort(errors[bad])[::-1][:max_points - len(t_vals)]]  # Los peores primero
+        new_t = (t_vals[bad] + t_vals[bad + 1]) / 2
+
+        order = np.argsort(np.concatenate([t_vals, new_t]), kind='stable')
+        t_vals = np.concatenate([t_vals, new_t])[order]
+        for curve, evaluate in zip(curves, evaluators):
+            _, vel, acc = evaluate(new_t)
+            curve[0] = np.concatenate([curve[0], vel])[order]
+            curve[1] = np.concatenate([curve[1], acc])[order]
+    return t_vals
@@ -0,0 +1,90 @@
+# Serialización de las series numéricas de las respuestas (JSON o binario columnar)
+import json  # Manejo de datos en formato JSON
+import struct  # Empaquetado del prefijo de longitud de la cabecera
+import numpy as np  # Biblioteca para cálculos numéricos
+from evaluation import series_to_list  # Conversión de arreglos a listas JSON
+
+# Tipo MIME de las respuestas binarias
+BINARY_MIMETYPE = 'application/octet-stream'
+
+# Tipo MIME de las respuestas por flujo en JSON (una línea JSON por bloque)
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Tipos de dato admitidos para los búferes binarios (siempre little-endian)
+BINARY_DTYPES = {'float64': '<f8', 'float32': '<f4'}
+
+# Alineación en bytes del inicio de cada búfer, para poder crear Float64Array sin copiar
+BINARY_ALIGNMENT = 8
+
+
+def wants_binary(request):
+    """
+    Indica si la petición pide la respuesta binaria, ya sea con el parámetro
+    `format=binary` o con la cabecera `Accept: application/octet-stream`
+    (preferida frente a application/json).
+    """
+    fmt = request.args.get('format')
+    if fmt is not None:
+        if fmt not in ('json', 'binary'):
+            raise ValueError('format must be one of json, binary')
+        return fmt == 'binary'
+    accept = request.accept_mimetypes
+    return accept.best_match(['application/json', BINARY_MIMETYPE]) == BINARY_MIMETYPE
+
+
+def binary_dtype(name):
+    """Valida el nombre del tipo de dato solicitado y devuelve su descriptor numpy."""
+    if name not in BINARY_DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(BINARY_DTYPES)}")
+    return BINARY_DTYPES[name]
+
+
+def encode_columnar(arrays, metadata, dtype='float64'):
+    """
+    Codifica las series en formato binario columnar:
+    - 4 bytes: longitud N de la cabecera (uint32 little-endian)
+    - N bytes: cabecera JSON en UTF-8, rellenada con espacios hasta la alineación
+    - búferes crudos de cada serie, uno tras otro, cada uno alineado a BINARY_ALIGNMENT
+    La cabecera incluye `metadata` y, en 'series', el nombre, tipo, longitud y
+    desplazamiento (relativo al final de la cabecera) de cada búfer. Los
+    puntos inválidos se conservan como NaN.
+    """
+    descriptor = binary_dtype(dtype)
+    itemsize = np.dtype(descriptor).itemsize
+    series = []
+    buffers = []
+    offset = 0
+    for name, values in arrays.items():
+        buffer = np.ascontiguousarray(values, dtype=descriptor).tobytes()
+        series.append({'name': name, 'dtype': dtype, 'offset': offset, 'length': len(buffer) // itemsize})
+        buffers.append(buffer)
+        padding = -len(buffer) % BINARY_ALIGNMENT
+        if padding:
+            buffers.append(b'\0' * padding)
+        offset += len(buffer) + padding
+
+    header = json.dumps(dict(metadata, series=series), separators=(',', ':')).encode('utf-8')
+    header += b' ' * (-(len(header) + 4) % BINARY_ALIGNMENT)  # Los búferes empiezan alineados
+    return b''.join([struct.pack('<I', len(header)), header] + buffers)
+
+
+def arrays_to_json(arrays, metadata):
+    """Combina `metadata` con las series convertidas en listas JSON (NaN -> null)."""
+    results = dict(metadata)
+    for name, values in arrays.items():
+        results[name] = series_to_list(values)
+    return results
+
+
+def ndjson_line(obj):
+    """Codifica un objeto como una línea NDJSON."""
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+def encode_frame(arrays, metadata, dtype='float64'):
+    """
+    Codifica un bloque de un flujo binario: la longitud total del bloque
+    (uint32 little-endian) seguida de su codificación con encode_columnar.
+    """
+    body = encode_columnar(arrays, metadata, dtype)
+    return struct.pack('<I', len(body)) + body
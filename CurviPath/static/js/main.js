@@ -1,5 +1,8 @@
 // JavaScript principal de la aplicación
 
+// Puntos máximos por serie que se piden al servidor para dibujar; el cálculo usa todos los intervalos
+const MAX_PLOT_POINTS = 4000;
+
 // Inicializa la aplicación cuando el DOM esté completamente cargado
 document.addEventListener('DOMContentLoaded', function() {
     // Inicializa el selector de tipo de ejercicio y las entradas de variables
@@ -312,6 +315,10 @@ function fetchDataAndProcess(solutionOnly = false) {
     url += `&variables=${encodeURIComponent(JSON.stringify(variables))}`;
     url += `&exercise_type=${formData.get('exerciseType')}`;
     url += `&solve_for=${formData.get('solveFor')}`;
+    // Solo se pide la reducción si hay más puntos de los que se dibujan; entonces window.currentData tiene las series reducidas
+    if (Number(formData.get('intervals')) > MAX_PLOT_POINTS) {
+        url += `&max_points=${MAX_PLOT_POINTS}`;
+    }
     
     // Envía la solicitud al servidor
     fetch(url)
@@ -155,22 +155,22 @@ function validateExpression(expr) {
     }
 }
 
-// Genera ecuaciones de ejemplo para diferentes tipos de ejercicios
+// Genera ecuaciones de ejemplo para diferentes tipos de ejercicios (warmup.py precompila las mismas)
 function getExampleEquations(exerciseType) {
     const examples = {
         MCU: {
-            x: 'r * cos(omega * t)',
-            y: 'r * sin(omega * t)',
+            x: 'r * cos(ω * t)',
+            y: 'r * sin(ω * t)',
             z: '0'
         },
         MCNU: {
-            x: 'r * cos(omega_i * t + 0.5 * alpha * t^2)',
-            y: 'r * sin(omega_i * t + 0.5 * alpha * t^2)',
+            x: 'r * cos(ω_i * t + 0.5 * alpha * t**2)',
+            y: 'r * sin(ω_i * t + 0.5 * alpha * t**2)',
             z: '0'
         },
         TP: {
-            x: 'v_0 * cos(theta) * t',
-            y: 'v_0 * sin(theta) * t - 0.5 * g * t^2',
+            x: 'v_0 * cos(θ) * t',
+            y: 'v_0 * sin(θ) * t - 0.5 * g * t**2',
             z: '0'
         },
         MCG: {
@@ -0,0 +1,63 @@
+# Trayectorias en forma cerrada de los tipos de ejercicio predefinidos
+import numpy as np  # Biblioteca para cálculos numéricos
+import physics  # Registro de fórmulas de los problemas de física
+
+# Parámetros que determina cada movimiento (se despejan con el registro si faltan)
+TRAJECTORY_PARAMETERS = {
+    'MCU': ('r', 'ω'),
+    'MCNU': ('r', 'ω_i', 'alpha'),
+    'TP': ('v_0x', 'v_0y', 'g'),
+}
+
+
+def _circular(r, omega, alpha, t_vals):
+    """
+    Movimiento circular con ángulo φ = ω·t + ½·α·t² y velocidad angular
+    ω(t) = ω + α·t. Devuelve las series de posición, velocidad y aceleración.
+    """
+    phi = omega * t_vals + 0.5 * alpha * t_vals ** 2
+    w = omega + alpha * t_vals
+    cos_phi, sin_phi = np.cos(phi), np.sin(phi)
+    return {
+        'x_eq': r * cos_phi,
+        'x_v': -r * w * sin_phi,
+        'x_a': -r * alpha * sin_phi - r * w ** 2 * cos_phi,
+        'y_eq': r * sin_phi,
+        'y_v': r * w * cos_phi,
+        'y_a': r * alpha * cos_phi - r * w ** 2 * sin_phi,
+    }
+
+
+def _projectile(v_0x, v_0y, g, t_vals):
+    """Tiro parabólico desde el origen: posición, velocidad y aceleración."""
+    return {
+        'x_eq': v_0x * t_vals,
+        'x_v': np.full(len(t_vals), v_0x),
+        'x_a': np.zeros(len(t_vals)),
+        'y_eq': v_0y * t_vals - 0.5 * g * t_vals ** 2,
+        'y_v': v_0y - g * t_vals,
+        'y_a': np.full(len(t_vals), -g),
+    }
+
+
+def closed_form_trajectory(exercise_type, variables):
+    """
+    Devuelve una función que, dado el arreglo de tiempos, calcula con numpy
+    las series {'x_eq', 'x_v', 'x_a', 'y_eq', ...} del movimiento de
+    `exercise_type` (MCU, MCNU o TP), sin pasar por SymPy. Los parámetros que
+    faltan en `variables` se despejan con el registro de fórmulas.
+    Devuelve None si el tipo no tiene trayectoria predefinida o faltan datos.
+    """
+    names = TRAJECTORY_PARAMETERS.get(exercise_type)
+    if names is None:
+        return None
+    provided = physics.derive_parameters(exercise_type, physics.extract_provided(exercise_type, variables), names)
+    if any(name not in provided for name in names):
+        return None
+    params = [provided[name] for name in names]
+
+    if exercise_type == 'MCU':
+        return lambda t_vals: _circular(params[0], params[1], 0.0, t_vals)
+    if exercise_type == 'MCNU':
+        return lambda t_vals: _circular(*params, t_vals)
+    return lambda t_vals: _projectile(*params, t_vals)
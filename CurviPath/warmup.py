@@ -0,0 +1,61 @@
+# Precalentamiento de los procesos: importa SymPy y precompila las ecuaciones frecuentes
+import os  # Acceso a variables de entorno del sistema operativo
+import time  # Medición de la duración del precalentamiento
+import logging  # Registro de eventos y errores
+import threading  # Bloqueo para precalentar una sola vez
+import physics  # Registro de fórmulas de los problemas de física
+from compiler import expression_cache, DEFAULT_SIMPLIFY_MODE  # Caché de expresiones compiladas
+
+# Ecuaciones precompiladas al arrancar, separadas por ';'. Por defecto, las de
+# los ejemplos de la interfaz (getExampleEquations en static/js/utils.js, ya
+# preprocesadas y con los nombres de variable que envía la interfaz: ω, θ, ω_i...)
+# y las funciones más comunes.
+DEFAULT_PRELOAD_EQUATIONS = ';'.join((
+    't', 'cos(t)', 'sin(t)',
+    'r*cos(ω*t)', 'r*sin(ω*t)',
+    'r*cos(ω_i*t+0.5*alpha*t**2)', 'r*sin(ω_i*t+0.5*alpha*t**2)',
+    'v_0*cos(θ)*t', 'v_0*sin(θ)*t-0.5*g*t**2',
+    'cos(t)+t*sin(t)', 'sin(t)-t*cos(t)',
+))
+PRELOAD_EQUATIONS = [eq for eq in os.environ.get('CURVIPATH_PRELOAD_EQUATIONS', DEFAULT_PRELOAD_EQUATIONS).split(';') if eq.strip()]
+
+# Si es '0', main.py no precalienta el proceso y todo se carga con la primera petición
+WARMUP_ENABLED = os.environ.get('CURVIPATH_WARMUP', '1') != '0'
+
+# Estado del precalentamiento: 'cold' (no se hizo), 'warming' (en curso) o 'ready'
+_state = {'status': 'cold', 'seconds': None, 'compiled': 0, 'failed': []}
+_lock = threading.Lock()
+
+
+def warm_up(equations=None, simplify_mode=DEFAULT_SIMPLIFY_MODE):
+    """
+    Importa SymPy, construye el registro de fórmulas de physics y compila
+    `equations` (por defecto PRELOAD_EQUATIONS) en la caché de expresiones,
+    de modo que la primera petición de un proceso recién arrancado tarda lo
+    mismo que las siguientes. Compila en el propio proceso, sin crear el
+    grupo de procesos de compilación. Las ecuaciones que no se pueden compilar
+    solo se registran. Devuelve el estado final (ver warmup_status).
+    """
+    equations = PRELOAD_EQUATIONS if equations is None else equations
+    with _lock:
+        if _state['status'] == 'ready':
+            return dict(_state)
+        _state['status'] = 'warming'
+        start = time.monotonic()
+        physics.get_formulas()
+        failed = []
+        for equation in equations:
+            try:
+                expression_cache.get_or_compile(equation, simplify_mode)
+            except Exception as e:
+                logging.warning(f"Could not preload equation {equation}: {str(e)}")
+                failed.append(equation)
+        _state.update(status='ready', seconds=round(time.monotonic() - start, 3),
+                      compiled=len(equations) - len(failed), failed=failed)
+        logging.info(f"Warm-up finished in {_state['seconds']} s ({_state['compiled']} equations)")
+        return dict(_state)
+
+
+def warmup_status():
+    """Devuelve una copia del estado del precalentamiento."""
+    return dict(_state)
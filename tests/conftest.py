@@ -0,0 +1,11 @@
+# Configuración común de las pruebas: los módulos de CurviPath se importan por nombre, como en la aplicación
+import os  # Acceso a variables de entorno del sistema operativo
+import sys  # Ruta de importación de los módulos
+
+# La configuración se lee al importar los módulos, así que se fija antes:
+# sin almacén persistente (no se escribe en ~/.cache) y compilación en el propio proceso
+os.environ['CURVIPATH_EXPR_STORE'] = ''
+os.environ.setdefault('CURVIPATH_LOG_LEVEL', 'CRITICAL')
+os.environ.setdefault('CURVIPATH_COMPILE_WORKERS', '0')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'CurviPath'))
@@ -0,0 +1,58 @@
+# Pruebas de la evaluación de varias funciones vectoriales en /batch
+import pytest  # Marco de pruebas
+import app as app_module  # Aplicación Flask y sus límites
+
+
+@pytest.fixture
+def client():
+    """Cliente de pruebas de Flask."""
+    return app_module.app.test_client()
+
+
+def test_mixed_batch_reports_each_curve(client):
+    """Las curvas válidas devuelven sus series y las inválidas su propio error, sin afectar a las demás."""
+    response = client.post('/batch', json={
+        'grid': {'t_max': 1, 'intervals': 2},
+        'variables': {'v_0': 2},
+        'curves': [
+            {'x': 't', 'y': 'v_0*t'},
+            {'x': 't+'},
+            {'x': 'k*t'},
+            'not a curve',
+            {'x': 'sqrt(t - 0.5)'},
+            {'x': 'k*t', 'variables': {'k': 3}, 't_max': 2, 'intervals': 3},
+            {},
+        ],
+    })
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['t'] == [0.0, 1.0]
+    curves = data['curves']
+    assert [curve['index'] for curve in curves] == list(range(1, 8))
+    assert data['errors'] == sum('error' in curve for curve in curves) == 4
+
+    assert curves[0]['x_eq'] == [0.0, 1.0] and curves[0]['y_eq'] == [0.0, 2.0] and curves[0]['y_v'] == [2.0, 2.0]
+    assert 't' not in curves[0] and curves[0]['invalid_points'] == {}
+    assert curves[1]['component'] == 'x' and curves[1]['error'].startswith('Error parsing x equation')
+    assert curves[2]['error'] == 'Missing value for parameter(s) k'
+    assert curves[3]['error'] == 'each curve must be a JSON object'
+    assert curves[4]['x_eq'][0] is None and curves[4]['x_eq'][1] == pytest.approx(0.5 ** 0.5)
+    assert curves[4]['invalid_points'] == {'x_eq': 1, 'x_v': 1, 'x_a': 1}
+    assert curves[5]['t'] == [0.0, 1.0, 2.0] and curves[5]['x_eq'] == [0.0, 3.0, 6.0]
+    assert curves[6]['error'] == 'the curve has no equations'
+
+
+def test_batch_size_limit(client, monkeypatch):
+    """Una petición con más de BATCH_MAX_CURVES curvas se rechaza entera con 400."""
+    monkeypatch.setattr(app_module, 'BATCH_MAX_CURVES', 2)
+    assert client.post('/batch', json={'curves': [{'x': 't'}] * 2}).status_code == 200
+    response = client.post('/batch', json={'curves': [{'x': 't'}] * 3})
+    assert response.status_code == 400
+    assert 'at most 2 curves' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('payload', [None, {'curves': 't'}, {'curves': [], 'simplify': 'fast'},
+                                     {'curves': [], 'grid': {'intervals': 0}}])
+def test_invalid_batch(client, payload):
+    """Un cuerpo sin lista de curvas, una simplificación desconocida o una malla vacía se rechazan con 400."""
+    assert client.post('/batch', json=payload).status_code == 400
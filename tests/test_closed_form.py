@@ -0,0 +1,36 @@
+# Pruebas de las trayectorias en forma cerrada de /get_data con geometría y muestreo adaptativo
+import json  # Variables de la petición
+import math  # Valores analíticos
+import pytest  # Marco de pruebas
+from app import app  # Aplicación Flask
+
+
+@pytest.fixture
+def client():
+    """Cliente de pruebas de Flask."""
+    return app.test_client()
+
+
+def test_closed_form_geometry(client):
+    """Con geometry=1 el tiro parabólico devuelve curvatura, torsión nula y longitud de arco."""
+    v_0, g = 20.0, 9.81
+    v_0x = v_0 * math.cos(math.radians(45))
+    data = client.get('/get_data', query_string={
+        'exercise_type': 'TP', 'variables': json.dumps({'v_0': v_0, 'θ': 45, 'g': g}),
+        't_max': 2 * v_0x / g, 'intervals': 1001, 'geometry': 1}).get_json()
+    apex = 500  # Punto medio de la malla: el punto más alto
+    assert data['curvature_1'][apex] == pytest.approx(g / v_0x ** 2)
+    assert {value for value in data['torsion_1'] if value is not None} == {0.0}
+    # Longitud de la parábola entre sus raíces: ∫ sqrt(v_0x² + (v_0x - g·t)²) dt
+    h = v_0x ** 2 / g
+    exact = h * (math.sqrt(2) + math.asinh(1))
+    assert data['arc_length']['1'] == pytest.approx(exact, rel=1e-5)
+
+
+def test_closed_form_adaptive_sampling(client):
+    """El muestreo adaptativo refina la trayectoria en forma cerrada en lugar de devolver la malla gruesa."""
+    query = {'exercise_type': 'MCU', 'variables': json.dumps({'r': 2, 'ω': 3}), 't_max': 10,
+             'intervals': 400, 'sampling': 'adaptive'}
+    data = client.get('/get_data', query_string=query).get_json()
+    assert 33 < len(data['t']) <= 400
+    assert data['t'] == sorted(data['t'])
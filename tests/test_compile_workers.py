@@ -0,0 +1,62 @@
+# Pruebas de la compilación en los procesos de compilación cuando el grupo cae
+import os  # Identificador del proceso
+import signal  # Señales que terminan un proceso de compilación
+import pytest  # Marco de pruebas
+import compiler  # Compilación en los procesos de compilación
+from app import app  # Aplicación Flask
+
+
+def _crash_with(signum):
+    """Trabajo de compilación que mata su propio proceso con `signum` al recibir la ecuación 'bad'."""
+    def derive(equation, simplify_mode):
+        if equation == 'bad':
+            os.kill(os.getpid(), signum)
+        return compiler._derive_limited(equation, simplify_mode)
+    return derive
+
+
+def segfault_on_bad(equation, simplify_mode):
+    """Como un proceso que agota su memoria dentro de código C."""
+    return _crash_with(signal.SIGSEGV)(equation, simplify_mode)
+
+
+def killed_on_bad(equation, simplify_mode):
+    """Como un proceso terminado desde fuera (por ejemplo, por el sistema)."""
+    return _crash_with(signal.SIGKILL)(equation, simplify_mode)
+
+
+@pytest.fixture
+def sandbox(monkeypatch):
+    """Compila siempre en los procesos de compilación y los descarta al terminar."""
+    monkeypatch.setattr(compiler, 'COMPILE_SANDBOX', True)
+    compiler.expression_cache.clear()
+    yield monkeypatch
+    executor = compiler._compile_executor
+    if executor is not None:
+        compiler._reset_compile_executor(executor, kill=True)
+    compiler.expression_cache.clear()
+
+
+def test_limit_crash_blames_only_its_equation(sandbox):
+    """Solo la ecuación cuyo proceso murió por un límite es un CompileLimitError; las demás se compilan."""
+    sandbox.setattr(compiler, '_derive_limited', segfault_on_bad)
+    derived = compiler._derive_in_workers(['bad', 't', 'cos(t)'], 'none')
+    assert isinstance(derived['bad'], compiler.CompileLimitError)
+    assert not isinstance(derived['t'], Exception) and not isinstance(derived['cos(t)'], Exception)
+
+
+@pytest.mark.parametrize('derive, status', [(segfault_on_bad, 422), (killed_on_bad, 503)])
+def test_pool_failure_status(sandbox, derive, status):
+    """/get_data responde 422 si la ecuación superó un límite y 503 si el grupo cayó por otra causa."""
+    sandbox.setattr(compiler, '_derive_limited', derive)
+    response = app.test_client().get('/get_data', query_string={
+        'x_equations': 'bad', 'y_equations': 't', 't_max': 1, 'intervals': 4})
+    assert response.status_code == status
+    assert response.get_json()['component'] == 'x'
+
+
+def test_workers_that_cannot_start_fall_back_in_process(sandbox):
+    """Si los procesos de compilación no arrancan, las ecuaciones se compilan en el propio proceso."""
+    sandbox.setenv('CURVIPATH_COMPILE_MEMORY_LIMIT', '5')  # El inicializador no puede importar SymPy
+    derived = compiler._derive_in_workers(['t', 'sin(t)'], 'none')
+    assert not any(isinstance(result, Exception) for result in derived.values())
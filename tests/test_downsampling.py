@@ -0,0 +1,53 @@
+# Pruebas de la reducción de las series con Largest-Triangle-Three-Buckets
+import numpy as np  # Series de prueba
+import pytest  # Marco de pruebas
+from app import app  # Aplicación Flask
+from downsampling import downsample_arrays, lttb_indices  # Reducción de las series
+
+
+@pytest.mark.parametrize('n, max_points', [(10, 3), (1000, 100), (1001, 1000), (12345, 777)])
+def test_keeps_endpoints_and_length(n, max_points):
+    """Devuelve exactamente max_points índices crecientes, con el primero y el último."""
+    t_vals = np.linspace(0.0, 1.0, n)
+    indices = lttb_indices(t_vals, [np.sin(20 * t_vals)], max_points)
+    assert len(indices) == max_points
+    assert indices[0] == 0 and indices[-1] == n - 1
+    assert (np.diff(indices) > 0).all()
+
+
+def test_keeps_peaks_and_nan_points():
+    """Se conservan un pico aislado y los puntos sin valor (NaN) de cualquier serie."""
+    t_vals = np.linspace(0.0, 1.0, 10000)
+    peak = np.zeros_like(t_vals)
+    peak[4321] = 5.0
+    gaps = np.cos(t_vals)
+    gaps[[1234, 7777]] = np.nan
+    indices = lttb_indices(t_vals, [peak, gaps], 50)
+    assert {4321, 1234, 7777} <= set(indices.tolist())
+
+
+def test_small_inputs_are_unchanged():
+    """Si la serie ya cabe, downsample_arrays devuelve las mismas series sin datos de reducción."""
+    arrays = {'t': np.linspace(0.0, 1.0, 100), 'x_eq_1': np.arange(100.0)}
+    reduced, downsampling = downsample_arrays(arrays, 100)
+    assert reduced is arrays and downsampling is None
+    np.testing.assert_array_equal(lttb_indices(arrays['t'], [arrays['x_eq_1']], 500), np.arange(100))
+
+
+def test_all_series_share_indices():
+    """Todas las series (y la malla) se reducen con los mismos índices."""
+    t_vals = np.linspace(0.0, 10.0, 5000)
+    arrays = {'t': t_vals, 'x_eq_1': np.sin(t_vals), 'y_eq_1': np.cos(3 * t_vals)}
+    reduced, downsampling = downsample_arrays(arrays, 200)
+    assert downsampling == {'method': 'lttb', 'points': 5000, 'returned': 200}
+    indices = np.searchsorted(t_vals, reduced['t'])
+    np.testing.assert_array_equal(reduced['x_eq_1'], arrays['x_eq_1'][indices])
+    np.testing.assert_array_equal(reduced['y_eq_1'], arrays['y_eq_1'][indices])
+
+
+def test_get_data_max_points():
+    """/get_data con max_points devuelve las series reducidas y los datos de la reducción."""
+    data = app.test_client().get('/get_data', query_string={
+        'x_equations': 'cos(t)', 'y_equations': 'sin(t)', 'intervals': 1000, 'max_points': 50}).get_json()
+    assert len(data['t']) == len(data['x_eq_1']) == 50
+    assert data['downsampling'] == {'method': 'lttb', 'points': 1000, 'returned': 50}
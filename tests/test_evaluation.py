@@ -0,0 +1,114 @@
+# Pruebas de la evaluación numérica: núcleo fusionado y evaluación punto por punto
+import math  # Valores de referencia de erf
+import numpy as np  # Mallas y comparación de series
+import pytest  # Marco de pruebas
+from compiler import compile_components, VectorKernel  # Compilación de las componentes y núcleo fusionado
+import evaluation  # Límites de la evaluación punto por punto
+from app import app  # Aplicación Flask
+from evaluation import evaluate_vector_function, safe_evalf_array  # Evaluación fusionada y por serie
+
+# Componentes con subexpresiones comunes (que cse comparte), parámetros y puntos sin valor real
+COMPONENTS = [('x', 'A*sin(w*t)**2 + cos(w*t)'), ('y', 'exp(-k*t)*sin(w*t)'), ('z', 'sqrt(t - 1) + log(t)')]
+PARAMS = {'A': 2.0, 'w': 3.0, 'k': 0.5}
+
+
+@pytest.mark.parametrize('simplify_mode', ['none', 'full'])
+def test_kernel_matches_per_expression_evaluation(simplify_mode):
+    """El núcleo fusionado con cse da las mismas series y puntos inválidos que evaluar cada expresión por separado."""
+    components = compile_components(COMPONENTS, simplify_mode)
+    vals = np.linspace(0.0, 3.0, 301)
+    fused = evaluate_vector_function(components, vals, PARAMS)
+    assert list(fused) == [f'{name}_{kind}' for name, _ in COMPONENTS for kind in ('eq', 'v', 'a')]
+    for name, compiled in components:
+        for order, kind in enumerate(('eq', 'v', 'a')):
+            values, invalid = fused[f'{name}_{kind}']
+            expected, expected_invalid = safe_evalf_array(compiled, order, vals, PARAMS)
+            np.testing.assert_allclose(values, expected, rtol=1e-12, atol=1e-12)
+            assert invalid == expected_invalid
+    assert fused['z_eq'][1] == 100  # t < 1 (y log(0) en t = 0)
+
+
+def test_kernel_raw_outputs_follow_component_order():
+    """evaluate_raw devuelve [pos, vel, acc] por componente, igual que las funciones de cada componente."""
+    components = compile_components(COMPONENTS[:2], 'none')
+    fused = VectorKernel([compiled for _, compiled in components])
+    assert fused.params == ('A', 'k', 'w')
+    vals = np.linspace(0.0, 2.0, 21)
+    raw = fused.evaluate_raw(vals, PARAMS)
+    assert len(raw) == 6
+    for i, values in enumerate(raw):
+        compiled = components[i // 3][1]
+        np.testing.assert_allclose(values, compiled.funcs[i % 3](vals, *compiled.args(PARAMS)), rtol=1e-12, atol=1e-12)
+
+
+def _series(equation, vals, order=0):
+    """Serie de orden `order` de una ecuación compilada sin simplificar, con sus puntos inválidos."""
+    (_, compiled), = compile_components([('x', equation)], 'none')
+    return compiled, safe_evalf_array(compiled, order, vals)
+
+
+def test_complex_intermediates_are_repaired():
+    """Los puntos que numpy marca como NaN se reevalúan en complejos: cos(√(t - 5)) = cosh(√(5 - t)) si t < 5."""
+    vals = np.linspace(0.0, 10.0, 101)
+    _, (values, invalid) = _series('cos(sqrt(t - 5))', vals)
+    expected = np.where(vals < 5, np.cosh(np.sqrt(np.abs(5 - vals))), np.cos(np.sqrt(np.abs(vals - 5))))
+    np.testing.assert_allclose(values, expected, rtol=1e-12)
+    assert invalid == 0
+
+
+def test_domain_errors_become_nan():
+    """Los puntos sin valor real (o infinitos) valen NaN y se cuentan; el resto no cambia."""
+    vals = np.linspace(0.0, 2.0, 21)
+    _, (values, invalid) = _series('log(t - 1)', vals)
+    assert invalid == 11  # t ≤ 1
+    assert np.isnan(values[:11]).all()
+    np.testing.assert_allclose(values[11:], np.log(vals[11:] - 1))
+
+
+def test_piecewise_is_vectorized():
+    """Las funciones a trozos se evalúan sobre toda la malla, también sus derivadas."""
+    vals = np.linspace(0.0, 2.0, 21)
+    _, (values, invalid) = _series('Piecewise((t, t < 1), (t**2, True))', vals)
+    np.testing.assert_allclose(values, np.where(vals < 1, vals, vals ** 2))
+    _, (velocity, _) = _series('Piecewise((t, t < 1), (t**2, True))', vals, order=1)
+    np.testing.assert_allclose(velocity, np.where(vals < 1, 1.0, 2 * vals))
+    assert invalid == 0
+
+
+def test_pointwise_fallback(monkeypatch):
+    """Sin traducción a numpy (erf) se evalúa punto por punto con mpmath, hasta SCALAR_FALLBACK_MAX_POINTS."""
+    vals = np.linspace(0.0, 2.0, 11)
+    _, (values, invalid) = _series('erf(t)', vals)
+    np.testing.assert_allclose(values, [math.erf(v) for v in vals], rtol=1e-12)
+    assert invalid == 0
+
+    monkeypatch.setattr(evaluation, 'SCALAR_FALLBACK_MAX_POINTS', 4)
+    _, (values, invalid) = _series('erf(t)', vals)
+    np.testing.assert_allclose(values[:4], [math.erf(v) for v in vals[:4]], rtol=1e-12)
+    assert np.isnan(values[4:]).all() and invalid == 7
+
+
+def test_sympy_is_the_capped_last_resort(monkeypatch):
+    """Si mpmath también falla, cada punto se evalúa con SymPy, como mucho SYMPY_FALLBACK_MAX_POINTS."""
+
+    def failing_scalar_func(order):
+        def scalar(*args):
+            raise TypeError('mpmath cannot evaluate this expression')
+        return scalar
+
+    (_, compiled), = compile_components([('x', 'erf(t)')], 'none')
+    monkeypatch.setattr(compiled, 'scalar_func', failing_scalar_func)
+    monkeypatch.setattr(evaluation, 'SYMPY_FALLBACK_MAX_POINTS', 3)
+    vals = np.linspace(0.0, 2.0, 5)
+    values, invalid = safe_evalf_array(compiled, 0, vals)
+    np.testing.assert_allclose(values[:3], [math.erf(v) for v in vals[:3]], rtol=1e-12)
+    assert np.isnan(values[3:]).all() and invalid == 2
+
+
+def test_fallback_is_reported():
+    """La evaluación punto por punto aparece en Server-Timing y en sus métricas."""
+    client = app.test_client()
+    response = client.get('/get_data', query_string={'x_equations': 'erf(t) + 1', 'y_equations': 't', 't_max': 1, 'intervals': 5})
+    assert response.status_code == 200 and response.get_json()['x_eq_1'][0] == 1.0
+    assert 'fallback;dur=' in response.headers['Server-Timing']
+    assert 'curvipath_fallback_points_total{kind="mpmath"}' in client.get('/metrics').get_data(as_text=True)
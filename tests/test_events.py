@@ -0,0 +1,70 @@
+# Pruebas de la detección de eventos frente a instantes conocidos
+import numpy as np  # Series muestreadas
+import pytest  # Marco de pruebas
+from app import app  # Aplicación Flask
+from events import find_crossings, parse_event  # Detección de cruces
+
+
+def _events(client, y_equation, *specs, t_max=3, intervals=31):
+    """Eventos de /get_data para la curva (t, y_equation), por serie."""
+    response = client.get('/get_data', query_string=[
+        ('x_equations', 't'), ('y_equations', y_equation), ('t_max', t_max), ('intervals', intervals)]
+        + [('events', spec) for spec in specs])
+    assert response.status_code == 200
+    return {event['series']: event for event in response.get_json()['events']}
+
+
+@pytest.fixture
+def client():
+    """Cliente de pruebas de Flask."""
+    return app.test_client()
+
+
+def test_apex_and_landing(client):
+    """Tiro vertical y = v₀t - g t²/2: punto más alto en v₀/g y aterrizaje en 2v₀/g, con cualquier malla."""
+    v_0, g = 10.0, 9.8
+    for intervals in (31, 1000):
+        events = _events(client, f'{v_0}*t-{g / 2}*t**2', 'y_eq', 'y_v', intervals=intervals)
+        assert events['y_v_1']['t'] == [pytest.approx(v_0 / g, abs=1e-12)]
+        assert events['y_v_1']['direction'] == [-1]
+        assert events['y_v_1']['values']['y_eq_1'] == [pytest.approx(v_0 ** 2 / (2 * g))]
+        assert events['y_eq_1']['t'] == [0.0, pytest.approx(2 * v_0 / g, abs=1e-12)]  # Sale del suelo y aterriza
+        assert events['y_eq_1']['direction'] == [1, -1]
+
+
+def test_level_crossing(client):
+    """Con nivel, el evento es el paso por ese valor (x = 2.5 en t = 2.5)."""
+    events = _events(client, 't', 'x_eq:2.5')
+    assert events['x_eq_1']['t'] == [pytest.approx(2.5)] and events['x_eq_1']['level'] == 2.5
+
+
+def test_no_crossing(client):
+    """Una serie que no cruza el nivel devuelve la lista de instantes vacía."""
+    events = _events(client, 't**2+1', 'y_eq', 'y_v:-1')
+    assert events['y_eq_1']['t'] == [] and events['y_v_1']['t'] == []
+
+
+def test_nan_segments(client):
+    """sqrt(1 - t) no existe para t > 1: se encuentra el cruce real y ninguno a través del hueco."""
+    events = _events(client, 'sqrt(1-t)', 'y_eq:0.5')
+    assert events['y_eq_1']['t'] == [pytest.approx(0.75)]
+
+    t_vals = np.linspace(0.0, 4.0, 41)
+    values = np.where(t_vals < 2, 1.0, np.where(t_vals < 3, np.nan, -1.0))  # Cambia de signo solo a través del hueco
+    times, _, _ = find_crossings(t_vals, values, lambda t: np.full_like(t, np.nan), None)
+    assert times.size == 0
+
+
+def test_crossings_are_truncated():
+    """Con más cruces que el límite se devuelven los primeros y se marca truncated."""
+    t_vals = np.linspace(0.0, 10 * np.pi + 1, 1000)
+    times, directions, truncated = find_crossings(t_vals, np.sin(t_vals), np.sin, np.cos, limit=3)
+    np.testing.assert_allclose(times, [np.pi, 2 * np.pi, 3 * np.pi], atol=1e-12)
+    assert directions.tolist() == [-1, 1, -1] and truncated
+
+
+@pytest.mark.parametrize('spec', ['w_eq', 'y_j', 'y_eq:abc', 'y_eq:inf'])
+def test_invalid_specs(spec):
+    """Las especificaciones mal formadas lanzan ValueError."""
+    with pytest.raises(ValueError):
+        parse_event(spec)
@@ -0,0 +1,73 @@
+# Pruebas de la caché LRU de expresiones compiladas
+import compiler  # Caché de expresiones y compilación
+from compiler import ExpressionCache  # Caché LRU
+
+
+def test_hits_and_misses():
+    """get cuenta los aciertos y los fallos, y put devuelve la entrada guardada."""
+    cache = ExpressionCache(maxsize=4)
+    assert cache.get('a') is None
+    assert cache.put('a', 1) == 1
+    assert cache.get('a') == 1 and cache.get('a') == 1
+    assert cache.stats() == {'size': 1, 'maxsize': 4, 'hits': 2, 'misses': 1, 'evictions': 0}
+
+
+def test_evicts_least_recently_used():
+    """Al superar el tamaño máximo se descarta la entrada usada hace más tiempo, no la más antigua."""
+    cache = ExpressionCache(maxsize=3)
+    for key in 'abc':
+        cache.put(key, key.upper())
+    cache.get('a')  # 'b' pasa a ser la menos usada
+    cache.put('d', 'D')
+    assert cache.get('b') is None
+    cache.put('e', 'E')  # Ahora la menos usada es 'c'
+    assert [key for key in 'abcde' if cache.get(key) is not None] == ['a', 'd', 'e']
+    assert cache.stats()['evictions'] == 2
+
+
+def test_capacity_is_never_exceeded():
+    """La caché nunca guarda más de maxsize entradas; reescribir una clave no descarta nada."""
+    cache = ExpressionCache(maxsize=2)
+    for i in range(10):
+        cache.put(i, i)
+        assert cache.stats()['size'] <= 2
+    cache.put(9, 'again')
+    stats = cache.stats()
+    assert stats['size'] == 2 and stats['evictions'] == 8
+    assert cache.get(9) == 'again' and cache.get(8) == 8
+
+
+def test_clear_keeps_counters():
+    """clear vacía la caché pero conserva los contadores."""
+    cache = ExpressionCache(maxsize=2)
+    cache.put('a', 1)
+    cache.get('a')
+    cache.clear()
+    assert cache.get('a') is None
+    assert cache.stats() == {'size': 0, 'maxsize': 2, 'hits': 1, 'misses': 1, 'evictions': 0}
+
+
+def test_equivalent_spellings_compile_once(monkeypatch):
+    """Las ecuaciones con el mismo texto canónico comparten entrada; cada política de simplificación tiene la suya."""
+    compiled = []
+
+    def compile_equation(equation, simplify_mode):
+        compiled.append((equation, simplify_mode))
+        return object()
+
+    monkeypatch.setattr(compiler, 'compile_equation', compile_equation)
+    cache = ExpressionCache(maxsize=8)
+    first = cache.get_or_compile('2t + sin(t)', 'none')
+    assert cache.get_or_compile('2*t+sin(t)', 'none') is first
+    assert cache.get_or_compile('2t + sin(t)', 'full') is not first
+    assert compiled == [(compiler.preprocess_equation('2t + sin(t)'), 'none'),
+                        (compiler.preprocess_equation('2t + sin(t)'), 'full')]
+
+
+def test_kernels_are_cached_by_component_keys():
+    """El núcleo fusionado de unas componentes se construye una vez y se reutiliza."""
+    cache = ExpressionCache(maxsize=8)
+    components = [cache.get_or_compile(equation, 'none') for equation in ('t', 't**2')]
+    kernel = cache.get_or_build_kernel(components)
+    assert cache.get_or_build_kernel(components) is kernel
+    assert cache.get_or_build_kernel(components[::-1]) is not kernel
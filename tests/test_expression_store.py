@@ -0,0 +1,114 @@
+# Pruebas del almacén persistente de expresiones simplificadas
+import os  # Procesos hijo (fork)
+import json  # Contenido de las entradas guardadas
+import pytest  # Marco de pruebas
+import sympy as sp  # Expresiones de prueba
+import compiler  # Compilación que usa el almacén
+from expression_store import ExpressionStore, encode_expression, decode_expression  # Almacén SQLite
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """Almacén en un fichero temporal, usado también por la compilación."""
+    store = ExpressionStore(str(tmp_path / 'expressions.sqlite3'))
+    monkeypatch.setattr(compiler, 'expression_store', store)
+    compiler.expression_cache.clear()
+    yield store
+    compiler.expression_cache.clear()
+
+
+def _exhaust_budget(expr, mode, budget=None):
+    """Simplificación que agota siempre su presupuesto y devuelve la expresión sin simplificar."""
+    budget.exhausted = True
+    return expr
+
+
+@pytest.mark.parametrize('compile_one', [
+    lambda eq: compiler.compile_equation(eq, 'full'),
+    lambda eq: compiler.compile_many([eq], 'full')[eq],
+])
+def test_timed_out_simplification_is_not_stored(store, monkeypatch, compile_one):
+    """Las expresiones que agotaron el presupuesto de simplificación no se guardan; las demás sí."""
+    simplify_expression = compiler.simplify_expression
+    monkeypatch.setattr(compiler, 'SIMPLIFY_TIME_BUDGET', 1.0)
+    monkeypatch.setattr(compiler, 'simplify_expression', _exhaust_budget)
+    compile_one('sin(t)**2+cos(t)**2')
+    assert store.load_many(['sin(t)**2+cos(t)**2'], 'full') == {}
+
+    monkeypatch.setattr(compiler, 'simplify_expression', simplify_expression)
+    compile_one('t*cos(t)')
+    assert list(store.load_many(['t*cos(t)'], 'full')) == ['t*cos(t)']
+
+
+@pytest.mark.parametrize('expr', [
+    sp.cos(sp.Symbol('t')) * sp.Symbol('t') + sp.pi - sp.E * sp.I + sp.Rational(1, 3) + sp.Float(0.1),
+    sp.Piecewise((sp.Symbol('t'), sp.Symbol('t') > 0), (0, True)),
+    sp.Symbol('x', real=True) ** -2 + sp.Function('f')(sp.Symbol('t')) + sp.oo,
+    sp.Float('1.23456789012345678901234567890', 30) * sp.exp(-sp.Symbol('t') ** 2) + sp.zoo,
+])
+def test_encoded_expressions_round_trip(expr):
+    """decode_expression reconstruye exactamente (con el mismo srepr) lo que guarda encode_expression."""
+    decoded = decode_expression(json.loads(json.dumps(encode_expression(expr))))
+    assert decoded == expr and sp.srepr(decoded) == sp.srepr(expr)
+
+
+@pytest.mark.parametrize('node', [
+    'Add(Integer(1), Integer(2))', ['Poly', 'x'], ['Poly', ['S', 'Pi'], '__import__("os")'],
+    ['eval', ['Integer', '1']], ['__class__'], ['S', '__class__'], ['Symbol', 'x', {'__class__': True}],
+    ['Symbol', 'x', {'real': 'yes'}], ['Integer', 1], ['Function', 'f(x)'], [],
+])
+def test_decode_rejects_malformed_nodes(node):
+    """Cualquier nodo que no tenga la forma de encode_expression lanza ValueError."""
+    with pytest.raises(ValueError):
+        decode_expression(node)
+
+
+@pytest.mark.parametrize('payload', [
+    ['Poly("__import__(\'os\').system(\'touch {marker}\')")', 'Integer(1)', 'Integer(0)'],
+    [['Poly', '__import__("os").system("touch {marker}")'], ['Integer', '1'], ['Integer', '0']],
+])
+def test_malicious_row_is_rejected(store, tmp_path, payload):
+    """Una fila con código Python se descarta sin ejecutarlo (ni como srepr ni dentro del árbol)."""
+    marker = tmp_path / 'executed'
+    store.save('t', 'full', (sp.Symbol('t'), sp.Integer(1), sp.Integer(0)))
+    row = json.dumps(payload).replace('{marker}', str(marker))
+    store._connection().execute('UPDATE expressions SET payload = ?', (row,))
+    assert store.load_many(['t'], 'full') == {}
+    assert not marker.exists()
+
+
+def _entry(n):
+    """Expresiones (posición, velocidad, aceleración) de la ecuación n*t."""
+    return (sp.Integer(n) * sp.Symbol('t'), sp.Integer(n), sp.Integer(0))
+
+
+def test_evicts_least_recently_used(tmp_path, monkeypatch):
+    """Al superar max_bytes se descartan las entradas usadas hace más tiempo."""
+    clock = iter(range(1, 100))
+    monkeypatch.setattr('expression_store.time.time', lambda: next(clock))
+    size = len(json.dumps([encode_expression(expr) for expr in _entry(2)]))  # Igual para 2*t, 3*t y 4*t
+    store = ExpressionStore(str(tmp_path / 'expressions.sqlite3'), max_bytes=2 * size)
+    store.save('2*t', 'full', _entry(2))
+    store.save('3*t', 'full', _entry(3))
+    assert list(store.load_many(['2*t'], 'full')) == ['2*t']  # 3*t pasa a ser la menos usada
+    store.save('4*t', 'full', _entry(4))
+    assert sorted(store.load_many(['2*t', '3*t', '4*t'], 'full')) == ['2*t', '4*t']
+    assert store.evictions == 1 and store.stats()['bytes'] <= store.max_bytes
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+def test_reopens_connection_after_fork(store):
+    """Un proceso hijo creado con fork abre su propia conexión y ve las entradas del padre."""
+    store.save('1*t', 'full', _entry(1))
+    parent_conn = store._connection()
+    pid = os.fork()
+    if pid == 0:  # Proceso hijo: sale con 0 solo si todo funciona
+        ok = False
+        try:
+            ok = (store._connection() is not parent_conn and list(store.load_many(['1*t'], 'full')) == ['1*t'])
+            store.save('2*t', 'full', _entry(2))
+        finally:
+            os._exit(0 if ok and store.errors == 0 else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+    assert list(store.load_many(['2*t'], 'full')) == ['2*t']  # Lo que escribió el hijo
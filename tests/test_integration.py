@@ -0,0 +1,64 @@
+# Pruebas de la integración numérica de leyes de aceleración frente a soluciones analíticas
+import numpy as np  # Series y valores analíticos
+import pytest  # Marco de pruebas
+import integration  # Integradores
+from app import app  # Aplicación Flask
+from compiler import compile_components  # Compilación de las leyes
+from integration import IntegrationError, get_or_build_system, integrate  # Sistema compilado e integración
+
+
+def _system(**laws):
+    """Sistema compilado con las leyes de aceleración `laws` ({componente: ecuación})."""
+    return get_or_build_system(compile_components(list(laws.items()), 'none'))
+
+
+def _initial(*states):
+    """Estados iniciales (x, y, z, v_x, v_y, v_z) completados con ceros."""
+    return np.array([list(state) + [0.0] * (6 - len(state)) for state in states], dtype=np.float64)
+
+
+@pytest.mark.parametrize('method', ['rk4', 'rk45'])
+def test_constant_acceleration(method):
+    """Con aceleración constante ambos métodos reproducen la parábola exacta."""
+    t_vals = np.linspace(0.0, 3.0, 31)
+    series, _ = integrate(_system(x='0', y='-g'), t_vals, _initial((1.0, 2.0, 0.0, 3.0, 4.0)), (9.81,), method)
+    np.testing.assert_allclose(series['x_eq_1'], 1.0 + 3.0 * t_vals, atol=1e-9)
+    np.testing.assert_allclose(series['y_eq_1'], 2.0 + 4.0 * t_vals - 0.5 * 9.81 * t_vals ** 2, atol=1e-9)
+    np.testing.assert_allclose(series['y_v_1'], 4.0 - 9.81 * t_vals, atol=1e-9)
+    np.testing.assert_allclose(series['y_a_1'], -9.81)
+
+
+@pytest.mark.parametrize('method, options', [('rk4', {'substeps': 10}), ('rk45', {'rtol': 1e-9, 'atol': 1e-12})])
+def test_harmonic_oscillator(method, options):
+    """x'' = -ω²x: los estados (1, 0) y (0, ω) siguen cos(ωt) y sin(ωt), integrados a la vez."""
+    omega = 2.0
+    t_vals = np.linspace(0.0, 2 * np.pi, 101)
+    series, stats = integrate(_system(x='-omega**2*x'), t_vals, _initial((1.0, 0, 0, 0.0), (0.0, 0, 0, omega)),
+                              (omega,), method, **options)
+    np.testing.assert_allclose(series['x_eq_1'], np.cos(omega * t_vals), atol=1e-6)
+    np.testing.assert_allclose(series['x_eq_2'], np.sin(omega * t_vals), atol=1e-6)
+    np.testing.assert_allclose(series['x_v_1'], -omega * np.sin(omega * t_vals), atol=1e-5)
+    np.testing.assert_allclose(series['x_a_2'], -omega ** 2 * np.sin(omega * t_vals), atol=1e-5)
+    assert stats['steps'] > 0
+
+
+def test_divergent_state_becomes_nan():
+    """x'' = 2x³ con x(0) = x'(0) = 1 es 1/(1 - t): ese estado pasa a NaN en t = 1 sin detener al otro."""
+    t_vals = np.linspace(0.0, 2.0, 21)
+    series, stats = integrate(_system(x='2*x**3'), t_vals, _initial((1.0, 0, 0, 1.0), (1 / 3, 0, 0, 1 / 9)), (),
+                              'rk45', rtol=1e-8, atol=1e-10)
+    before = t_vals < 0.95
+    np.testing.assert_allclose(series['x_eq_1'][before], 1 / (1 - t_vals[before]), rtol=1e-5)
+    assert np.isnan(series['x_eq_1'][t_vals >= 1.0]).all()
+    assert stats['diverged'] == 1
+    np.testing.assert_allclose(series['x_eq_2'], 1 / (3 - t_vals), rtol=1e-5)  # El segundo estado es 1/(3 - t)
+
+
+def test_max_steps(monkeypatch):
+    """Superar INTEGRATION_MAX_STEPS lanza IntegrationError, que /integrate responde con 422."""
+    monkeypatch.setattr(integration, 'INTEGRATION_MAX_STEPS', 5)
+    with pytest.raises(IntegrationError):
+        integrate(_system(x='-x'), np.linspace(0.0, 10.0, 3), _initial((1.0,)), (), 'rk45')
+    response = app.test_client().post('/integrate', json={
+        'acceleration': {'x': '-x'}, 'initial': [{'x': 1}], 't_max': 10, 'intervals': 3})
+    assert response.status_code == 422
@@ -0,0 +1,102 @@
+# Pruebas de los trabajos asíncronos de /jobs
+import json  # Eventos de Server-Sent Events
+import time  # Espera a que terminen los trabajos
+import threading  # Bloqueo del único hilo de trabajos
+import pytest  # Marco de pruebas
+import app as app_module  # Aplicación Flask y su almacén de trabajos
+from jobs import JobStore  # Almacén con límites de prueba
+
+QUERY = {'x_equations': ['t', 'cos(t)'], 'y_equations': ['t**2', 'sin(t)'], 't_max': 2, 'intervals': 20}
+
+
+@pytest.fixture
+def client():
+    """Cliente de pruebas de Flask."""
+    return app_module.app.test_client()
+
+
+def _wait(client, job_id, timeout=30):
+    """Sondea /jobs/<id> hasta que el trabajo termina y devuelve su último estado."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = client.get(f'/jobs/{job_id}').get_json()
+        if status['status'] in ('done', 'error', 'cancelled'):
+            return status
+        time.sleep(0.02)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+def _sse(body):
+    """Eventos (id, tipo, datos) de un flujo de Server-Sent Events."""
+    events = []
+    for block in body.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n') if not line.startswith(':'))
+        if fields:
+            events.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def test_submit_poll_and_result(client):
+    """Un trabajo se crea con 202, termina y su resultado coincide con el de /get_data."""
+    response = client.post('/jobs', json=QUERY)
+    assert response.status_code == 202
+    job = response.get_json()
+    assert job['status'] in ('queued', 'running', 'done')
+    assert response.headers['Location'] == job['status_url'] == f"/jobs/{job['id']}"
+
+    status = _wait(client, job['id'])
+    assert status['status'] == 'done' and status['progress'] == 1.0
+    assert status['curves_total'] == 2 and status['curves_done'] == ['1', '2']
+
+    result = client.get(job['result_url'])
+    assert result.status_code == 200
+    assert result.get_json() == client.get('/get_data', query_string=QUERY).get_json()
+    curve = client.get(f"/jobs/{job['id']}/curves/2").get_json()
+    assert curve['x_eq_2'] == result.get_json()['x_eq_2'] and 'x_eq_1' not in curve
+
+
+def test_events_stream(client):
+    """/jobs/<id>/events envía las etapas, una 'curve' por curva y 'done', y se reanuda con Last-Event-ID."""
+    job_id = client.post('/jobs', json=QUERY).get_json()['id']
+    response = client.get(f'/jobs/{job_id}/events')
+    assert response.mimetype == 'text/event-stream'
+    events = _sse(response.get_data(as_text=True))
+    assert [seq for seq, _, _ in events] == list(range(1, len(events) + 1))
+    assert [data['stage'] for _, kind, data in events if kind == 'stage'] == ['compile', 'sampling', 'evaluate']
+    assert [data['curve'] for _, kind, data in events if kind == 'curve'] == ['1', '2']
+    assert events[-1][1] == 'done' and events[-1][2]['status'] == 'done'
+
+    resumed = client.get(f'/jobs/{job_id}/events', headers={'Last-Event-ID': str(len(events) - 1)})
+    assert _sse(resumed.get_data(as_text=True)) == events[-1:]
+
+
+def test_rejects_jobs_over_the_cap(client, monkeypatch):
+    """Con el almacén lleno de trabajos sin terminar, uno nuevo recibe 503; al terminar, vuelve a haber sitio."""
+    store = JobStore(max_jobs=1, workers=1)
+    monkeypatch.setattr(app_module, 'job_store', store)
+    release = threading.Event()
+    first = client.post('/jobs', json=QUERY).get_json()
+    store._executor.submit(release.wait)  # Ocupa el único hilo después del primer trabajo
+    try:
+        _wait(client, first['id'])
+        blocked = client.post('/jobs', json=QUERY).get_json()  # En cola tras el bloqueo: no termina
+        response = client.post('/jobs', json=QUERY)
+        assert response.status_code == 503
+        assert 'Too many jobs' in response.get_json()['error']
+        assert client.get(f"/jobs/{first['id']}").status_code == 404  # Se descartó para hacer sitio
+    finally:
+        release.set()
+    assert _wait(client, blocked['id'])['status'] == 'done'
+    assert client.post('/jobs', json=QUERY).status_code == 202
+
+
+def test_finished_jobs_expire(client, monkeypatch):
+    """Los trabajos terminados se descartan tras JOB_TTL segundos."""
+    store = JobStore(ttl=0.5)
+    monkeypatch.setattr(app_module, 'job_store', store)
+    job_id = client.post('/jobs', json=QUERY).get_json()['id']
+    _wait(client, job_id)
+    time.sleep(0.6)
+    response = client.get(f'/jobs/{job_id}')
+    assert response.status_code == 404
+    assert 'expired' in response.get_json()['error']
@@ -0,0 +1,72 @@
+# Pruebas de la cabecera Server-Timing y de las métricas de /metrics
+import re  # Lectura de las cabeceras y de las muestras
+import itertools  # Ecuaciones distintas en cada prueba, para no acertar en las cachés
+import pytest  # Marco de pruebas
+from app import app  # Aplicación Flask
+
+_unique = itertools.count(1)
+
+
+@pytest.fixture
+def client():
+    """Cliente de pruebas de Flask."""
+    return app.test_client()
+
+
+def _query():
+    """Consulta de /get_data con una ecuación que ninguna caché tiene todavía."""
+    return {'x_equations': f'{next(_unique)}*t**3 + sin(t)', 'y_equations': 't', 't_max': 1, 'intervals': 5}
+
+
+def _server_timing(response):
+    """Entradas de la cabecera Server-Timing: {nombre: milisegundos}, en orden."""
+    entries = [entry.strip() for entry in response.headers['Server-Timing'].split(',')]
+    return {name: float(duration) for name, duration in (re.fullmatch(r'([\w.]+);dur=([\d.]+)', entry).groups()
+                                                         for entry in entries)}
+
+
+def _sample(client, sample):
+    """Valor de una muestra de /metrics (0 si aún no existe)."""
+    for line in client.get('/metrics').get_data(as_text=True).splitlines():
+        if line.startswith(sample + ' '):
+            return float(line.split()[-1])
+    return 0.0
+
+
+def test_server_timing_stages(client):
+    """Una petición que compila informa de cada etapa, de cada etapa por componente y del total, al final."""
+    timings = _server_timing(client.get('/get_data', query_string=_query()))
+    assert {'cache', 'compile', 'parse', 'simplify', 'diff', 'lambdify', 'evaluate', 'serialize'} <= set(timings)
+    assert {'parse.x1', 'simplify.x1', 'diff.x1', 'lambdify.x1'} <= set(timings)
+    assert list(timings)[-1] == 'total'
+    assert timings['total'] >= timings['compile'] >= 0
+
+
+def test_cached_response_skips_the_computation(client):
+    """Una respuesta servida desde la caché solo pasa por la etapa 'cache'."""
+    query = _query()
+    client.get('/get_data', query_string=query)
+    assert list(_server_timing(client.get('/get_data', query_string=query))) == ['cache', 'total']
+
+
+def test_metrics_counters_increase(client):
+    """Cada petición suma a su contador y a su histograma de latencia, y las etapas a los suyos."""
+    requests = 'curvipath_requests_total{endpoint="get_data",status="200"}'
+    latency = 'curvipath_request_seconds_count{endpoint="get_data"}'
+    compile_stage = 'curvipath_stage_seconds_count{stage="compile"}'
+    before = {name: _sample(client, name) for name in (requests, latency, compile_stage)}
+    client.get('/get_data', query_string=_query())
+    client.get('/get_data', query_string=_query())
+    after = {name: _sample(client, name) for name in before}
+    assert {name: after[name] - before[name] for name in before} == {requests: 2, latency: 2, compile_stage: 2}
+
+
+def test_metrics_format(client):
+    """/metrics usa el formato de texto de Prometheus, con HELP y TYPE por métrica."""
+    client.get('/get_data', query_string=_query())
+    response = client.get('/metrics')
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert '# TYPE curvipath_request_seconds histogram' in text
+    assert 'curvipath_request_seconds_bucket{endpoint="get_data",le="+Inf"}' in text
+    assert re.search(r'^curvipath_expression_cache_hit_ratio [\d.]+$', text, re.MULTILINE)
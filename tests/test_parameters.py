@@ -0,0 +1,68 @@
+# Pruebas de los nombres de los parámetros de las ecuaciones y de las ecuaciones precompiladas
+import os  # Rutas de los ficheros de la interfaz
+import re  # Extracción de las ecuaciones de ejemplo
+import json  # Variables de la petición
+import numpy as np  # Valores esperados
+import pytest  # Marco de pruebas
+import physics  # Valores de los parámetros
+import warmup  # Ecuaciones precompiladas
+from app import app  # Aplicación Flask
+from compiler import preprocess_equation  # Forma de las ecuaciones que se compilan
+
+
+@pytest.fixture
+def client():
+    """Cliente de pruebas de Flask."""
+    return app.test_client()
+
+
+@pytest.mark.parametrize('supplied, name', [
+    ('ω', 'omega'), ('omega', 'ω'), ('ω_i', 'omega_i'), ('omega_i', 'ω_i'),
+    ('θ', 'theta'), ('theta', 'θ'), ('alpha', 'α'), ('v0', 'v_0'), ('v_0', 'v0'),
+])
+def test_aliases_work_both_ways(supplied, name):
+    """Un parámetro recibido con cualquiera de sus nombres se asigna también a los demás."""
+    assert physics.parameter_values({supplied: '3'})[name] == 3.0
+
+
+def test_supplied_name_wins_over_alias():
+    """Si llegan los dos nombres, cada uno conserva su propio valor."""
+    values = physics.parameter_values({'omega': 1, 'ω': 2})
+    assert values['omega'] == 1.0 and values['ω'] == 2.0
+
+
+@pytest.mark.parametrize('equation, variables, expected', [
+    ('r*cos(omega*t)', {'r': 2, 'ω': 3}, lambda t: 2 * np.cos(3 * t)),
+    ('r*cos(ω*t)', {'r': 2, 'omega': 3}, lambda t: 2 * np.cos(3 * t)),
+    ('r*cos(omega_i*t+0.5*alpha*t**2)', {'r': 1, 'ω_i': 2, 'alpha': 0.5}, lambda t: np.cos(2 * t + 0.25 * t ** 2)),
+    ('v0*cos(theta)*t', {'v_0': 2, 'θ': 60}, lambda t: t),  # θ llega en grados
+    ('v0x*t+v0y', {'v_0x': 4, 'v_0y': 1}, lambda t: 4 * t + 1),
+    ('E*t+I+beta+gamma', {'E': 5, 'I': 1, 'beta': 2, 'gamma': 3}, lambda t: 5 * t + 6),
+])
+def test_equations_bind_ui_variables(client, equation, variables, expected):
+    """Las ecuaciones con nombres ASCII reciben los valores que envía la interfaz (y al revés)."""
+    response = client.get('/get_data', query_string={
+        'x_equations': equation, 'y_equations': 't', 'variables': json.dumps(variables),
+        't_max': 1, 'intervals': 5})
+    assert response.status_code == 200
+    data = response.get_json()
+    np.testing.assert_allclose(data['x_eq_1'], expected(np.array(data['t'])), atol=1e-12)
+
+
+@pytest.mark.parametrize('equation, canonical', [
+    ('v0x*t', 'v0x*t'), ('2t', '2*t'), ('3cos(t)', '3*cos(t)'), ('ω2t', 'ω2t'), ('v_0x*t', 'v_0x*t'),
+])
+def test_preprocess_keeps_parameter_digits(equation, canonical):
+    """La multiplicación implícita solo se inserta tras un número que no forma parte de un nombre."""
+    assert preprocess_equation(equation) == canonical
+
+
+def test_preload_matches_ui_examples():
+    """Las ecuaciones precompiladas incluyen las de los ejemplos de la interfaz."""
+    path = os.path.join(os.path.dirname(warmup.__file__), 'static', 'js', 'utils.js')
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    body = source[source.index('function getExampleEquations'):]
+    body = body[:body.index('return examples')]
+    examples = {preprocess_equation(eq) for eq in re.findall(r"[xyz]: '([^']*)'", body)} - {'0'}
+    assert examples and examples <= set(warmup.PRELOAD_EQUATIONS)
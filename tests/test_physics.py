@@ -0,0 +1,80 @@
+# Pruebas del registro de fórmulas de physics frente al solucionador original (rama por rama)
+import os  # Ruta de los datos de referencia
+import json  # Formato de los datos de referencia
+import math  # Comparación de resultados
+import pytest  # Marco de pruebas
+import physics  # Registro de fórmulas de los problemas de física
+
+# Casos de referencia: para cada (tipo de ejercicio, incógnita) del registro, los datos de un
+# estado físico coherente (todos, los de cada fórmula y los de cada fórmula menos uno) y casos
+# especiales (lanzamiento horizontal, claves alternativas, raíces múltiples). 'baseline' es el
+# resultado de calculate_solution antes del registro de fórmulas (None si no lo calculaba) y
+# 'exact' el valor correcto según el estado físico (la rama principal si hay varias soluciones).
+with open(os.path.join(os.path.dirname(__file__), 'data', 'physics_baseline.json'), encoding='utf-8') as f:
+    CASES = json.load(f)
+
+
+def case_id(case):
+    """Identificador legible de un caso."""
+    return f"{case['exercise_type']}-{case['solve_for']}-{','.join(sorted(case['variables']))}"
+
+
+def solve_value(case):
+    """Resultado numérico de physics.solve para un caso, o None si no hay solución."""
+    _, data = physics.solve(case['solve_for'], case['exercise_type'], dict(case['variables']))
+    return data.get(case['solve_for'])
+
+
+@pytest.mark.parametrize('case', CASES, ids=case_id)
+def test_solve_matches_baseline(case):
+    """Donde el solucionador original daba un resultado, el registro da el mismo."""
+    value = solve_value(case)
+    if case['baseline'] is not None:
+        assert value == pytest.approx(case['baseline'], rel=1e-9, abs=1e-9)
+    elif value is not None:
+        # El registro despeja más combinaciones que el original: el resultado debe ser el correcto
+        assert case['exact'] is not None
+        assert value == pytest.approx(case['exact'], rel=1e-9, abs=1e-9)
+
+
+def test_every_registry_pair_is_covered():
+    """Todos los pares (tipo de ejercicio, incógnita) del registro tienen casos de referencia."""
+    covered = {(case['exercise_type'], case['solve_for']) for case in CASES}
+    assert set(physics.get_formulas()) <= covered
+
+
+def test_horizontal_launch_needs_range():
+    """El tiempo de vuelo 2·v₀·sinθ/g no se aplica con θ = 0 (NONZERO_INPUTS)."""
+    variables = {'v_0': 20.0, 'θ': 0.0, 'g': 9.81}
+    assert solve_value({'exercise_type': 'TP', 'solve_for': 't', 'variables': variables}) is None
+    variables['R'] = 30.0
+    assert solve_value({'exercise_type': 'TP', 'solve_for': 't', 'variables': variables}) == pytest.approx(1.5)
+
+
+def test_principal_branch_of_launch_angle():
+    """sin(2θ) = Rg/v₀² tiene dos ángulos; se elige el menor."""
+    v_0, g = 20.0, 9.81
+    for angle in (0.3, 1.2):
+        variables = {'v_0': v_0, 'g': g, 'R': v_0 ** 2 / g * math.sin(2 * angle)}
+        value = solve_value({'exercise_type': 'TP', 'solve_for': 'θ', 'variables': variables})
+        assert value == pytest.approx(min(angle, math.pi / 2 - angle))
+
+
+def test_unknown_exercise_and_missing_data():
+    """Los tipos desconocidos y los datos insuficientes no dan resultado, solo un texto."""
+    text, data = physics.solve('r', 'XYZ', {'r': 1})
+    assert data == {} and 'no reconocido' in text
+    text, data = physics.solve('v', 'MCU', {'r': 2.0})
+    assert data == {} and 'Datos insuficientes' in text
+
+
+@pytest.mark.parametrize('solve_for, exercise_type, variables, expected', [
+    ('v_0', 'TP', {'v_0x': 3, 'v_0y': 4}, 'v_0 = √(v_0x² + v_0y²) = √(3.0000² + 4.0000²) = 5.0000 m/s'),
+    ('ω', 'MCU', {'T': 2}, 'ω = 2·π/T = 2·π/2.0000 = 3.1416 rad/s'),
+    ('alpha', 'MCNU', {'ω_f': 1.5, 'ω_i': -2, 't': 2},
+     'α = (ω_f - ω_i)/t = (1.5000 - (-2.0000))/2.0000 = 1.7500 rad/s²'),
+])
+def test_solution_text_uses_math_notation(solve_for, exercise_type, variables, expected):
+    """El texto de la solución usa √, · y superíndices, y sustituye los datos sin reordenar términos."""
+    text, _ = physics.solve(solve_for, exercise_type, variables)
+    assert text == expected
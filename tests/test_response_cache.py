@@ -0,0 +1,85 @@
+# Pruebas de la caché de respuestas y los ETag de /get_data
+import json  # Variables de la petición
+import pytest  # Marco de pruebas
+from werkzeug.datastructures import MultiDict  # Parámetros de consulta
+import app as app_module  # Aplicación Flask y cálculo de /get_data
+from pipeline import parse_options  # Opciones normalizadas de una petición
+import response_cache as response_cache_module  # Versión de los cálculos
+from response_cache import ResponseCache, request_key, response_cache  # Caché de respuestas
+
+
+def _key(binary=False, dtype='float64', **args):
+    """Clave de la petición de /get_data con los parámetros `args`."""
+    return request_key(parse_options(MultiDict(args)), binary, dtype)
+
+
+@pytest.fixture
+def client():
+    """Cliente de pruebas de Flask con la caché de respuestas vacía."""
+    response_cache.clear()
+    yield app_module.app.test_client()
+    response_cache.clear()
+
+
+def test_key_ignores_equivalent_spellings():
+    """Las ecuaciones se comparan en forma canónica, sin curvas vacías al final y con las variables numéricas ordenadas."""
+    base = _key(x_equations='2*sin(t)', y_equations='t', variables=json.dumps({'a': 1, 'b': 2}))
+    assert _key(x_equations=' 2sen(t) ', y_equations='t', variables=json.dumps({'b': '2', 'a': 1.0})) == base
+    assert _key(x_equations=['2*sin(t)', ''], y_equations=['t', ''], variables=json.dumps({'a': 1, 'b': 2, 'c': 'x'})) == base
+
+
+@pytest.mark.parametrize('change', [
+    {'x_equations': '3*sin(t)'}, {'intervals': '101'}, {'variables': json.dumps({'a': 1, 'b': 3})},
+    {'max_points': '10'}, {'events': 'x_eq'},
+])
+def test_key_changes_with_the_result(change):
+    """Cualquier parámetro que cambia la respuesta cambia la clave."""
+    args = dict(x_equations='2*sin(t)', y_equations='t', variables=json.dumps({'a': 1, 'b': 2}))
+    assert _key(**dict(args, **change)) != _key(**args)
+
+
+def test_key_depends_on_format():
+    """JSON y binario (y cada tipo de dato binario) tienen claves distintas."""
+    assert len({_key(x_equations='t'), _key(True, 'float64', x_equations='t'), _key(True, 'float32', x_equations='t')}) == 3
+
+
+def test_if_none_match_returns_304_without_computing(client, monkeypatch):
+    """Con el ETag de una respuesta anterior se responde 304 sin calcular nada."""
+    query = {'x_equations': 'cos(t)', 'y_equations': 'sin(t)', 'intervals': 50}
+    first = client.get('/get_data', query_string=query)
+    assert first.status_code == 200 and first.headers['ETag']
+
+    def fail(options):
+        raise AssertionError('the request was computed again')
+    monkeypatch.setattr(app_module, 'Computation', fail)
+    revalidated = client.get('/get_data', query_string=query, headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 304 and revalidated.headers['ETag'] == first.headers['ETag']
+
+    hits = response_cache.stats()['hits']
+    cached = client.get('/get_data', query_string=query)  # Sin validador: se sirve desde la caché
+    assert cached.status_code == 200 and cached.get_data() == first.get_data()
+    assert response_cache.stats()['hits'] == hits + 1
+
+
+def test_evicts_least_recently_used_by_bytes():
+    """La caché descarta las respuestas menos usadas hasta que la suma de tamaños cabe en max_bytes."""
+    cache = ResponseCache(max_bytes=10, max_entry_bytes=6)
+    cache.put('a', b'aaaa', 'application/json')
+    cache.put('b', b'bbbb', 'application/json')
+    assert cache.get('a') is not None  # 'b' pasa a ser la menos usada
+    cache.put('c', b'cccc', 'application/json')
+    assert cache.get('b') is None and cache.get('a') is not None and cache.get('c') is not None
+    assert cache.bytes == 8 and cache.evictions == 1
+
+    cache.put('a', b'aa', 'application/json')  # Reemplazar una entrada descuenta el tamaño anterior
+    assert cache.bytes == 6
+    cache.put('d', b'ddddddd', 'application/json')  # Mayor que max_entry_bytes: no se guarda
+    assert cache.get('d') is None and cache.bytes == 6
+
+
+def test_version_follows_the_code(monkeypatch):
+    """La versión de los ETag se deduce del código (estable entre llamadas) y forma parte de la clave."""
+    assert response_cache_module._computation_version() == response_cache_module._computation_version()
+    key = _key(x_equations='t')
+    monkeypatch.setattr(response_cache_module, 'RESPONSE_CACHE_VERSION', 'other')
+    assert _key(x_equations='t') != key
@@ -0,0 +1,99 @@
+# Pruebas de los formatos de respuesta de /get_data: binario columnar y flujo NDJSON
+import json  # Cabeceras y líneas JSON
+import struct  # Prefijos de longitud
+import numpy as np  # Búferes de las series
+import pytest  # Marco de pruebas
+from app import app  # Aplicación Flask
+from serialization import BINARY_ALIGNMENT, BINARY_MIMETYPE  # Formato binario
+
+# Consulta con una serie sin valor real en la mitad de la malla (NaN en binario, null en JSON)
+QUERY = {'x_equations': ['t', 'cos(t)'], 'y_equations': ['sqrt(t - 1)', 'sin(t)'], 't_max': 2, 'intervals': 11}
+
+
+@pytest.fixture
+def client():
+    """Cliente de pruebas de Flask."""
+    return app.test_client()
+
+
+def decode_columnar(body):
+    """Decodifica una respuesta binaria columnar en (cabecera, {serie: arreglo})."""
+    (length,) = struct.unpack_from('<I', body)
+    header = json.loads(body[4:4 + length])
+    start = 4 + length
+    assert start % BINARY_ALIGNMENT == 0
+    arrays = {}
+    for series in header['series']:
+        dtype = np.dtype('<f8' if series['dtype'] == 'float64' else '<f4')
+        assert series['offset'] % BINARY_ALIGNMENT == 0
+        arrays[series['name']] = np.frombuffer(body, dtype, series['length'], start + series['offset'])
+    return header, arrays
+
+
+def assert_matches_json(arrays, metadata, data, **tolerance):
+    """Las series binarias coinciden con las JSON (NaN donde JSON tiene null) y los datos escalares también."""
+    assert set(arrays) | set(metadata) == set(data)
+    for name, values in arrays.items():
+        expected = np.array([np.nan if v is None else v for v in data[name]], dtype=np.float64)
+        np.testing.assert_allclose(values, expected, **tolerance)
+    assert {key: data[key] for key in metadata} == metadata
+
+
+@pytest.mark.parametrize('dtype, tolerance', [('float64', {'rtol': 0}), ('float32', {'rtol': 1e-6})])
+def test_binary_round_trip_matches_json(client, dtype, tolerance):
+    """La respuesta binaria, decodificada, tiene las mismas series y datos que la JSON, con NaN incluidos."""
+    data = client.get('/get_data', query_string=QUERY).get_json()
+    response = client.get('/get_data', query_string=dict(QUERY, format='binary', dtype=dtype))
+    assert response.status_code == 200 and response.mimetype == BINARY_MIMETYPE
+    header, arrays = decode_columnar(response.get_data())
+    assert all(series['dtype'] == dtype for series in header.pop('series'))
+    assert np.isnan(arrays['y_eq_1'][:5]).all() and not np.isnan(arrays['y_eq_1'][5:]).any()
+    assert header['invalid_points']['y_eq_1'] == 5
+    assert_matches_json(arrays, header, data, **tolerance)
+
+
+def test_binary_is_negotiated_with_accept(client):
+    """Accept: application/octet-stream da la misma respuesta binaria que format=binary."""
+    by_header = client.get('/get_data', query_string=QUERY, headers={'Accept': BINARY_MIMETYPE})
+    assert by_header.mimetype == BINARY_MIMETYPE
+    assert by_header.get_data() == client.get('/get_data', query_string=dict(QUERY, format='binary')).get_data()
+
+
+def stream_messages(body, binary):
+    """Mensajes (datos, series) de una respuesta por flujo, en NDJSON o en marcos binarios."""
+    if not binary:
+        messages = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+        return [({k: v for k, v in message.items() if not isinstance(v, list) or k == 'events'},
+                 {k: v for k, v in message.items() if isinstance(v, list) and k != 'events'}) for message in messages]
+    messages, position = [], 0
+    while position < len(body):
+        (length,) = struct.unpack_from('<I', body, position)
+        header, arrays = decode_columnar(body[position + 4:position + 4 + length])
+        header.pop('series')
+        messages.append((header, {name: [None if np.isnan(v) else float(v) for v in values] for name, values in arrays.items()}))
+        position += 4 + length
+    return messages
+
+
+@pytest.mark.parametrize('binary', [False, True], ids=['ndjson', 'binary'])
+def test_stream_concatenates_to_the_full_response(client, binary):
+    """Los bloques del flujo, concatenados, dan las mismas series y datos que la respuesta sin flujo."""
+    data = client.get('/get_data', query_string=QUERY).get_json()
+    response = client.get('/get_data', query_string=dict(QUERY, stream=1, chunk_size=4, format='binary' if binary else 'json'))
+    assert response.status_code == 200
+    messages = stream_messages(response.get_data(), binary)
+
+    (header, header_series), *chunks, (footer, footer_series) = messages
+    assert not header_series and not footer_series
+    assert header.pop('intervals') == 11 and header.pop('chunk_size') == 4
+    assert header == {key: data[key] for key in header}
+    assert footer == {'done': True, 'invalid_points': data['invalid_points']}
+    assert [metadata['offset'] for metadata, _ in chunks] == [0, 4, 8]
+
+    series = {name: [] for name in chunks[0][1]}
+    for _, arrays in chunks:
+        for name, values in arrays.items():
+            series[name] += values
+    assert set(series) == {key for key, value in data.items() if isinstance(value, list) and key != 'events'}
+    for name, values in series.items():
+        assert values == data[name]
@@ -0,0 +1,42 @@
+# Pruebas del presupuesto de tiempo de la simplificación
+import time  # Medición del tiempo de compilación
+import pytest  # Marco de pruebas
+import compiler  # Simplificación con presupuesto
+
+# Ecuación cuya simplificación completa (con sus derivadas) tarda mucho más que el presupuesto
+SLOW_EQUATION = 'sin(t)**4 + cos(t)**4 + tan(t)**2/(1 + cos(t)**2)'
+BUDGET = 0.02  # Segundos
+
+
+@pytest.mark.parametrize('in_compile_worker', [True, False], ids=['alarm', 'thread'])
+def test_exhausted_budget_falls_back_to_unsimplified(monkeypatch, in_compile_worker):
+    """
+    Con un presupuesto mínimo la compilación devuelve las expresiones sin
+    simplificar, marca el presupuesto como agotado y no tarda mucho más que
+    compilar sin simplificar, tanto con la alarma de los procesos de
+    compilación como con los hilos del servidor.
+    """
+    monkeypatch.setattr(compiler, 'SIMPLIFY_TIME_BUDGET', BUDGET)
+    monkeypatch.setattr(compiler, '_in_compile_worker', in_compile_worker)
+    start = time.monotonic()
+    unsimplified = compiler.derive_expressions(SLOW_EQUATION, 'none')
+    baseline = time.monotonic() - start
+
+    budget = compiler._new_budget()
+    start = time.monotonic()
+    exprs = compiler.derive_expressions(SLOW_EQUATION, 'full', budget=budget)
+    elapsed = time.monotonic() - start
+
+    assert budget.exhausted
+    assert exprs == unsimplified
+    assert elapsed < baseline + BUDGET + 0.25
+
+
+def test_saturated_threads_skip_simplification(monkeypatch):
+    """Con SIMPLIFY_MAX_ABANDONED simplificaciones abandonadas en curso, las nuevas no se intentan."""
+    monkeypatch.setattr(compiler, 'SIMPLIFY_MAX_ABANDONED', 0)
+    monkeypatch.setattr(compiler, '_in_compile_worker', False)
+    budget = compiler.SimplifyBudget(10.0)
+    exprs = compiler.derive_expressions('sin(t)**2 + cos(t)**2', 'full', budget=budget)
+    assert budget.exhausted
+    assert exprs == compiler.derive_expressions('sin(t)**2 + cos(t)**2', 'none')
@@ -0,0 +1,61 @@
+# Pruebas de los barridos de parámetros de /sweep
+import math  # Valores esperados
+import pytest  # Marco de pruebas
+import app as app_module  # Aplicación Flask y sus límites
+
+
+@pytest.fixture
+def client():
+    """Cliente de pruebas de Flask."""
+    return app_module.app.test_client()
+
+
+def _sweep(client, exercise_type, solve_for, variables):
+    """Respuesta de /sweep para una incógnita y unos datos."""
+    return client.post('/sweep', json={'exercise_type': exercise_type, 'solve_for': solve_for, 'variables': variables})
+
+
+def test_grid_follows_variable_order(client):
+    """Cada dato variable es un eje, en el orden de 'variables', y cada punto es el de physics.solve."""
+    response = _sweep(client, 'MCU', 'v', {'r': [1, 2, 3], 'ω': {'start': 0, 'stop': 1, 'num': 3}})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['axes'] == [{'name': 'r', 'values': [1.0, 2.0, 3.0]}, {'name': 'ω', 'values': [0.0, 0.5, 1.0]}]
+    assert data['shape'] == [3, 3]
+    assert data['result'] == [[r * w for w in (0.0, 0.5, 1.0)] for r in (1.0, 2.0, 3.0)]
+    assert data['formulas'] == ['v = r·ω'] and data['formula_index'] == [[0] * 3] * 3
+    assert data['invalid_points'] == 0
+
+
+def test_angles_are_in_degrees(client):
+    """θ se indica y se devuelve en grados; los datos fijos no son ejes."""
+    data = _sweep(client, 'TP', 'R', {'v_0': 10, 'g': 9.8, 'θ': {'start': 30, 'stop': 60, 'step': 15}}).get_json()
+    assert [axis['name'] for axis in data['axes']] == ['θ']
+    assert data['axes'][0]['values'] == pytest.approx([30, 45, 60])
+    assert data['result'] == pytest.approx([100 * math.sin(math.radians(2 * a)) / 9.8 for a in (30, 45, 60)])
+
+
+def test_points_without_solution_are_marked(client):
+    """Los puntos sin solución real valen null, usan la fórmula -1 y se cuentan, sin afectar al resto."""
+    data = _sweep(client, 'MCU', 'v', {'a_c': [4, -4], 'r': [1, 9]}).get_json()
+    assert data['result'] == [[2.0, 6.0], [None, None]]
+    assert data['formula_index'] == [[0, 0], [-1, -1]]
+    assert data['invalid_points'] == 2
+
+
+def test_grid_size_limit(client, monkeypatch):
+    """Una malla de más de SWEEP_MAX_POINTS puntos se rechaza con 400."""
+    monkeypatch.setattr(app_module, 'SWEEP_MAX_POINTS', 8)
+    response = _sweep(client, 'MCU', 'v', {'r': [1, 2, 3], 'ω': [1, 2, 3]})
+    assert response.status_code == 400
+    assert 'at most 8 grid points' in response.get_json()['error']
+
+
+@pytest.mark.parametrize('payload', [
+    {'exercise_type': 'XX', 'solve_for': 'v', 'variables': {'r': [1]}},
+    {'exercise_type': 'MCU', 'solve_for': 'v', 'variables': {'r': {'start': 0, 'stop': 1, 'step': 0}}},
+    {'exercise_type': 'MCU', 'solve_for': 'v'},
+])
+def test_invalid_requests(client, payload):
+    """Tipos de ejercicio desconocidos, rangos inválidos o datos ausentes se rechazan con 400."""
+    assert client.post('/sweep', json=payload).status_code == 400